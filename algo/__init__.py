@@ -1 +1,14 @@
-from algo.simplex import *
\ No newline at end of file
+from algo.standard_form import *
+from algo.stats import *
+from algo.rank import *
+from algo.presolve import *
+from algo.interior_point import *
+from algo.simplex import *
+from algo.sensitivity import *
+from algo.column_generation import *
+from algo.cutting_plane import *
+from algo.async_solve import *
+from algo.batch import *
+from algo.snapshot import *
+from algo.result_cache import *
+from algo.branch_bound import *
\ No newline at end of file
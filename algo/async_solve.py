@@ -0,0 +1,185 @@
+"""
+This file defines the asyncio interface of the solve, the simplex method runs in an executor off the event loop,
+with a time limit, the cancellation and a stream of the progress.
+----------
+task = solve_async(model, time_limit=10)
+async for progress in task:
+    print(progress["iteration"], progress["objective_value"], progress["infeasibility"])
+objective_value, status = await task
+----------
+Last edited by Teast Ares, 20190130.
+"""
+
+import time
+import asyncio
+import threading
+from constant import const
+from algo.simplex import *
+
+
+def best_known_solution(model):
+    """
+    write the best-known solution of a solve stopped by a limit or the cancellation to the model,
+    it is the basic solution of the kept basis if the solve is stopped in phase II, which is primal feasible.
+
+    paras:
+        model: the model after the solve.
+
+    returns:
+        the objective value of the solution, None if no feasible solution is known.
+    """
+    cache = model.simplex_cache
+    if cache is None or cache.solver is None or cache.solver.phase != const.PHASE_TWO:
+        return None
+    x = cache.solver.solution()
+    model.columns.value[:] = cache.form.recover(x)
+    return cache.form.objective_value(x)
+
+
+class SolveTask:
+    """
+    A solve running in an executor of the event loop, it is awaited for the result,
+    and iterated by async for to get the progress of the iterations until the solve is done.
+    The time limit and the cancellation are checked by the solver between two pivots,
+    the model must not be changed until the solve is done.
+    It must be created in a running event loop.
+
+    paras:
+        model: the linear programming model,
+        simplex_type: the type of the simplex method, a pricing of the revised simplex method or interior point,
+        time_limit: the maximum seconds, if None, there is no limit,
+        iteration_limit: the maximum number of pivots, if None, there is no limit,
+        warm_start: if False, the model is solved from scratch,
+        progress_interval: the progress is streamed every progress_interval iterations, if None, it is not streamed,
+        executor: the executor to run the solve in, if None, the default executor of the event loop is used.
+    """
+    def __init__(self, model, simplex_type=const.SIMPLEX_PRIMAL, time_limit=None, iteration_limit=None,
+                 warm_start=True, progress_interval=1, executor=None):
+        if simplex_type not in PRICING_LIST and simplex_type != const.SIMPLEX_INTERIOR_POINT:
+            raise ValueError("Simplex type not valid")
+        if time_limit is not None and time_limit < 0:
+            raise ValueError("Time limit not valid")
+        if progress_interval is not None and (not isinstance(progress_interval, int) or progress_interval <= 0):
+            raise ValueError("Progress interval not valid")
+        check_linear_model(model)
+        self.model = model
+        self.simplex_type = simplex_type
+        self.time_limit = time_limit
+        self.iteration_limit = iteration_limit
+        self.warm_start = warm_start
+        self.progress_interval = progress_interval
+
+        self.loop = asyncio.get_running_loop()
+        # the progress dicts, and None after the last one.
+        self.queue = asyncio.Queue()
+        self.streamed = False
+        self.cancel_event = threading.Event()
+        self.start = time.perf_counter()
+        self.future = self.loop.run_in_executor(executor, self.run)
+
+    def run(self):
+        """
+        solve the model, it runs in the executor.
+
+        returns:
+            objective_value: the optimal objective value, or the objective value of the best-known solution
+                if the solve is stopped, None if no feasible solution is known,
+            status: the status of the model.
+        """
+        try:
+            objective_value, status, _ = simplex_method(
+                self.model, self.simplex_type, self.iteration_limit, self.warm_start, callback=self.monitor
+            )
+            if status in INTERRUPT_STATUS_LIST:
+                objective_value = best_known_solution(self.model)
+            return objective_value, status
+        finally:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+    def monitor(self, solver):
+        """
+        the callback of the solver after each iteration, it stops the solver on the time limit
+        or the cancellation, and sends the progress to the event loop.
+
+        paras:
+            solver: the simplex solver or the interior point solver.
+        """
+        seconds = time.perf_counter() - self.start
+        if self.cancel_event.is_set():
+            solver.interrupt(const.STATUS_CANCELLED)
+        elif self.time_limit is not None and seconds >= self.time_limit:
+            solver.interrupt(const.STATUS_TIME_LIMIT)
+        if self.progress_interval is not None and solver.iteration % self.progress_interval == 0:
+            progress = solver.progress()
+            progress["seconds"] = seconds
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, progress)
+
+    def cancel(self):
+        """
+        stop the solve before the next pivot, the task is still awaited for the result,
+        whose status is cancelled if the solve is not done yet.
+        """
+        self.cancel_event.set()
+
+    def done(self):
+        """
+        check if the solve is done.
+
+        returns:
+            True if the solve is done.
+        """
+        return self.future.done()
+
+    async def result(self):
+        """
+        wait for the solve, if the waiting is cancelled, the solve is cancelled too.
+
+        returns:
+            objective_value: the optimal objective value, or the objective value of the best-known solution
+                if the solve is stopped, None if no feasible solution is known,
+            status: the status of the model.
+        """
+        try:
+            return await asyncio.shield(self.future)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def __await__(self):
+        return self.result().__await__()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.streamed:
+            raise StopAsyncIteration
+        progress = await self.queue.get()
+        if progress is None:
+            self.streamed = True
+            raise StopAsyncIteration
+        return progress
+
+
+def solve_async(model, simplex_type=const.SIMPLEX_PRIMAL, time_limit=None, iteration_limit=None, warm_start=True,
+                progress_interval=1, executor=None):
+    """
+    Start solving the linear programming in an executor, it must be called in a running event loop.
+    The task is awaited for the result, and iterated by async for to get the progress, the phase,
+    the iteration, the objective value of the standard form, the infeasibility and the seconds.
+    On the time limit, the iteration limit or the cancellation, the best-known feasible solution
+    is written to the model, and the next solve continues from the kept basis.
+
+    paras:
+        model: the linear programming model,
+        simplex_type: the type of the simplex method, a pricing of the revised simplex method or interior point,
+        time_limit: the maximum seconds, if None, there is no limit,
+        iteration_limit: the maximum number of pivots, if None, there is no limit,
+        warm_start: if False, the model is solved from scratch,
+        progress_interval: the progress is streamed every progress_interval iterations, if None, it is not streamed,
+        executor: the executor to run the solve in, if None, the default executor of the event loop is used.
+
+    returns:
+        the solve task, await it for (objective_value, status).
+    """
+    return SolveTask(model, simplex_type, time_limit, iteration_limit, warm_start, progress_interval, executor)
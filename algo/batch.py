@@ -0,0 +1,127 @@
+"""
+This file defines the batch solving of independent models.
+Last edited by Teast Ares, 20190130.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from util import *
+from constant import const
+from algo.standard_form import *
+from algo.simplex import *
+
+
+def model_arrays(model):
+    """
+    get a compact array form of a model without names, which is cheap to send to another process.
+
+    paras:
+        model: the model.
+
+    returns:
+        a dict of Numpy Ndarrays and numbers.
+    """
+    rows = model.rows
+    return {
+        "sense": model.sense,
+        "objective": objective_vector(model),
+        "objective_constant": model.objective.constant,
+        "lower_bound": model.columns.lower_bound.view(),
+        "upper_bound": model.columns.upper_bound.view(),
+        "cat": model.columns.cat.view(),
+        "row_sense": rows.sense.view(),
+        "rhs": rows.rhs.view(),
+        "row": rows.row.view(),
+        "column": rows.column.view(),
+        "coefficient": rows.coefficient.view()
+    }
+
+
+def model_from_arrays(arrays, name="model"):
+    """
+    build a model from its compact array form.
+
+    paras:
+        arrays: the compact array form of a model,
+        name: the name of the model.
+
+    returns:
+        the model.
+    """
+    model = Model(name=name, sense=arrays["sense"])
+    n = arrays["lower_bound"].shape[0]
+    m = arrays["rhs"].shape[0]
+    model.add_variables_from_arrays(
+        arrays["lower_bound"], arrays["upper_bound"], np.array(CAT_LIST, dtype=object)[arrays["cat"]],
+        objective=arrays["objective"]
+    )
+    model.objective.constant = arrays["objective_constant"]
+    model.rows.add_arrays(
+        ["c" + str(index) for index in range(m)], np.array(SENSE_LIST, dtype=object)[arrays["row_sense"]],
+        arrays["rhs"]
+    )
+    model.rows.add_items(arrays["row"], arrays["column"], arrays["coefficient"])
+    return model
+
+
+def solve_model_arrays(arrays, simplex_type=const.SIMPLEX_PRIMAL, max_iteration=None):
+    """
+    solve a model in its compact array form, this is the task of a worker process.
+
+    paras:
+        arrays: the compact array form of a model,
+        simplex_type: the type of the simplex method,
+        max_iteration: the maximum number of pivots, if None, there is no limit.
+
+    returns:
+        objective_value: the optimal objective value, None if the model is not solved to optimal,
+        status: the status of the model,
+        values: the value vector of the variables, None if the model is not solved to optimal.
+    """
+    model = model_from_arrays(arrays)
+    objective_value, status, _ = simplex_method(model, simplex_type, max_iteration, warm_start=False)
+    values = model.columns.value.view() if status == const.STATUS_OPTIMAL else None
+    return objective_value, status, values
+
+
+def solve_many(models, workers=None, simplex_type=const.SIMPLEX_PRIMAL, max_iteration=None):
+    """
+    solve many independent models over a process pool, the models are sent in the compact array form,
+    and the status and the values of the variables are written back to each model.
+
+    paras:
+        models: iteration of models,
+        workers: the number of worker processes, if None, it is the number of CPUs,
+            if 1, the models are solved in the current process,
+        simplex_type: the type of the simplex method,
+        max_iteration: the maximum number of pivots for each model, if None, there is no limit.
+
+    returns:
+        a list of (objective_value, status) in the order of the models.
+    """
+    models = list(models)
+    for model in models:
+        check_linear_model(model)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    task_list = [model_arrays(model) for model in models]
+    if workers <= 1 or len(models) <= 1:
+        result_list = [solve_model_arrays(arrays, simplex_type, max_iteration) for arrays in task_list]
+    else:
+        chunk_size = max(1, len(models) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            result_list = list(executor.map(
+                solve_model_arrays, task_list,
+                [simplex_type] * len(models), [max_iteration] * len(models),
+                chunksize=chunk_size
+            ))
+
+    summary = list()
+    for model, (objective_value, status, values) in zip(models, result_list):
+        model.status = status
+        if values is not None:
+            model.columns.value[:] = values
+        summary.append((objective_value, status))
+    return summary
@@ -0,0 +1,382 @@
+"""
+This file defines the branch and bound method for the mixed integer linear programming.
+Last edited by Teast Ares, 20190130.
+"""
+
+import os
+import copy
+import heapq
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from util import *
+from constant import const
+from algo.standard_form import *
+from algo.stats import *
+from algo.simplex import *
+from algo.batch import *
+
+
+class Node:
+    """
+    a node of the branch and bound tree, which is the relaxation with tightened bounds.
+
+    paras:
+        lower_bound: the lower bound vector of the variables,
+        upper_bound: the upper bound vector of the variables,
+        bound: the objective value of the parent's relaxation (in the maximization), an upper bound of the node,
+        depth: the depth in the tree,
+        form: the standard form of the parent, None if there is no parent,
+        solver: the copy of the parent's final simplex solver for the warm start, None if there is no parent.
+    """
+    __slots__ = ("lower_bound", "upper_bound", "bound", "depth", "form", "solver")
+
+    def __init__(self, lower_bound, upper_bound, bound=np.inf, depth=0, form=None, solver=None):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.bound = bound
+        self.depth = depth
+        self.form = form
+        self.solver = solver
+
+
+class BranchAndBound:
+    """
+    The branch and bound method on top of the revised simplex method.
+    The relaxation of a node is warm-started from the final basis of its parent by the dual simplex,
+    the nodes are selected by the best bound or depth first, and a node is pruned by the incumbent.
+    If there are more than one worker, a batch of open nodes are solved from scratch over a process pool.
+
+    paras:
+        model: the mixed integer linear programming model,
+        node_selection: best bound or depth first,
+        gap: the relative gap between the incumbent and the best bound to stop at,
+        time_limit: the maximum seconds, if None, there is no limit,
+        node_limit: the maximum number of nodes, if None, there is no limit,
+        workers: the number of worker processes, if 1, the nodes are solved in the current process,
+        callback: the function called with the simplex solver after each iteration of a node solved
+            in the current process, if None, nothing is called.
+    """
+    def __init__(self, model, node_selection=const.NODE_BEST_BOUND, gap=1e-6, time_limit=None, node_limit=None,
+                 workers=1, callback=None):
+        if node_selection not in (const.NODE_BEST_BOUND, const.NODE_DEPTH_FIRST):
+            raise ValueError("Node selection not valid")
+        self.model = model
+        self.node_selection = node_selection
+        self.gap = gap
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.callback = callback
+
+        self.integer = np.flatnonzero(model.columns.cat.view() == CAT_LIST.index(const.CAT_INTEGER))
+        self.c = objective_vector(model)
+        # the objective is maximized inside, so a larger bound is always better.
+        self.sense_sign = 1.0 if model.sense == const.SENSE_MAX else -1.0
+        self.rhs = model.rows.rhs.view().copy()
+        # a copy of the model, whose bounds are changed to build the standard form of a node.
+        self.work_model = model.copy(model.name)
+
+        self.open_list = list()
+        self.counter = 0
+        self.node_count = 0
+        self.incumbent = None
+        self.incumbent_value = -np.inf
+        self.best_bound = np.inf
+        self.status = const.STATUS_UNSOLVED
+        # the statistics of all the nodes solved in the current process.
+        self.stats = SolveStats(const.BRANCH_AND_BOUND)
+
+    def push(self, node):
+        """
+        add an open node.
+
+        paras:
+            node: the node.
+        """
+        # the counter breaks the ties, the later node first, which dives in the tree.
+        self.counter += 1
+        if self.node_selection == const.NODE_BEST_BOUND:
+            heapq.heappush(self.open_list, (-node.bound, -self.counter, node))
+        else:
+            self.open_list.append((-node.bound, -self.counter, node))
+
+    def pop(self):
+        """
+        take the next open node which can not be pruned by the incumbent.
+
+        returns:
+            the node, None if there is no open node left.
+        """
+        while self.open_list:
+            if self.node_selection == const.NODE_BEST_BOUND:
+                node = heapq.heappop(self.open_list)[2]
+            else:
+                node = self.open_list.pop()[2]
+            if not self.is_pruned(node.bound):
+                return node
+        return None
+
+    def is_pruned(self, bound):
+        """
+        check if a bound can not improve the incumbent.
+
+        paras:
+            bound: the bound in the maximization.
+
+        returns:
+            True if the node can be pruned.
+        """
+        return bound <= self.incumbent_value + self.gap * max(1.0, abs(self.incumbent_value))
+
+    def open_bound(self):
+        """
+        get the best bound of the open nodes.
+
+        returns:
+            the bound in the maximization, -inf if there is no open node.
+        """
+        if not self.open_list:
+            return -np.inf
+        if self.node_selection == const.NODE_BEST_BOUND:
+            return -self.open_list[0][0]
+        return -min(item[0] for item in self.open_list)
+
+    def node_form(self, node):
+        """
+        get the standard form of a node, the parent's form is reused if the bound types allow.
+
+        paras:
+            node: the node.
+
+        returns:
+            the standard form and the solver to warm-start, the solver is None for a new form.
+        """
+        form = node.form
+        if form is not None:
+            free = form.free
+            if np.isinf(node.lower_bound[free]).all() and np.isinf(node.upper_bound[free]).all():
+                with self.stats.timer(const.PHASE_STANDARDIZE):
+                    form = copy.copy(form)
+                    form.set_bounds(node.lower_bound, node.upper_bound, self.rhs)
+                return form, node.solver
+
+        self.work_model.columns.lower_bound[:] = node.lower_bound
+        self.work_model.columns.upper_bound[:] = node.upper_bound
+        with self.stats.timer(const.PHASE_STANDARDIZE):
+            form = standard_form(self.work_model)
+        return form, None
+
+    def solve_node(self, node):
+        """
+        solve the relaxation of a node.
+
+        paras:
+            node: the node.
+
+        returns:
+            status: the status of the relaxation,
+            values: the value vector of the variables, None if the relaxation is not optimal,
+            form: the standard form of the node,
+            solver: the final simplex solver of the node.
+        """
+        form, solver = self.node_form(node)
+        status = None
+        if solver is not None:
+            solver.attach(self.stats, self.callback)
+            solver.update(b=form.b, upper_bound=form.upper_bound[:solver.n])
+            status = solver.resolve()
+        if status is None:
+            solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, stats=self.stats, callback=self.callback)
+            status = solver.solve()
+        values = form.recover(solver.x) if status == const.STATUS_OPTIMAL else None
+        return status, values, form, solver
+
+    def branch(self, node, values, bound, form=None, solver=None):
+        """
+        process the optimal relaxation of a node, update the incumbent or branch on the most fractional variable.
+
+        paras:
+            node: the node,
+            values: the value vector of the variables,
+            bound: the objective value of the relaxation in the maximization,
+            form: the standard form of the node, None if the children are solved from scratch,
+            solver: the final simplex solver of the node, None if the children are solved from scratch.
+        """
+        if self.is_pruned(bound):
+            return
+
+        fraction = np.abs(values[self.integer] - np.round(values[self.integer]))
+        if self.integer.shape[0] == 0 or fraction.max() <= const.TOL_INTEGER:
+            self.incumbent = values.copy()
+            self.incumbent[self.integer] = np.round(values[self.integer])
+            # the value of the rounded solution, so the reported objective matches the reported values.
+            self.incumbent_value = self.objective_value(self.incumbent)
+            return
+
+        j = self.integer[np.abs(fraction - 0.5).argmin()]
+        down_upper_bound = node.upper_bound.copy()
+        down_upper_bound[j] = math.floor(values[j])
+        up_lower_bound = node.lower_bound.copy()
+        up_lower_bound[j] = math.ceil(values[j])
+
+        # a child whose bounds cross is infeasible, it is pruned without being solved.
+        child_list = list()
+        if down_upper_bound[j] >= node.lower_bound[j]:
+            child_list.append(Node(node.lower_bound, down_upper_bound, bound, node.depth + 1, form,
+                                   None if solver is None else solver.copy()))
+        if up_lower_bound[j] <= node.upper_bound[j]:
+            child_list.append(Node(up_lower_bound, node.upper_bound, bound, node.depth + 1, form, solver))
+        # the child on the side of the rounding is explored first in the depth first search.
+        if values[j] - math.floor(values[j]) < 0.5:
+            child_list.reverse()
+        for child in child_list:
+            self.push(child)
+
+    def limit_status(self, start):
+        """
+        check the time and node limits.
+
+        paras:
+            start: the start time.
+
+        returns:
+            the status of the limit reached, None if no limit is reached.
+        """
+        if self.time_limit is not None and time.time() - start >= self.time_limit:
+            return const.STATUS_TIME_LIMIT
+        if self.node_limit is not None and self.node_count >= self.node_limit:
+            return const.STATUS_NODE_LIMIT
+        return None
+
+    def objective_value(self, values):
+        """
+        get the objective value of the variables in the maximization.
+
+        paras:
+            values: the value vector of the variables.
+
+        returns:
+            the objective value.
+        """
+        return self.sense_sign * (self.c.dot(values) + self.model.objective.constant)
+
+    def solve(self):
+        """
+        run the branch and bound, the incumbent and the status are written back to the model.
+
+        returns:
+            objective_value: the objective value of the incumbent, None if there is no incumbent,
+            status: the status of the model.
+        """
+        start = time.time()
+        model = self.model
+        lower_bound = model.columns.lower_bound.view().copy()
+        upper_bound = model.columns.upper_bound.view().copy()
+        # the bounds of the integer variables are rounded inwards, so the branches never cross them.
+        lower_bound[self.integer] = np.ceil(lower_bound[self.integer] - const.TOL_INTEGER)
+        upper_bound[self.integer] = np.floor(upper_bound[self.integer] + const.TOL_INTEGER)
+        # the root is infeasible if any bounds cross, no node is solved.
+        if (lower_bound <= upper_bound).all():
+            self.push(Node(lower_bound, upper_bound))
+        arrays = None
+        executor = None
+        if self.workers > 1:
+            arrays = model_arrays(model)
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        status = None
+        while status is None:
+            status = self.limit_status(start)
+            if status is not None:
+                break
+
+            if arrays is None:
+                node_list = [self.pop()]
+            else:
+                node_list = [self.pop() for _ in range(self.workers)]
+            node_list = [node for node in node_list if node is not None]
+            if not node_list:
+                break
+
+            if arrays is None:
+                result_list = [self.solve_node(node) for node in node_list]
+            else:
+                result_list = self.solve_nodes(executor, arrays, node_list)
+            self.node_count += len(node_list)
+            self.stats.node_count = self.node_count
+
+            for node, (node_status, values, form, solver) in zip(node_list, result_list):
+                if node_status == const.STATUS_UNBOUNDED:
+                    status = const.STATUS_UNBOUNDED
+                    break
+                if node_status == const.STATUS_OPTIMAL:
+                    self.branch(node, values, self.objective_value(values), form, solver)
+
+            if self.incumbent is not None and not self.open_list:
+                break
+            if self.incumbent is not None and self.is_pruned(self.open_bound()):
+                self.open_list = list()
+
+        if executor is not None:
+            executor.shutdown()
+        # the best bound is in the sense of the model.
+        self.best_bound = self.sense_sign * max(self.open_bound(), self.incumbent_value)
+        if status is None:
+            status = const.STATUS_OPTIMAL if self.incumbent is not None else const.STATUS_NO_SOLUTION
+
+        self.status = status
+        model.status = status
+        self.stats.status = status
+        model.solve_stats = self.stats
+        if self.incumbent is None:
+            return None, status
+        model.columns.value[:] = self.incumbent
+        return float(self.sense_sign * self.incumbent_value), status
+
+    def solve_nodes(self, executor, arrays, node_list):
+        """
+        solve the relaxations of a batch of nodes from scratch over a process pool.
+
+        paras:
+            executor: the process pool,
+            arrays: the compact array form of the model,
+            node_list: the list of nodes.
+
+        returns:
+            the list of (status, values, form, solver), the forms and solvers are None.
+        """
+        task_list = list()
+        for node in node_list:
+            task = dict(arrays)
+            task["cat"] = np.full_like(arrays["cat"], CAT_LIST.index(const.CAT_CONTINUOUS))
+            task["lower_bound"] = node.lower_bound
+            task["upper_bound"] = node.upper_bound
+            task_list.append(task)
+        result_list = list(executor.map(solve_model_arrays, task_list))
+        return [(status, values, None, None) for _, status, values in result_list]
+
+
+def branch_and_bound(model, node_selection=const.NODE_BEST_BOUND, gap=1e-6, time_limit=None, node_limit=None,
+                     workers=1, callback=None):
+    """
+    solve a mixed integer linear programming by the branch and bound method,
+    the values of the variables and the status are written back to the model,
+    and the solve statistics of the nodes are kept on the model.
+
+    paras:
+        model: the mixed integer linear programming model,
+        node_selection: best bound or depth first,
+        gap: the relative gap between the incumbent and the best bound to stop at,
+        time_limit: the maximum seconds, if None, there is no limit,
+        node_limit: the maximum number of nodes, if None, there is no limit,
+        workers: the number of worker processes, if 1, the nodes are solved in the current process,
+        callback: the function called with the simplex solver after each iteration of a node solved
+            in the current process, if None, nothing is called.
+
+    returns:
+        objective_value: the objective value of the best integer solution, None if there is no one,
+        status: the status of the model, optimal if the gap is closed.
+    """
+    return BranchAndBound(model, node_selection, gap, time_limit, node_limit, workers, callback).solve()
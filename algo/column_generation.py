@@ -0,0 +1,131 @@
+"""
+This file defines the column generation driven by the dual prices of the simplex method.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from constant import const
+from algo.stats import *
+from algo.simplex import *
+from algo.sensitivity import *
+
+
+class ColumnGeneration:
+    """
+    The column generation on a restricted master linear programming.
+    In each round the master is solved, the dual prices are given to the pricing function,
+    and the columns it returns are inserted into the matrix and the final basis of the master,
+    so the master is warm-started by the primal simplex without being standardized again.
+    It stops when the pricing returns no column.
+
+    paras:
+        master: the restricted master model, which must be feasible,
+        pricing: the pricing function, pricing(dual_dict, master) with the dual price of each constraint by name,
+            returns an iteration of (variable, objective coefficient, coefficient dict), the coefficient dict
+            has the coefficient of the variable in each constraint, by the constraint or its name,
+        max_round: the maximum number of rounds, if None, there is no limit,
+        max_iteration: the maximum number of pivots of each solve of the master, if None, there is no limit,
+        simplex_type: the simplex type of the first solve of the master,
+        callback: the function called with the simplex solver after each iteration, if None, nothing is called.
+    """
+    def __init__(self, master, pricing, max_round=None, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL,
+                 callback=None):
+        if simplex_type not in PRICING_LIST:
+            raise ValueError("Simplex type not valid")
+        self.master = master
+        self.pricing = pricing
+        self.max_round = max_round
+        self.max_iteration = max_iteration
+        self.simplex_type = simplex_type
+        self.callback = callback
+
+        self.round = 0
+        self.column_count = 0
+        # the objective value of the master and the number of columns added in each round.
+        self.history = list()
+        self.stats = SolveStats(const.COLUMN_GENERATION)
+        self.status = const.STATUS_UNSOLVED
+        self.objective_value = None
+
+    def solve_master(self):
+        """
+        solve the master, warm-started from the last round.
+
+        returns:
+            the status of the master.
+        """
+        master = self.master
+        self.objective_value, status, _ = simplex_method(
+            master, self.simplex_type, max_iteration=self.max_iteration, callback=self.callback
+        )
+        self.stats.merge(master.solve_stats)
+        return status
+
+    def add_columns(self, column_list):
+        """
+        add the columns returned by the pricing to the master and to its final basis.
+
+        paras:
+            column_list: the list of (variable, objective coefficient, coefficient dict).
+        """
+        master = self.master
+        with self.stats.timer(const.PHASE_STANDARDIZE):
+            for variable, objective, coefficient_dict in column_list:
+                master.add_column(variable, coefficient_dict, objective)
+            master.simplex_cache.add_columns(master)
+        self.column_count += len(column_list)
+
+    def solve(self):
+        """
+        run the column generation, the values of the variables and the status are written back to the master.
+
+        returns:
+            objective_value: the objective value of the master,
+            status: the status, optimal if no column prices out.
+        """
+        master = self.master
+        status = self.solve_master()
+        while status == const.STATUS_OPTIMAL:
+            if self.max_round is not None and self.round >= self.max_round:
+                status = const.STATUS_ROUND_LIMIT
+                break
+            with self.stats.timer(const.PHASE_PRICING):
+                dual, _ = dual_arrays(master)
+                column_list = list(self.pricing(dict(zip(master.rows.name_list, dual.tolist())), master))
+            self.round += 1
+            self.history.append((self.objective_value, len(column_list)))
+            if not column_list:
+                break
+            self.add_columns(column_list)
+            status = self.solve_master()
+
+        self.status = status
+        master.status = status
+        self.stats.status = status
+        master.solve_stats = self.stats
+        return self.objective_value, status
+
+
+def column_generation(master, pricing, max_round=None, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL,
+                      callback=None):
+    """
+    solve a linear programming with too many columns to build by the column generation,
+    the values of the variables and the status are written back to the master,
+    and the solve statistics of all the rounds are kept on the master.
+
+    paras:
+        master: the restricted master model, which must be feasible,
+        pricing: the pricing function, pricing(dual_dict, master) with the dual price of each constraint by name,
+            returns an iteration of (variable, objective coefficient, coefficient dict), empty if no column
+            has an improving reduced cost,
+        max_round: the maximum number of rounds, if None, there is no limit,
+        max_iteration: the maximum number of pivots of each solve of the master, if None, there is no limit,
+        simplex_type: the simplex type of the first solve of the master,
+        callback: the function called with the simplex solver after each iteration, if None, nothing is called.
+
+    returns:
+        objective_value: the objective value of the master,
+        status: the status, optimal if no column prices out.
+    """
+    return ColumnGeneration(master, pricing, max_round, max_iteration, simplex_type, callback).solve()
@@ -0,0 +1,193 @@
+"""
+This file defines the lazy constraints, the cutting plane method which generates the violated rows on demand.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from constant import const
+from algo.stats import *
+from algo.simplex import *
+
+
+class CuttingPlane:
+    """
+    The cutting plane method with lazy constraints.
+    In each round the active linear programming is solved, the separation function inspects the solution
+    and returns the violated constraints, which are appended to the model, to the standard form and to
+    the final basis with their slack columns basic, so the model is re-optimized by the dual simplex.
+    A cut whose slack is positive for more than age_limit rounds in a row is removed,
+    which keeps the active linear programming small, it is added again if it is violated again.
+    It stops when the separation returns no constraint.
+
+    paras:
+        model: the model with the constraints known up front, the active cuts are kept in it,
+        separation: the separation function, separation(x, model) with the value vector of the variables
+            in the order of their indices, returns an iteration of violated constraints over the variables
+            of the model, a constraint with the name of an active constraint is skipped,
+        max_round: the maximum number of rounds, if None, there is no limit,
+        age_limit: the number of rounds in a row a cut may be slack before it is removed,
+            if None, the cuts are never removed,
+        max_iteration: the maximum number of pivots of each solve, if None, there is no limit,
+        simplex_type: the simplex type of the first solve,
+        callback: the function called with the simplex solver after each iteration, if None, nothing is called,
+        tolerance: the slack of a cut to count as not binding.
+    """
+    def __init__(self, model, separation, max_round=None, age_limit=None, max_iteration=None,
+                 simplex_type=const.SIMPLEX_PRIMAL, callback=None, tolerance=1e-6):
+        if simplex_type not in PRICING_LIST:
+            raise ValueError("Simplex type not valid")
+        self.model = model
+        self.separation = separation
+        self.max_round = max_round
+        self.age_limit = age_limit
+        self.max_iteration = max_iteration
+        self.simplex_type = simplex_type
+        self.callback = callback
+        self.tolerance = tolerance
+
+        self.round = 0
+        self.cut_count = 0
+        self.removed_count = 0
+        # the number of rounds in a row each active cut is slack, by name.
+        self.age_dict = dict()
+        # the objective value and the numbers of cuts added and removed in each round.
+        self.history = list()
+        self.stats = SolveStats(const.CUTTING_PLANE)
+        self.status = const.STATUS_UNSOLVED
+        self.objective_value = None
+
+    def solve_model(self):
+        """
+        solve the active linear programming, warm-started from the last round.
+
+        returns:
+            the status.
+        """
+        model = self.model
+        self.objective_value, status, _ = simplex_method(
+            model, self.simplex_type, max_iteration=self.max_iteration, callback=self.callback
+        )
+        self.stats.merge(model.solve_stats)
+        return status
+
+    def age_cuts(self):
+        """
+        update the ages of the active cuts by their slacks in the current solution.
+
+        returns:
+            the list of names of the cuts to remove.
+        """
+        rows = self.model.rows
+        if not self.age_dict:
+            return list()
+        name_list = list(self.age_dict)
+        index = np.array([rows.index_dict[name] for name in name_list])
+        activity = rows.csr(len(self.model.columns))[index].dot(self.model.columns.value.view())
+        slack = np.abs(rows.rhs.view()[index] - activity)
+        remove_list = list()
+        for name, value in zip(name_list, slack):
+            self.age_dict[name] = self.age_dict[name] + 1 if value > self.tolerance else 0
+            if self.age_limit is not None and self.age_dict[name] > self.age_limit:
+                remove_list.append(name)
+        return remove_list
+
+    def remove_cuts(self, name_list):
+        """
+        remove slack cuts from the model, the standard form and the final basis.
+
+        paras:
+            name_list: the names of the cuts.
+        """
+        model = self.model
+        with self.stats.timer(const.PHASE_STANDARDIZE):
+            index = [model.rows.index_dict[name] for name in name_list]
+            model.remove_constraints(name_list)
+            model.simplex_cache.remove_rows(model, index)
+        for name in name_list:
+            del self.age_dict[name]
+        self.removed_count += len(name_list)
+
+    def add_cuts(self, constraint_list):
+        """
+        add violated constraints to the model, the standard form and the final basis.
+
+        paras:
+            constraint_list: the list of constraints.
+        """
+        model = self.model
+        # the cuts are checked before any is added, so a bad cut leaves the model unchanged.
+        for constraint in constraint_list:
+            for variable_name in constraint.lhs.to_expression().coefficient_dict:
+                if variable_name not in model.columns.index_dict:
+                    raise ValueError("A cut has variables not in the model")
+        with self.stats.timer(const.PHASE_STANDARDIZE):
+            for constraint in constraint_list:
+                model.add_constraint(constraint)
+                self.age_dict[constraint.name] = 0
+            model.simplex_cache.add_rows(model)
+        self.cut_count += len(constraint_list)
+
+    def solve(self):
+        """
+        run the cutting plane method, the values of the variables and the status are written back to the model.
+
+        returns:
+            objective_value: the objective value of the active linear programming,
+            status: the status, optimal if no constraint is violated.
+        """
+        model = self.model
+        status = self.solve_model()
+        while status == const.STATUS_OPTIMAL:
+            if self.max_round is not None and self.round >= self.max_round:
+                status = const.STATUS_ROUND_LIMIT
+                break
+            with self.stats.timer(const.PHASE_SEPARATION):
+                constraint_list = [
+                    constraint for constraint in self.separation(model.columns.value.view().copy(), model)
+                    if constraint.name not in model.rows.index_dict
+                ]
+            self.round += 1
+            remove_list = self.age_cuts() if constraint_list else list()
+            self.history.append((self.objective_value, len(constraint_list), len(remove_list)))
+            if not constraint_list:
+                break
+            if remove_list:
+                self.remove_cuts(remove_list)
+            self.add_cuts(constraint_list)
+            status = self.solve_model()
+
+        self.status = status
+        model.status = status
+        self.stats.status = status
+        model.solve_stats = self.stats
+        return self.objective_value, status
+
+
+def cutting_plane(model, separation, max_round=None, age_limit=None, max_iteration=None,
+                  simplex_type=const.SIMPLEX_PRIMAL, callback=None, tolerance=1e-6):
+    """
+    solve a linear programming with too many constraints to build by the cutting plane method,
+    the violated constraints are generated by the separation function and added as lazy constraints,
+    the values of the variables and the status are written back to the model,
+    and the solve statistics of all the rounds are kept on the model.
+
+    paras:
+        model: the model with the constraints known up front, the active cuts are kept in it,
+        separation: the separation function, separation(x, model) with the value vector of the variables
+            in the order of their indices, returns an iteration of violated constraints over the variables
+            of the model, empty if the solution violates none,
+        max_round: the maximum number of rounds, if None, there is no limit,
+        age_limit: the number of rounds in a row a cut may be slack before it is removed,
+            if None, the cuts are never removed,
+        max_iteration: the maximum number of pivots of each solve, if None, there is no limit,
+        simplex_type: the simplex type of the first solve,
+        callback: the function called with the simplex solver after each iteration, if None, nothing is called,
+        tolerance: the slack of a cut to count as not binding.
+
+    returns:
+        objective_value: the objective value of the active linear programming,
+        status: the status, optimal if no constraint is violated.
+    """
+    return CuttingPlane(model, separation, max_round, age_limit, max_iteration, simplex_type, callback,
+                        tolerance).solve()
@@ -0,0 +1,285 @@
+"""
+This file defines the primal-dual interior point method.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu, cg
+from constant import const
+
+
+class NormalEquations:
+    """
+    the normal equations A Theta A^T dy = r of an interior point iteration,
+    which are solved by the sparse LU factorization, or by the conjugate gradient method
+    if the factorization fails.
+
+    paras:
+        A: the left hand side matrix in the scipy.sparse CSC format,
+        theta: the diagonal scaling vector.
+    """
+    def __init__(self, A, theta):
+        M = sp.csc_matrix(A.dot(sp.diags(theta)).dot(A.T))
+        # a tiny regularization keeps the matrix nonsingular when there are redundant rows.
+        diagonal = M.diagonal()
+        self.M = M + sp.diags(np.maximum(diagonal, 1.0) * 1e-12)
+        self.preconditioner = sp.diags(1 / np.maximum(diagonal, 1e-12))
+        try:
+            self.lu = splu(sp.csc_matrix(self.M))
+        except RuntimeError:
+            self.lu = None
+
+    def solve(self, r):
+        """
+        solve the normal equations.
+
+        paras:
+            r: the right hand side vector.
+
+        returns:
+            the solution vector.
+        """
+        if self.lu is not None:
+            y = self.lu.solve(r)
+            # one step of the iterative refinement for the accuracy near the optimal.
+            return y + self.lu.solve(r - self.M.dot(y))
+        y, _ = cg(self.M, r, rtol=1e-12, maxiter=10 * r.shape[0], M=self.preconditioner)
+        return y
+
+
+class InteriorPoint:
+    """
+    Mehrotra's predictor-corrector primal-dual interior point method for the standard form
+    ----------
+    Max cx
+    s.t.
+    Ax = b
+    0 <= x <= u
+    ----------
+    The upper bounds are kept by the slack variables w, x + w = u, of the columns with finite upper bounds.
+    The dual variables are y for the rows, z for x >= 0 and v for x <= u.
+
+    paras:
+        c: the cost function vector,
+        A: the left hand side matrix, a scipy.sparse matrix,
+        b: the right hand side vector,
+        upper_bound: the upper bound vector, inf for infinite, if None, all the upper bounds are infinite,
+        max_iteration: the maximum number of iterations,
+        tolerance: the relative tolerance of the infeasibility and the duality gap,
+        free_pair: the positive and negative part column vectors of the split two-side open variables,
+            both parts are pulled back together after each iteration so that they do not diverge,
+        callback: the function called with the solver after each iteration, if None, nothing is called.
+    """
+    def __init__(self, c, A, b, upper_bound=None, max_iteration=100, tolerance=1e-8, free_pair=None,
+                 callback=None):
+        self.m, self.n = A.shape
+        self.c = np.asarray(c, dtype=float)
+        self.A = sp.csc_matrix(A)
+        self.b = np.asarray(b, dtype=float)
+        if upper_bound is None:
+            self.upper_bound = np.full(self.n, np.inf)
+        else:
+            self.upper_bound = np.asarray(upper_bound, dtype=float)
+        self.max_iteration = max_iteration
+        self.tolerance = tolerance
+        if free_pair is None:
+            free_pair = (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+        self.free_pair = free_pair
+        self.callback = callback
+
+        self.iteration = 0
+        # the primal objective value and the relative infeasibility of the current iterate.
+        self.primal_objective_value = None
+        self.infeasibility = None
+        # the status to stop with before the next iteration, set by interrupt.
+        self.interrupt_status = None
+        self.status = const.STATUS_UNSOLVED
+        self.x = None
+        self.y = None
+        # the dual variables of the lower and upper bounds, v is zero for an infinite upper bound.
+        self.z = None
+        self.v = None
+        self.objective_value = None
+
+    def solve(self):
+        """
+        solve the linear programming.
+
+        returns:
+            the status.
+        """
+        # the columns fixed at zero are left out of the iterations.
+        active = np.flatnonzero(self.upper_bound > const.TOL_PRIMAL)
+        A = self.A[:, active]
+        cost = -self.c[active]
+        b = self.b
+        upper_bound = self.upper_bound[active]
+        closed = np.flatnonzero(np.isfinite(upper_bound))
+        u = upper_bound[closed]
+        n = active.shape[0]
+        position = np.full(self.n, -1)
+        position[active] = np.arange(n)
+        positive, negative = position[self.free_pair[0]], position[self.free_pair[1]]
+
+        x = np.ones(n)
+        x[closed] = np.minimum(1.0, u / 2)
+        w = u - x[closed]
+        z = np.ones(n)
+        v = np.ones(closed.shape[0])
+        y = np.zeros(self.m)
+        size = n + closed.shape[0]
+
+        b_norm = 1 + np.abs(b).max(initial=0)
+        c_norm = 1 + np.abs(cost).max(initial=0)
+        u_norm = 1 + np.abs(u).max(initial=0)
+        self.status = const.STATUS_ITERATION_LIMIT
+        while self.iteration < self.max_iteration:
+            if self.interrupt_status is not None:
+                self.status = self.interrupt_status
+                break
+            rb = b - A.dot(x)
+            ru = u - x[closed] - w
+            rc = cost - A.T.dot(y) - z
+            rc[closed] += v
+            primal_objective = cost.dot(x)
+            dual_objective = b.dot(y) - u.dot(v)
+            mu = (x.dot(z) + w.dot(v)) / max(size, 1)
+
+            infeasibility = max(
+                np.abs(rb).max(initial=0) / b_norm, np.abs(ru).max(initial=0) / u_norm,
+                np.abs(rc).max(initial=0) / c_norm
+            )
+            if (infeasibility <= self.tolerance
+                    and abs(primal_objective - dual_objective) <= self.tolerance * (1 + abs(primal_objective))):
+                self.status = const.STATUS_OPTIMAL
+                break
+            # the normal equations are too ill-conditioned to make progress when the complementarity vanishes,
+            # the point is accepted with a looser tolerance.
+            if mu <= self.tolerance ** 2 * (1 + abs(primal_objective)):
+                if infeasibility <= np.sqrt(self.tolerance) / 1000:
+                    self.status = const.STATUS_OPTIMAL
+                break
+            # a diverging primal means a dual without solution, and the other way round.
+            if x.max(initial=0) > 1e12 * b_norm:
+                self.status = const.STATUS_UNBOUNDED
+                break
+            if np.abs(y).max(initial=0) > 1e12 * c_norm or z.max(initial=0) > 1e12 * c_norm:
+                self.status = const.STATUS_NO_SOLUTION
+                break
+
+            # the step is checked once instead of each division, the iterates of a diverging problem
+            # may overflow before the divergence is detected, then the iterations stop without a solution.
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                step = self.step(A, x, w, y, z, v, rb, ru, rc, closed, mu, size)
+            if not all(np.isfinite(value).all() for value in step):
+                break
+            x, w, y, z, v = step
+            shift = np.maximum(np.minimum(x[positive], x[negative]) - 1.0, 0)
+            x[positive] -= shift
+            x[negative] -= shift
+            self.iteration += 1
+            self.primal_objective_value = -primal_objective
+            self.infeasibility = infeasibility
+            if self.callback is not None:
+                self.callback(self)
+
+        self.x = np.zeros(self.n)
+        self.x[active] = x
+        self.y = -y
+        self.z = np.zeros(self.n)
+        self.z[active] = z
+        self.v = np.zeros(self.n)
+        self.v[active[closed]] = v
+        self.objective_value = self.c.dot(self.x)
+        return self.status
+
+    def step(self, A, x, w, y, z, v, rb, ru, rc, closed, mu, size):
+        """
+        take a predictor-corrector step, the positive vectors go at most 99% of the way to the boundary.
+
+        paras:
+            A: the matrix of the active columns,
+            x, w, y, z, v: the current iterate,
+            rb, ru, rc: the residuals of the rows, the upper bounds and the reduced costs,
+            closed: the index vector of the active columns with finite upper bounds,
+            mu: the complementarity,
+            size: the number of the complementarity pairs.
+
+        returns:
+            the next iterate, x, w, y, z, v.
+        """
+        n = x.shape[0]
+        theta = 1 / (z / x + np.bincount(closed, v / w, minlength=n))
+        normal = NormalEquations(A, theta)
+
+        def direction(rxz, rwv):
+            r = rc - rxz / x
+            r[closed] += (rwv - v * ru) / w
+            dy = normal.solve(rb + A.dot(theta * r))
+            dx = theta * (A.T.dot(dy) - r)
+            dz = (rxz - z * dx) / x
+            dw = ru - dx[closed]
+            dv = (rwv - v * dw) / w
+            return dx, dy, dz, dw, dv
+
+        # the predictor (affine scaling) direction.
+        dx, dy, dz, dw, dv = direction(-x * z, -w * v)
+        primal_step = min(1.0, max_step(x, dx), max_step(w, dw))
+        dual_step = min(1.0, max_step(z, dz), max_step(v, dv))
+        mu_affine = (
+            (x + primal_step * dx).dot(z + dual_step * dz) + (w + primal_step * dw).dot(v + dual_step * dv)
+        ) / max(size, 1)
+        sigma = (mu_affine / mu) ** 3
+
+        # the corrector direction with the centering term.
+        dx, dy, dz, dw, dv = direction(sigma * mu - x * z - dx * dz, sigma * mu - w * v - dw * dv)
+        primal_step = min(1.0, 0.99 * min(max_step(x, dx), max_step(w, dw)))
+        dual_step = min(1.0, 0.99 * min(max_step(z, dz), max_step(v, dv)))
+        # each entry keeps at least 1% of its value in the exact arithmetic, the floor only removes
+        # the zeros of the roundoff, which would make the scaling infinite.
+        return (
+            np.maximum(x + primal_step * dx, 1e-3 * x), np.maximum(w + primal_step * dw, 1e-3 * w),
+            y + dual_step * dy,
+            np.maximum(z + dual_step * dz, 1e-3 * z), np.maximum(v + dual_step * dv, 1e-3 * v)
+        )
+
+    def interrupt(self, status=const.STATUS_CANCELLED):
+        """
+        stop the iterations before the next one, it is called by the callback or from another thread.
+
+        paras:
+            status: the status to stop with, the time limit or the cancelled.
+        """
+        self.interrupt_status = status
+
+    def progress(self):
+        """
+        get the progress of the iterations for the callback, the values are of the iterate before the last step.
+
+        returns:
+            a dict of the phase, the iteration, the objective value and the relative infeasibility.
+        """
+        return {
+            "phase": const.PHASE_INTERIOR_POINT,
+            "iteration": self.iteration,
+            "objective_value": self.primal_objective_value,
+            "infeasibility": self.infeasibility
+        }
+
+
+def max_step(x, dx):
+    """
+    get the largest step length keeping a positive vector nonnegative.
+
+    paras:
+        x: the positive vector,
+        dx: the direction.
+
+    returns:
+        the step length, inf if the direction is nonnegative.
+    """
+    negative = dx < 0
+    if not negative.any():
+        return np.inf
+    return (-x[negative] / dx[negative]).min()
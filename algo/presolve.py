@@ -0,0 +1,378 @@
+"""
+This file defines the presolve and postsolve of a linear programming.
+Last edited by Teast Ares, 20190130.
+"""
+
+import math
+import numpy as np
+import scipy.sparse as sp
+from util import *
+from constant import const
+from algo.rank import *
+
+
+class Presolve:
+    """
+    reduce a model before it is standardized, the reductions are fixed variables, empty rows,
+    singleton rows, duplicate rows, dominated columns and linearly dependent equality rows.
+    Every reduction fixes a variable, tightens a bound or removes a row,
+    so a solution of the reduced model is postsolved by putting back the fixed values.
+
+    paras:
+        model: the original model,
+        max_pass: the maximum number of passes over the reductions.
+    """
+    def __init__(self, model, max_pass=20):
+        self.original = model
+        self.max_pass = max_pass
+        n = len(model.columns)
+        m = len(model.rows)
+
+        self.A = model.rows.csr(n)
+        self.lower_bound = model.columns.lower_bound.view().copy()
+        self.upper_bound = model.columns.upper_bound.view().copy()
+        self.integer = model.columns.cat.view() == CAT_LIST.index(const.CAT_INTEGER)
+        self.c = objective_vector(model)
+        # the cost function of the minimization.
+        self.cost = self.c if model.sense == const.SENSE_MIN else -self.c
+        self.sense = model.rows.sense.view().copy()
+        self.rhs = model.rows.rhs.view().copy()
+
+        self.column_alive = np.ones(n, dtype=bool)
+        self.row_alive = np.ones(m, dtype=bool)
+        self.value = np.zeros(n)
+        self.objective_offset = 0.0
+
+        self.status = None
+        self.model = None
+        # the original indices of the columns and rows in the reduced model.
+        self.column_index = None
+        self.row_index = None
+
+    def active_matrix(self):
+        """
+        get the matrix of the alive rows and columns, the others are zeroed.
+
+        returns:
+            the matrix in the CSR format.
+        """
+        A = sp.diags(self.row_alive.astype(float)).dot(self.A).dot(sp.diags(self.column_alive.astype(float)))
+        A = sp.csr_matrix(A)
+        A.eliminate_zeros()
+        return A
+
+    def infeasible(self):
+        """
+        mark the model as infeasible.
+
+        returns:
+            True, the model is changed.
+        """
+        self.status = const.STATUS_NO_SOLUTION
+        return True
+
+    def remove_fixed_columns(self):
+        """
+        remove the variables whose lower bound equals the upper bound, they are moved to the right hand side.
+
+        returns:
+            True if a variable is removed.
+        """
+        fixed = np.flatnonzero(self.column_alive & (self.upper_bound - self.lower_bound <= const.TOL_PRIMAL))
+        if fixed.shape[0] == 0:
+            return False
+        self.value[fixed] = self.lower_bound[fixed]
+        self.rhs -= self.A[:, fixed].dot(self.value[fixed])
+        self.objective_offset += self.c[fixed].dot(self.value[fixed])
+        self.column_alive[fixed] = False
+        return True
+
+    def remove_empty_rows(self, A):
+        """
+        remove the rows without items, the model is infeasible if one of them is violated.
+
+        paras:
+            A: the active matrix.
+
+        returns:
+            True if a row is removed.
+        """
+        empty = np.flatnonzero(self.row_alive & (np.diff(A.indptr) == 0))
+        if empty.shape[0] == 0:
+            return False
+        sense = self.sense[empty]
+        rhs = self.rhs[empty]
+        violated = np.where(
+            sense == SENSE_LIST.index(const.SENSE_LEQ), rhs < -const.TOL_PRIMAL,
+            np.where(sense == SENSE_LIST.index(const.SENSE_GEQ), rhs > const.TOL_PRIMAL,
+                     np.abs(rhs) > const.TOL_PRIMAL)
+        )
+        if violated.any():
+            return self.infeasible()
+        self.row_alive[empty] = False
+        return True
+
+    def tighten_bound(self, j, lower_bound, upper_bound):
+        """
+        tighten the bounds of a variable, the bounds of an integer variable are rounded.
+
+        paras:
+            j: the index of the variable,
+            lower_bound: the new lower bound, -inf if it is not changed,
+            upper_bound: the new upper bound, inf if it is not changed.
+
+        returns:
+            True if the bounds become infeasible.
+        """
+        if self.integer[j]:
+            lower_bound = math.ceil(lower_bound - const.TOL_PRIMAL) if np.isfinite(lower_bound) else lower_bound
+            upper_bound = math.floor(upper_bound + const.TOL_PRIMAL) if np.isfinite(upper_bound) else upper_bound
+        self.lower_bound[j] = max(self.lower_bound[j], lower_bound)
+        self.upper_bound[j] = min(self.upper_bound[j], upper_bound)
+        if self.lower_bound[j] > self.upper_bound[j] + const.TOL_PRIMAL:
+            return True
+        if self.lower_bound[j] > self.upper_bound[j]:
+            self.upper_bound[j] = self.lower_bound[j]
+        return False
+
+    def remove_singleton_rows(self, A):
+        """
+        turn the rows with only one item into the bounds of the variable.
+
+        paras:
+            A: the active matrix.
+
+        returns:
+            True if a row is removed.
+        """
+        singleton = np.flatnonzero(self.row_alive & (np.diff(A.indptr) == 1))
+        if singleton.shape[0] == 0:
+            return False
+        for i in singleton:
+            j = A.indices[A.indptr[i]]
+            a = A.data[A.indptr[i]]
+            bound = self.rhs[i] / a
+            sense = SENSE_LIST[self.sense[i]]
+            if sense == const.SENSE_EQ:
+                infeasible = self.tighten_bound(j, bound, bound)
+            elif (sense == const.SENSE_LEQ) == (a > 0):
+                infeasible = self.tighten_bound(j, -np.inf, bound)
+            else:
+                infeasible = self.tighten_bound(j, bound, np.inf)
+            if infeasible:
+                return self.infeasible()
+        self.row_alive[singleton] = False
+        return True
+
+    def row_interval(self, i, scale):
+        """
+        get the interval of a scaled row's left hand side.
+
+        paras:
+            i: the row index,
+            scale: the scale of the row.
+
+        returns:
+            the lower and upper limits.
+        """
+        sense = SENSE_LIST[self.sense[i]]
+        value = self.rhs[i] * scale
+        if sense == const.SENSE_EQ:
+            return value, value
+        if (sense == const.SENSE_LEQ) == (scale > 0):
+            return -np.inf, value
+        return value, np.inf
+
+    def set_row_interval(self, i, scale, lower, upper):
+        """
+        set the sense and right hand side of a row from the interval of its scaled left hand side.
+
+        paras:
+            i: the row index,
+            scale: the scale of the row,
+            lower: the lower limit, -inf if it is open,
+            upper: the upper limit, inf if it is open.
+        """
+        lower, upper = (lower / scale, upper / scale) if scale > 0 else (upper / scale, lower / scale)
+        if lower == upper:
+            self.sense[i] = SENSE_LIST.index(const.SENSE_EQ)
+            self.rhs[i] = lower
+        elif np.isfinite(upper):
+            self.sense[i] = SENSE_LIST.index(const.SENSE_LEQ)
+            self.rhs[i] = upper
+        else:
+            self.sense[i] = SENSE_LIST.index(const.SENSE_GEQ)
+            self.rhs[i] = lower
+
+    def remove_duplicate_rows(self, A):
+        """
+        merge the rows whose left hand sides are parallel, at most two rows of each group are kept.
+
+        paras:
+            A: the active matrix.
+
+        returns:
+            True if a row is removed.
+        """
+        group_dict = dict()
+        for i in np.flatnonzero(self.row_alive & (np.diff(A.indptr) > 1)):
+            start, end = A.indptr[i], A.indptr[i + 1]
+            scale = 1 / A.data[start]
+            key = (A.indices[start:end].tobytes(), np.round(A.data[start:end] * scale, 12).tobytes())
+            group_dict.setdefault(key, list()).append((i, scale))
+
+        changed = False
+        for group in group_dict.values():
+            if len(group) == 1:
+                continue
+            lower, upper = -np.inf, np.inf
+            for i, scale in group:
+                row_lower, row_upper = self.row_interval(i, scale)
+                lower = max(lower, row_lower)
+                upper = min(upper, row_upper)
+            if lower > upper + const.TOL_PRIMAL:
+                return self.infeasible()
+            if upper - lower <= const.TOL_PRIMAL:
+                lower = upper = (lower + upper) / 2 if np.isfinite(lower) else upper
+
+            (first, first_scale), (second, second_scale) = group[0], group[1]
+            if lower == upper or not np.isfinite(lower) or not np.isfinite(upper):
+                self.set_row_interval(first, first_scale, lower, upper)
+                self.row_alive[[i for i, _ in group[1:]]] = False
+            else:
+                self.set_row_interval(first, first_scale, lower, np.inf)
+                self.set_row_interval(second, second_scale, -np.inf, upper)
+                self.row_alive[[i for i, _ in group[2:]]] = False
+            changed = True
+        return changed
+
+    def fix_dominated_columns(self, A):
+        """
+        fix a variable at its bound if moving it away from the bound only makes the objective worse
+        and no row is locked in that direction.
+
+        paras:
+            A: the active matrix.
+
+        returns:
+            True if a variable is fixed.
+        """
+        coo = A.tocoo()
+        sense = self.sense[coo.row]
+        n = self.A.shape[1]
+        leq = sense == SENSE_LIST.index(const.SENSE_LEQ)
+        geq = sense == SENSE_LIST.index(const.SENSE_GEQ)
+        eq = ~(leq | geq)
+        # a row locks a direction of a variable if moving the variable in it may violate the row.
+        up_lock = np.bincount(coo.col[eq | (leq & (coo.data > 0)) | (geq & (coo.data < 0))], minlength=n)
+        down_lock = np.bincount(coo.col[eq | (leq & (coo.data < 0)) | (geq & (coo.data > 0))], minlength=n)
+
+        movable = self.column_alive & (self.upper_bound > self.lower_bound)
+        to_lower = movable & (self.cost >= 0) & (down_lock == 0) & np.isfinite(self.lower_bound)
+        to_upper = movable & (self.cost <= 0) & (up_lock == 0) & np.isfinite(self.upper_bound) & ~to_lower
+        if not (to_lower.any() or to_upper.any()):
+            return False
+        self.upper_bound[to_lower] = self.lower_bound[to_lower]
+        self.lower_bound[to_upper] = self.upper_bound[to_upper]
+        return True
+
+    def remove_dependent_rows(self, A):
+        """
+        remove the equality rows which are linear combinations of the other equality rows,
+        the model is infeasible if the combination has a different right hand side.
+
+        paras:
+            A: the active matrix.
+
+        returns:
+            True if a row is removed.
+        """
+        equation = np.flatnonzero(self.row_alive & (self.sense == SENSE_LIST.index(const.SENSE_EQ)))
+        rank = RowRank(A[equation], self.rhs[equation])
+        if not rank.is_consistent():
+            return self.infeasible()
+        if not rank.dependent:
+            return False
+        self.row_alive[equation[rank.dependent]] = False
+        return True
+
+    def run(self):
+        """
+        apply the reductions until nothing changes, and build the reduced model.
+
+        returns:
+            the status if it is decided by the presolve, otherwise None.
+        """
+        for _ in range(self.max_pass):
+            changed = self.remove_fixed_columns()
+            A = self.active_matrix()
+            for reduction in (self.remove_empty_rows, self.remove_singleton_rows,
+                              self.remove_duplicate_rows, self.fix_dominated_columns):
+                if reduction(A):
+                    changed = True
+                    A = self.active_matrix()
+                if self.status is not None:
+                    return self.status
+            if not changed:
+                break
+
+        # the rank-revealing elimination is the most expensive, it runs once after the other reductions.
+        self.remove_dependent_rows(self.active_matrix())
+        if self.status is not None:
+            return self.status
+        self.build()
+        return None
+
+    def build(self):
+        """
+        build the reduced model from the alive rows and columns.
+        """
+        original = self.original
+        self.column_index = np.flatnonzero(self.column_alive)
+        self.row_index = np.flatnonzero(self.row_alive)
+        model = Model(name=original.name, sense=original.sense)
+        model.add_variables_from_arrays(
+            self.lower_bound[self.column_index], self.upper_bound[self.column_index],
+            np.array(CAT_LIST, dtype=object)[original.columns.cat.view()[self.column_index]],
+            names=[original.columns.name_list[j] for j in self.column_index],
+            objective=self.c[self.column_index]
+        )
+        model.objective.constant = original.objective.constant + self.objective_offset
+        model.rows.add_arrays(
+            [original.rows.name_list[i] for i in self.row_index],
+            np.array(SENSE_LIST, dtype=object)[self.sense[self.row_index]], self.rhs[self.row_index]
+        )
+        A = self.A[self.row_index][:, self.column_index].tocoo()
+        model.rows.add_items(A.row, A.col, A.data)
+        self.model = model
+
+    def postsolve(self, values):
+        """
+        map a solution of the reduced model back to the original variables.
+
+        paras:
+            values: the value vector of the reduced model's variables.
+
+        returns:
+            the value vector of the original variables.
+        """
+        result = self.value.copy()
+        result[self.column_index] = values
+        return result
+
+
+def presolve(model, max_pass=20):
+    """
+    presolve a model.
+
+    paras:
+        model: the original model,
+        max_pass: the maximum number of passes over the reductions.
+
+    returns:
+        the presolve, whose status is decided if the model is found infeasible,
+        otherwise its reduced model is ready to be solved.
+    """
+    result = Presolve(model, max_pass)
+    result.run()
+    return result
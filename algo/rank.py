@@ -0,0 +1,282 @@
+"""
+This file defines the sparse rank-revealing elimination of the rows of a linear system.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.linalg
+from util import *
+from constant import const
+
+
+# the kernels with at most this many entries are factorized by the dense QR decomposition.
+RANK_DENSE_SIZE = 1 << 18
+# a pivot of the sparse elimination is at least this fraction of the largest entry of its row.
+RANK_PIVOT_THRESHOLD = 0.1
+
+
+class RowRank:
+    """
+    The rank-revealing elimination of the rows of Ax = b, which finds the rank,
+    the linearly dependent rows and the inconsistent rows.
+    The row singletons and the column singletons are eliminated first, which never fills in,
+    and only the kernel left is factorized, by the sparse elimination with threshold pivoting,
+    or by the dense QR decomposition with column pivoting if it is small.
+
+    paras:
+        A: the left hand side matrix, a Numpy Ndarray or a scipy.sparse matrix,
+        b: the right hand side vector, if None, the consistency is not checked,
+        tolerance: the relative tolerance of a vanishing row,
+        track: if True, the combination of the original rows of each dependent row is recorded.
+    """
+    def __init__(self, A, b=None, tolerance=1e-9, track=False):
+        self.A = sp.csr_matrix(A)
+        self.m, self.n = self.A.shape
+        self.tolerance = tolerance
+        self.track = track
+        self.rhs = np.zeros(self.m) if b is None else np.array(b, dtype=float)
+        self.rhs_scale = 1 + np.abs(self.rhs).max(initial=0)
+
+        # the rows with a pivot, the dependent rows and the dependent rows with a nonzero right hand side.
+        self.independent = list()
+        self.dependent = list()
+        self.inconsistent = list()
+        # the combination of the original rows which vanishes for each dependent row.
+        self.combination_dict = dict()
+        # the combination of the original rows which each row currently is, only if it is tracked.
+        self.row_combination_list = [{i: 1.0} for i in range(self.m)] if track else None
+
+        self.row_alive = np.ones(self.m, dtype=bool)
+        self.column_alive = np.ones(self.n, dtype=bool)
+        self.eliminate_singletons()
+        self.factorize_kernel()
+
+        self.rank = len(self.independent)
+        self.independent.sort()
+        self.dependent.sort()
+        self.inconsistent.sort()
+
+    def add_dependent(self, i, rhs, combination):
+        """
+        record a dependent row.
+
+        paras:
+            i: the row index,
+            rhs: the right hand side after the elimination,
+            combination: the combination of the original rows, None if it is not tracked.
+        """
+        self.row_alive[i] = False
+        self.dependent.append(i)
+        if abs(rhs) > self.tolerance * self.rhs_scale:
+            self.inconsistent.append(i)
+        if self.track:
+            # the weights of the roundoff are dropped.
+            scale = max(abs(weight) for weight in combination.values())
+            self.combination_dict[i] = {
+                int(r): float(weight) for r, weight in combination.items() if abs(weight) > self.tolerance * scale
+            }
+
+    def eliminate_singletons(self):
+        """
+        eliminate the row singletons and the column singletons until there is none left.
+        A row singleton fixes its column, which is removed from the other rows with the right hand side updated,
+        and a column singleton makes its row independent of all the others.
+        """
+        A = self.A
+        csc = A.tocsc()
+        row_count = np.diff(A.indptr)
+        column_count = np.diff(csc.indptr)
+        for i in np.flatnonzero(row_count == 0):
+            self.add_dependent(i, self.rhs[i], self.row_combination_list[i] if self.track else None)
+
+        row_stack = np.flatnonzero(row_count == 1).tolist()
+        column_stack = np.flatnonzero(column_count == 1).tolist()
+        while row_stack or column_stack:
+            if row_stack:
+                i = row_stack.pop()
+                if not self.row_alive[i] or row_count[i] != 1:
+                    continue
+                start, end = A.indptr[i], A.indptr[i + 1]
+                position = start + np.flatnonzero(self.column_alive[A.indices[start:end]])[0]
+                j, pivot = A.indices[position], A.data[position]
+                self.independent.append(i)
+                self.row_alive[i] = False
+                self.column_alive[j] = False
+                for position in range(csc.indptr[j], csc.indptr[j + 1]):
+                    k = csc.indices[position]
+                    if not self.row_alive[k]:
+                        continue
+                    factor = csc.data[position] / pivot
+                    self.rhs[k] -= factor * self.rhs[i]
+                    if self.track:
+                        combination = self.row_combination_list[k]
+                        for r, weight in self.row_combination_list[i].items():
+                            combination[r] = combination.get(r, 0.0) - factor * weight
+                    row_count[k] -= 1
+                    if row_count[k] == 0:
+                        self.add_dependent(k, self.rhs[k], self.row_combination_list[k] if self.track else None)
+                    elif row_count[k] == 1:
+                        row_stack.append(k)
+            else:
+                j = column_stack.pop()
+                if not self.column_alive[j] or column_count[j] != 1:
+                    continue
+                start, end = csc.indptr[j], csc.indptr[j + 1]
+                i = csc.indices[start + np.flatnonzero(self.row_alive[csc.indices[start:end]])[0]]
+                self.independent.append(i)
+                self.row_alive[i] = False
+                self.column_alive[j] = False
+                for position in range(A.indptr[i], A.indptr[i + 1]):
+                    l = A.indices[position]
+                    if not self.column_alive[l]:
+                        continue
+                    column_count[l] -= 1
+                    if column_count[l] == 1:
+                        column_stack.append(l)
+
+    def factorize_kernel(self):
+        """
+        find the dependent rows of the kernel left by the singleton elimination,
+        the dense QR decomposition is used only if the kernel has at most RANK_DENSE_SIZE entries.
+        """
+        rows = np.flatnonzero(self.row_alive)
+        if rows.shape[0] == 0:
+            return
+        columns = np.flatnonzero(self.column_alive)
+        if rows.shape[0] * columns.shape[0] <= RANK_DENSE_SIZE:
+            self.factorize_dense(rows, columns)
+        else:
+            self.factorize_sparse(rows, columns)
+
+    def factorize_dense(self, rows, columns):
+        """
+        find the dependent rows of the kernel by the QR decomposition with column pivoting of its transpose.
+
+        paras:
+            rows: the row indices of the kernel,
+            columns: the column indices of the kernel.
+        """
+        K = self.A[rows][:, columns].toarray()
+        _, R, P = scipy.linalg.qr(K.T, mode="economic", pivoting=True)
+        diagonal = np.abs(np.diag(R))
+        scale = np.abs(K).max(initial=0)
+        rank = int((diagonal > self.tolerance * max(scale, 1e-300) * max(K.shape)).sum())
+
+        self.independent.extend(rows[P[:rank]].tolist())
+        # each dependent row is a combination of the independent rows of the kernel, K_d = W^T K_I.
+        W = scipy.linalg.solve_triangular(R[:rank, :rank], R[:rank, rank:]) if rank else np.zeros((0, 0))
+        rhs = self.rhs[rows[P[:rank]]]
+        for s, d in enumerate(rows[P[rank:]]):
+            weight = W[:, s] if rank else np.zeros(0)
+            combination = None
+            if self.track:
+                combination = dict(self.row_combination_list[d])
+                for p, w in zip(rows[P[:rank]], weight):
+                    for r, value in self.row_combination_list[p].items():
+                        combination[r] = combination.get(r, 0.0) - w * value
+            self.add_dependent(d, self.rhs[d] - weight.dot(rhs), combination)
+
+    def factorize_sparse(self, rows, columns):
+        """
+        find the dependent rows of the kernel by the sparse Gaussian elimination of its rows.
+        The row with the fewest entries is the next pivot row, its pivot is the entry with the fewest entries
+        in its column among those at least RANK_PIVOT_THRESHOLD of the largest one, which keeps the fill-in low.
+        The pivot column is removed from the other rows, and a row without an entry above the tolerance is dependent.
+
+        paras:
+            rows: the row indices of the kernel,
+            columns: the column indices of the kernel.
+        """
+        K = self.A[rows][:, columns]
+        K.sum_duplicates()
+        drop = self.tolerance * max(np.abs(K.data).max(initial=0), 1e-300)
+        # the sorted column indices and the values of each row, and the rows with an entry in each column.
+        index_list = [K.indices[K.indptr[s]:K.indptr[s + 1]] for s in range(rows.shape[0])]
+        value_list = [K.data[K.indptr[s]:K.indptr[s + 1]] for s in range(rows.shape[0])]
+        csc = K.tocsc()
+        column_rows_list = [set(csc.indices[csc.indptr[t]:csc.indptr[t + 1]].tolist()) for t in range(columns.shape[0])]
+        # the entries of each row left, infinite after the row is eliminated.
+        count = np.diff(K.indptr).astype(float)
+        for s in np.flatnonzero(count == 0):
+            count[s] = np.inf
+            self.add_dependent(rows[s], self.rhs[rows[s]], self.row_combination_list[rows[s]] if self.track else None)
+
+        while np.isfinite(count.min()):
+            s = int(count.argmin())
+            count[s] = np.inf
+            index, value = index_list[s], value_list[s]
+            magnitude = np.abs(value)
+            candidate = np.flatnonzero(magnitude >= RANK_PIVOT_THRESHOLD * magnitude.max())
+            column_count = [len(column_rows_list[t]) for t in index[candidate]]
+            position = candidate[np.lexsort((-magnitude[candidate], column_count))[0]]
+            t, pivot = index[position], value[position]
+            i = rows[s]
+            self.independent.append(i)
+            for l in index.tolist():
+                column_rows_list[l].discard(s)
+
+            for u in list(column_rows_list[t]):
+                k = rows[u]
+                factor = value_list[u][np.searchsorted(index_list[u], t)] / pivot
+                merged_index = np.concatenate((index_list[u], index))
+                merged_value = np.concatenate((value_list[u], -factor * value))
+                order = np.argsort(merged_index, kind="stable")
+                new_index, start = np.unique(merged_index[order], return_index=True)
+                new_value = np.add.reduceat(merged_value[order], start)
+                # the pivot column is removed exactly, and the entries of the roundoff are dropped.
+                keep = (np.abs(new_value) > drop) & (new_index != t)
+                new_index, new_value = new_index[keep], new_value[keep]
+                for l in np.setdiff1d(index_list[u], new_index, assume_unique=True).tolist():
+                    column_rows_list[l].discard(u)
+                for l in np.setdiff1d(new_index, index_list[u], assume_unique=True).tolist():
+                    column_rows_list[l].add(u)
+                index_list[u], value_list[u] = new_index, new_value
+
+                self.rhs[k] -= factor * self.rhs[i]
+                if self.track:
+                    combination = self.row_combination_list[k]
+                    for r, weight in self.row_combination_list[i].items():
+                        combination[r] = combination.get(r, 0.0) - factor * weight
+                if new_index.shape[0] == 0:
+                    count[u] = np.inf
+                    self.add_dependent(k, self.rhs[k], self.row_combination_list[k] if self.track else None)
+                else:
+                    count[u] = new_index.shape[0]
+            index_list[s] = value_list[s] = None
+
+    def is_consistent(self):
+        """
+        check if Ax = b has a solution.
+
+        returns:
+            True if there is no inconsistent row.
+        """
+        return not self.inconsistent
+
+
+def equation_diagnostics(model, tolerance=1e-9):
+    """
+    find the redundant and the conflicting equality constraints of a model, the bounds are ignored.
+
+    paras:
+        model: the model,
+        tolerance: the relative tolerance of a vanishing row.
+
+    returns:
+        redundant_list: the names of the equality constraints implied by the others,
+        conflict_dict: the name of each conflicting equality constraint, and the names and weights
+            of the constraints whose combination turns it into 0 = nonzero.
+    """
+    rows = model.rows
+    equation = np.flatnonzero(rows.sense.view() == SENSE_LIST.index(const.SENSE_EQ))
+    rank = RowRank(rows.csr(len(model.columns))[equation], rows.rhs.view()[equation], tolerance, track=True)
+    inconsistent = set(rank.inconsistent)
+    redundant_list = [rows.name_list[equation[i]] for i in rank.dependent if i not in inconsistent]
+    conflict_dict = {
+        rows.name_list[equation[i]]: {
+            rows.name_list[equation[r]]: weight for r, weight in rank.combination_dict[i].items()
+        }
+        for i in rank.inconsistent
+    }
+    return redundant_list, conflict_dict
@@ -0,0 +1,440 @@
+"""
+This file defines the fingerprint of a model and the cache of the solve results keyed by it.
+Last edited by Teast Ares, 20190130.
+"""
+
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from util import *
+from constant import const
+from algo.stats import *
+from algo.simplex import *
+from algo.snapshot import *
+
+
+# the default maximum bytes of the memory tier and the disk tier of the result cache.
+RESULT_CACHE_MEMORY_SIZE = 64 << 20
+RESULT_CACHE_DISK_SIZE = 1 << 30
+# the extension of the result files in the disk tier.
+RESULT_FILE_SUFFIX = ".result"
+# the statuses which do not change if the model is solved again, only they are cached.
+FINAL_STATUS_LIST = [const.STATUS_OPTIMAL, const.STATUS_NO_SOLUTION, const.STATUS_UNBOUNDED]
+
+
+def hash_arrays(digest, array_list):
+    """
+    feed arrays into a hash, with their dtypes and shapes, so that different arrays never give the same bytes.
+
+    paras:
+        digest: the hash object,
+        array_list: the list of Numpy Ndarrays.
+    """
+    for array in array_list:
+        array = np.ascontiguousarray(array)
+        digest.update("{dtype}{shape}".format(dtype=array.dtype.str, shape=array.shape).encode())
+        digest.update(array.tobytes())
+
+
+def canonical_matrix(model):
+    """
+    get the left hand side matrix of a model in the CSR format with sorted indices and without duplicates,
+    so that the same matrix built in another order gives the same arrays.
+
+    paras:
+        model: the model.
+
+    returns:
+        the left hand side matrix.
+    """
+    A = model.rows.csr(len(model.columns))
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    return A
+
+
+def canonical_row_order(model, A):
+    """
+    get the order of the rows sorted by their content, the entries, the sense and the rhs,
+    so that the same constraints added in another order give the same order of the contents.
+
+    paras:
+        model: the model,
+        A: the canonical left hand side matrix of the model.
+
+    returns:
+        the index vector of the rows in the sorted order.
+    """
+    sense = model.rows.sense.view()
+    rhs = model.rows.rhs.view() + 0.0
+    key_list = [
+        (sense[i].tobytes(), rhs[i].tobytes(),
+         A.indices[A.indptr[i]:A.indptr[i + 1]].astype(np.int64).tobytes(),
+         (A.data[A.indptr[i]:A.indptr[i + 1]].astype(float) + 0.0).tobytes())
+        for i in range(A.shape[0])
+    ]
+    return np.array(sorted(range(A.shape[0]), key=key_list.__getitem__), dtype=np.int64)
+
+
+def structure_fingerprint(model):
+    """
+    get the fingerprint of a model's structure, the matrix, the senses of the rows and the finiteness of the bounds.
+    The models with the same structure fingerprint differ only in the objective, rhs or bounds,
+    so the final basis of one warm-starts the others.
+    It depends on the positions of the rows and the columns, as the basis does.
+
+    paras:
+        model: the model.
+
+    returns:
+        the hex string of the fingerprint.
+    """
+    A = canonical_matrix(model)
+    digest = hashlib.sha256(b"structure")
+    hash_arrays(digest, [
+        A.indptr.astype(np.int64), A.indices.astype(np.int64), A.data.astype(float) + 0.0,
+        model.rows.sense.view(),
+        np.isfinite(model.columns.lower_bound.view()), np.isfinite(model.columns.upper_bound.view())
+    ])
+    return digest.hexdigest()
+
+
+def model_fingerprint(model):
+    """
+    get the canonical fingerprint of a model, from the objective, the matrix, the rhs, the senses,
+    the bounds and the categories, so that the names of the variables and the constraints,
+    such as the random names of the constraints, do not change it.
+    The rows are hashed in the order of their contents, so the order of the constraints does not change it,
+    while the columns are hashed by position, as the cached values of the variables are,
+    so the same model with its variables added in another order has another fingerprint.
+
+    paras:
+        model: the model.
+
+    returns:
+        the hex string of the fingerprint.
+    """
+    A = canonical_matrix(model)
+    order = canonical_row_order(model, A)
+    A = A[order]
+    digest = hashlib.sha256(b"model")
+    digest.update(repr((model.sense, float(model.objective.constant))).encode())
+    # the negative zeros are made positive, they are equal but have other bytes.
+    hash_arrays(digest, [
+        A.indptr.astype(np.int64), A.indices.astype(np.int64), A.data.astype(float) + 0.0,
+        model.rows.sense.view()[order], model.rows.rhs.view()[order] + 0.0,
+        objective_vector(model) + 0.0,
+        model.columns.lower_bound.view() + 0.0, model.columns.upper_bound.view() + 0.0,
+        model.columns.cat.view()
+    ])
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    The cache of the solve results keyed by the model fingerprint, a repeated model gets its status,
+    objective value and values of the variables without being solved again.
+    The memory tier keeps the recently used results within max_size bytes, with the final simplex basis,
+    which is cached on a model with the same structure, so a near-identical model warm-starts from it.
+    The disk tier, if a directory is given, keeps the results without the basis within max_disk_size bytes,
+    so they are shared between processes and runs, the least recently used ones are removed first.
+    ----------
+    cache = ResultCache(path="results")
+    objective_value, status = cache.solve(model)
+    ----------
+
+    paras:
+        max_size: the maximum bytes of the memory tier,
+        path: the directory of the disk tier, if None, there is no disk tier,
+        max_disk_size: the maximum bytes of the disk tier.
+    """
+    def __init__(self, max_size=RESULT_CACHE_MEMORY_SIZE, path=None, max_disk_size=RESULT_CACHE_DISK_SIZE):
+        self.max_size = max_size
+        self.path = path
+        self.max_disk_size = max_disk_size
+        # the entries from the least to the most recently used, and the fingerprint of the latest entry
+        # of each structure with a final basis.
+        self.entry_dict = OrderedDict()
+        self.structure_dict = dict()
+        self.size = 0
+        self.disk_size = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            self.disk_size = sum(os.path.getsize(file) for file in self.disk_files())
+
+        self.hit_count = 0
+        self.disk_hit_count = 0
+        self.miss_count = 0
+        self.warm_count = 0
+
+    def disk_files(self):
+        """
+        get the result files of the disk tier.
+
+        returns:
+            the list of paths.
+        """
+        return [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(RESULT_FILE_SUFFIX)]
+
+    def disk_file(self, key):
+        """
+        get the result file of a fingerprint.
+
+        paras:
+            key: the model fingerprint.
+
+        returns:
+            the path.
+        """
+        return os.path.join(self.path, key + RESULT_FILE_SUFFIX)
+
+    def get(self, model, key=None):
+        """
+        look up the result of a model, on a hit, the status and the values of the variables are written
+        to the model, on a miss, the final basis of a cached model with the same structure is cached
+        on the model if there is one, so the next solve warm-starts from it.
+
+        paras:
+            model: the model,
+            key: the model fingerprint, if None, it is computed.
+
+        returns:
+            objective_value: the objective value, None if the model is not optimal,
+            status: the status of the model,
+            None if the result is not cached.
+        """
+        if key is None:
+            key = model_fingerprint(model)
+        entry = self.entry_dict.get(key)
+        if entry is not None:
+            self.entry_dict.move_to_end(key)
+            self.hit_count += 1
+        else:
+            entry = self.read(key)
+            if entry is not None:
+                self.disk_hit_count += 1
+                self.insert(key, entry)
+        if entry is not None:
+            model.status = entry["status"]
+            if entry["values"] is not None:
+                model.columns.value[:] = entry["values"]
+            # the basis is positional, it is only seeded if the rows are in the same order.
+            if entry["simplex_cache"] is not None and entry["structure"] == structure_fingerprint(model):
+                model.simplex_cache = self.seed(model, entry["simplex_cache"])
+            model.solve_stats = SolveStats(const.RESULT_CACHE)
+            model.solve_stats.status = model.status
+            return entry["objective_value"], entry["status"]
+
+        self.miss_count += 1
+        if model.simplex_cache is None:
+            seed_key = self.structure_dict.get(structure_fingerprint(model))
+            if seed_key is not None:
+                model.simplex_cache = self.seed(model, self.entry_dict[seed_key]["simplex_cache"])
+                self.warm_count += 1
+        return None
+
+    def seed(self, model, cache):
+        """
+        get a simplex cache of another model with the same structure for the model,
+        it shares the standard form and the final basis, which are copied before a warm start changes them.
+
+        paras:
+            model: the model,
+            cache: the simplex cache.
+
+        returns:
+            the simplex cache.
+        """
+        result = cache.clone()
+        result.structure = structure_key(model)
+        return result
+
+    def put(self, model, objective_value, key=None):
+        """
+        keep the result of a solved model, the results which are not final, such as the iteration limit,
+        are not kept.
+
+        paras:
+            model: the solved model,
+            objective_value: the objective value of the solve,
+            key: the model fingerprint, if None, it is computed.
+        """
+        if model.status not in FINAL_STATUS_LIST:
+            return
+        if key is None:
+            key = model_fingerprint(model)
+        values = None
+        if model.status == const.STATUS_OPTIMAL:
+            values = model.columns.value.view().copy()
+        cache = model.simplex_cache
+        if cache is not None and (cache.solver is None or structure_key(model) != cache.structure):
+            cache = None
+        entry = {
+            "status": model.status,
+            "objective_value": None if objective_value is None else float(objective_value),
+            "values": values,
+            "simplex_cache": None if cache is None else cache.clone(),
+            "structure": structure_fingerprint(model) if cache is not None else None
+        }
+        self.insert(key, entry)
+        self.write(key, entry)
+
+    def insert(self, key, entry):
+        """
+        add an entry to the memory tier, the least recently used entries are evicted beyond the maximum bytes.
+
+        paras:
+            key: the model fingerprint,
+            entry: the entry.
+        """
+        if key in self.entry_dict:
+            self.remove(key)
+        entry["size"] = entry_size(entry)
+        self.entry_dict[key] = entry
+        self.size += entry["size"]
+        if entry["structure"] is not None:
+            self.structure_dict[entry["structure"]] = key
+        while self.size > self.max_size:
+            self.remove(next(iter(self.entry_dict)))
+
+    def remove(self, key):
+        """
+        remove an entry from the memory tier.
+
+        paras:
+            key: the model fingerprint.
+        """
+        entry = self.entry_dict.pop(key)
+        self.size -= entry["size"]
+        if entry["structure"] is not None and self.structure_dict.get(entry["structure"]) == key:
+            del self.structure_dict[entry["structure"]]
+
+    def read(self, key):
+        """
+        read an entry from the disk tier, the file is touched as recently used.
+
+        paras:
+            key: the model fingerprint.
+
+        returns:
+            the entry, None if it is not on the disk.
+        """
+        if self.path is None:
+            return None
+        file = self.disk_file(key)
+        try:
+            arrays, meta = read_arrays(file, use_mmap=False)
+            os.utime(file)
+        except (OSError, ValueError):
+            return None
+        return {
+            "status": meta["status"],
+            "objective_value": meta["objective_value"],
+            "values": arrays["values"] if meta["has_values"] else None,
+            "simplex_cache": None,
+            "structure": None
+        }
+
+    def write(self, key, entry):
+        """
+        write an entry to the disk tier without the final basis, the least recently used files are removed
+        beyond the maximum bytes.
+
+        paras:
+            key: the model fingerprint,
+            entry: the entry.
+        """
+        if self.path is None:
+            return
+        file = self.disk_file(key)
+        if os.path.exists(file):
+            self.disk_size -= os.path.getsize(file)
+        values = entry["values"]
+        write_arrays(file, {"values": np.zeros(0) if values is None else values}, {
+            "status": entry["status"],
+            "objective_value": entry["objective_value"],
+            "has_values": values is not None
+        })
+        self.disk_size += os.path.getsize(file)
+        if self.disk_size > self.max_disk_size:
+            file_list = sorted(self.disk_files(), key=os.path.getmtime)
+            for old_file in file_list[:-1]:
+                if self.disk_size <= self.max_disk_size:
+                    break
+                self.disk_size -= os.path.getsize(old_file)
+                os.remove(old_file)
+
+    def solve(self, model, simplex_type=const.SIMPLEX_PRIMAL, max_iteration=None):
+        """
+        get the result of a model from the cache, or solve it by the simplex method and keep the result.
+
+        paras:
+            model: the linear programming model,
+            simplex_type: the type of the simplex method,
+            max_iteration: the maximum number of pivots, if None, there is no limit.
+
+        returns:
+            objective_value: the optimal objective value, None if the model is not solved to optimal,
+            status: the status of the model.
+        """
+        key = model_fingerprint(model)
+        result = self.get(model, key)
+        if result is not None:
+            return result
+        objective_value, status, _ = simplex_method(model, simplex_type, max_iteration)
+        self.put(model, objective_value, key)
+        return objective_value, status
+
+    def clear(self):
+        """
+        remove all the entries of the memory tier and the disk tier, the counters are kept.
+        """
+        self.entry_dict.clear()
+        self.structure_dict.clear()
+        self.size = 0
+        if self.path is not None:
+            for file in self.disk_files():
+                os.remove(file)
+            self.disk_size = 0
+
+    def counters(self):
+        """
+        get the counters of the lookups and the sizes of the tiers.
+
+        returns:
+            a dict of numbers.
+        """
+        return {
+            "hit_count": self.hit_count,
+            "disk_hit_count": self.disk_hit_count,
+            "miss_count": self.miss_count,
+            "warm_count": self.warm_count,
+            "entry_count": len(self.entry_dict),
+            "size": self.size,
+            "disk_size": self.disk_size
+        }
+
+    def __len__(self):
+        return len(self.entry_dict)
+
+
+def entry_size(entry):
+    """
+    estimate the bytes of an entry of the result cache, the values of the variables, the standard form
+    and the matrix of the simplex solver.
+
+    paras:
+        entry: the entry.
+
+    returns:
+        the bytes.
+    """
+    size = 0 if entry["values"] is None else entry["values"].nbytes
+    cache = entry["simplex_cache"]
+    if cache is not None:
+        size += sum(value.nbytes for value in cache.form.to_arrays().values() if isinstance(value, np.ndarray))
+        A = cache.solver.A
+        size += A.data.nbytes + A.indices.nbytes + A.indptr.nbytes
+    return size
@@ -0,0 +1,214 @@
+"""
+This file defines the sensitivity analysis of an optimal linear programming from its final basis.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from constant import const
+from algo.simplex import *
+
+
+# the number of rows of the basis inverse computed in one batch of solves.
+SENSITIVITY_BLOCK_SIZE = 256
+
+
+def final_basis(model):
+    """
+    get the cached standard form and simplex solver of the last solve of the model.
+
+    paras:
+        model: the model solved by the simplex method.
+
+    returns:
+        cache: the simplex cache.
+    """
+    if model.status != const.STATUS_OPTIMAL:
+        raise ValueError("Model not optimal")
+    cache = model.simplex_cache
+    if cache is None or cache.solver is None or cache.solver.basis is None:
+        raise ValueError("Final basis not found, the model should be solved by the simplex method without presolve")
+    if (structure_key(model) != cache.structure or model.sense != cache.sense
+            or not np.array_equal(objective_vector(model), cache.objective)
+            or not np.array_equal(model.rows.rhs.view(), cache.rhs)
+            or not np.array_equal(model.columns.lower_bound.view(), cache.lower_bound)
+            or not np.array_equal(model.columns.upper_bound.view(), cache.upper_bound)):
+        raise ValueError("Model changed after the solve")
+    return cache
+
+
+def range_of(value, slope, tolerance=const.TOL_PIVOT):
+    """
+    get the range of the step t which keeps value + t * slope >= 0 for all the entries of each row.
+
+    paras:
+        value: the matrix of the values, which are nonnegative,
+        slope: the matrix of the slopes, the entries within the tolerance are ignored,
+        tolerance: the tolerance of a zero slope.
+
+    returns:
+        low: the lower bound vector of the step of each row, -inf for no limit,
+        high: the upper bound vector of the step of each row, inf for no limit.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = -value / slope
+    low = np.where(slope > tolerance, ratio, -np.inf).max(axis=1, initial=-np.inf)
+    high = np.where(slope < -tolerance, ratio, np.inf).min(axis=1, initial=np.inf)
+    return np.minimum(low, 0.0), np.maximum(high, 0.0)
+
+
+def dual_arrays(model):
+    """
+    compute the dual prices of the constraints and the reduced costs of the variables of the optimal model
+    by one backward transformation of the final basis, without the ranging.
+
+    paras:
+        model: the model solved by the simplex method.
+
+    returns:
+        dual: the dual price vector of the constraints,
+        reduced_cost: the reduced cost vector of the variables.
+    """
+    return basis_duals(final_basis(model))[1:]
+
+
+def basis_duals(cache):
+    """
+    compute the duals of the final basis of a simplex cache.
+
+    paras:
+        cache: the simplex cache.
+
+    returns:
+        reduced_cost: the reduced cost vector of all the columns of the simplex solver,
+        dual: the dual price vector of the constraints,
+        structural_reduced_cost: the reduced cost vector of the variables.
+    """
+    form, solver = cache.form, cache.solver
+    cost = solver.phase_two_cost()
+    # the duals of the rows of the solver, which are multiplied by the row signs.
+    y = solver.factor.btran(cost[solver.basis]) if form.m_original else np.zeros(0)
+    reduced_cost = cost - solver.A.T.dot(y)
+    dual = form.sense_sign * solver.row_sign * y
+    structural_reduced_cost = form.sense_sign * form.sign * reduced_cost[:form.n_original]
+    return reduced_cost, dual, structural_reduced_cost
+
+
+def sensitivity_arrays(model):
+    """
+    compute the sensitivity analysis of the optimal model from the final basis factorization,
+    the rows of the basis inverse are solved in batch.
+    The dual price of a constraint is the change of the objective value per unit increase of its rhs,
+    the reduced cost of a variable is its objective coefficient minus the duals times its column.
+    The dual prices are valid while the rhs stays within its range, and the solution is still optimal
+    while an objective coefficient stays within its range, one at a time.
+
+    paras:
+        model: the model solved by the simplex method.
+
+    returns:
+        a dict of Numpy Ndarrays in the order of the constraints and the variables,
+        dual, reduced_cost, rhs_low, rhs_high, cost_low and cost_high.
+    """
+    cache = final_basis(model)
+    form, solver = cache.form, cache.solver
+    m, n = form.m_original, form.n_original
+    n_form = solver.n
+    basis = solver.basis
+
+    reduced_cost, dual, structural_reduced_cost = basis_duals(cache)
+
+    # the rhs ranging, the basic values move along the columns of the basis inverse.
+    basic_upper = solver.upper_bound[basis]
+    x_basis = np.clip(solver.x_basis, 0, basic_upper)
+    rhs_low = np.empty(m)
+    rhs_high = np.empty(m)
+    for start in range(0, m, SENSITIVITY_BLOCK_SIZE):
+        end = min(start + SENSITIVITY_BLOCK_SIZE, m)
+        identity = np.zeros((m, end - start))
+        identity[np.arange(start, end), np.arange(end - start)] = solver.row_sign[start:end]
+        direction = solver.factor.ftran(identity).T
+        low, high = range_of(np.broadcast_to(x_basis, direction.shape), direction)
+        upper_low, upper_high = range_of(np.broadcast_to(basic_upper - x_basis, direction.shape), -direction)
+        rhs_low[start:end] = np.maximum(low, upper_low)
+        rhs_high[start:end] = np.minimum(high, upper_high)
+    rhs = model.rows.rhs.view()
+    rhs_low += rhs
+    rhs_high += rhs
+
+    # the cost ranging, the gains of the nonbasic columns which may enter must stay nonpositive.
+    # an original variable has its structural column, and a negative part column if it is two-side open.
+    coefficient = np.zeros(n_form)
+    coefficient[:n] = form.sense_sign * form.sign
+    owner = np.full(n_form, -1)
+    owner[:n] = np.arange(n)
+    negative = form.free_pair()[1]
+    coefficient[negative] = -form.sense_sign
+    owner[negative] = form.free
+
+    n_total = solver.A.shape[1]
+    nonbasic = np.ones(n_total, dtype=bool)
+    nonbasic[basis] = False
+    candidate = nonbasic & (np.arange(n_total) < n_form) & (solver.upper_bound > 0)
+    direction = np.where(solver.at_upper, -1.0, 1.0)
+    gain = np.minimum(direction * reduced_cost, 0)
+
+    cost_low = np.full(n, -np.inf)
+    cost_high = np.full(n, np.inf)
+    # the nonbasic columns only change their own reduced costs.
+    own = np.flatnonzero(candidate[:n_form] & (owner[:n_form] >= 0))
+    slope = direction[own] * coefficient[own]
+    low, high = range_of(-gain[own, None], -slope[:, None])
+    np.maximum.at(cost_low, owner[own], low)
+    np.minimum.at(cost_high, owner[own], high)
+    # a basic column changes the reduced costs of all the nonbasic columns by its row of the tableau.
+    position = np.flatnonzero((basis < n_form) & (owner[np.minimum(basis, n_form - 1)] >= 0))
+    for start in range(0, position.shape[0], SENSITIVITY_BLOCK_SIZE):
+        block = position[start:start + SENSITIVITY_BLOCK_SIZE]
+        identity = np.zeros((m, block.shape[0]))
+        identity[block, np.arange(block.shape[0])] = 1
+        tableau = solver.A.T.dot(solver.factor.btran(identity)).T
+        columns = basis[block]
+        slope = -coefficient[columns, None] * tableau
+        # the other column of a two-side open variable changes its own cost as well.
+        variable = owner[columns]
+        rows = np.flatnonzero(np.isin(variable, form.free))
+        other = np.where(columns[rows] < n, n + np.searchsorted(form.free, variable[rows]), variable[rows])
+        slope[rows, other] += coefficient[other]
+        slope *= direction
+        low, high = range_of(np.where(candidate, -gain, 1.0), -np.where(candidate, slope, 0.0))
+        cost_low[variable] = low
+        cost_high[variable] = high
+    objective = cache.objective
+
+    return {
+        "dual": dual,
+        "reduced_cost": structural_reduced_cost,
+        "rhs_low": rhs_low,
+        "rhs_high": rhs_high,
+        "cost_low": objective + cost_low,
+        "cost_high": objective + cost_high
+    }
+
+
+def sensitivity_analysis(model):
+    """
+    get the sensitivity analysis of the optimal model by the names of the constraints and the variables.
+
+    paras:
+        model: the model solved by the simplex method.
+
+    returns:
+        a dict of dual, the dual price of each constraint, reduced_cost, the reduced cost of each variable,
+        rhs_range, the rhs range (low, high) of each constraint, and cost_range,
+        the objective coefficient range (low, high) of each variable.
+    """
+    arrays = sensitivity_arrays(model)
+    row_names = model.rows.name_list
+    column_names = model.columns.name_list
+    return {
+        "dual": dict(zip(row_names, arrays["dual"].tolist())),
+        "reduced_cost": dict(zip(column_names, arrays["reduced_cost"].tolist())),
+        "rhs_range": dict(zip(row_names, zip(arrays["rhs_low"].tolist(), arrays["rhs_high"].tolist()))),
+        "cost_range": dict(zip(column_names, zip(arrays["cost_low"].tolist(), arrays["cost_high"].tolist())))
+    }
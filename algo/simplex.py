@@ -3,16 +3,23 @@ This file defines the algorithms.
 Last edited by Teast Ares, 20190130.
 """
 
-import itertools
+import copy
+from collections import defaultdict
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
 from util import *
 from constant import const
+from algo.standard_form import *
+from algo.presolve import *
+from algo.interior_point import *
+from algo.rank import *
+from algo.stats import *
 
 
 class Simplex:
     """
     Simplex method for solving linear programming.
-    If model is not a LP, we will relax it to LP.
 
     paras:
         model: the original model.
@@ -36,7 +43,919 @@ class Simplex:
         returns:
             the standardized model.
         """
-        pass
+        return standardize_model(self.model)
+
+    def solve(self, simplex_type=const.SIMPLEX_PRIMAL):
+        """
+        solve the model by the simplex method.
+
+        paras:
+            simplex_type: the type of the simplex method.
+
+        returns:
+            the optimal objective value, the status and the basis.
+        """
+        return simplex_method(self.model, simplex_type)
+
+
+class BasisFactor:
+    """
+    The LU factorization of a basis matrix with the product form (eta file) update,
+    the basis matrix is factorized from scratch when the eta file is too long.
+
+    paras:
+        A: the left hand side matrix in the scipy.sparse CSC format,
+        basis: the column indices of the basis,
+        refactor_frequency: the maximum number of eta vectors before a re-factorization,
+        stats: the solve statistics to record the factorizations in, if None, they are not recorded.
+    """
+    def __init__(self, A, basis, refactor_frequency=64, stats=None):
+        self.A = A
+        self.refactor_frequency = refactor_frequency
+        self.stats = stats
+        self.lu = None
+        self.eta_list = list()
+        self.eta_nnz = 0
+        self.refactor(basis)
+
+    def refactor(self, basis):
+        """
+        factorize the basis matrix from scratch and clear the eta file.
+
+        paras:
+            basis: the column indices of the basis.
+        """
+        B = self.A[:, basis].tocsc()
+        self.lu = splu(B)
+        self.eta_list = list()
+        self.eta_nnz = 0
+        if self.stats is not None:
+            self.stats.record_factor(B.nnz, self.lu.L.nnz + self.lu.U.nnz)
+
+    def ftran(self, a):
+        """
+        forward transformation, solve B y = a.
+
+        paras:
+            a: the right hand side vector, or a matrix whose columns are solved in batch.
+
+        returns:
+            y: the solution vector, or the solution matrix.
+        """
+        y = self.lu.solve(np.asarray(a, dtype=float))
+        for r, d in self.eta_list:
+            y_r = y[r] / d[r]
+            y -= np.multiply.outer(d, y_r)
+            y[r] = y_r
+        return y
+
+    def btran(self, a):
+        """
+        backward transformation, solve y B = a.
+
+        paras:
+            a: the right hand side vector, or a matrix whose columns are solved in batch.
+
+        returns:
+            y: the solution vector, or the solution matrix.
+        """
+        y = np.array(a, dtype=float)
+        for r, d in reversed(self.eta_list):
+            y[r] = (y[r] + d[r] * y[r] - d.dot(y)) / d[r]
+        return self.lu.solve(y, trans='T')
+
+    def copy(self):
+        """
+        copy the factorization, the LU factors and the eta vectors are shared since they are never changed in place.
+
+        returns:
+            a basis factorization of the same basis.
+        """
+        result = copy.copy(self)
+        result.eta_list = self.eta_list.copy()
+        return result
+
+    def update(self, r, d, basis):
+        """
+        replace the r-th basic column, whose ftran-ed entering column is d.
+
+        paras:
+            r: the position of the leaving column in the basis,
+            d: the entering column after the forward transformation,
+            basis: the column indices of the new basis.
+
+        returns:
+            True if the basis matrix has been re-factorized.
+        """
+        self.eta_list.append((r, d))
+        if self.stats is not None:
+            self.eta_nnz += np.count_nonzero(d)
+            self.stats.max_eta_nnz = max(self.stats.max_eta_nnz, self.eta_nnz)
+        if len(self.eta_list) >= self.refactor_frequency:
+            self.refactor(basis)
+            return True
+        return False
+
+
+# the simplex types which are pricings of the revised simplex method.
+PRICING_LIST = [
+    const.SIMPLEX_PRIMAL, const.SIMPLEX_PARTIAL_PRICING, const.SIMPLEX_DEVEX, const.SIMPLEX_DUAL_STEEPEST_EDGE
+]
+# the statuses of a solve stopped before it is finished, the next solve continues from its basis.
+INTERRUPT_STATUS_LIST = [const.STATUS_ITERATION_LIMIT, const.STATUS_TIME_LIMIT, const.STATUS_CANCELLED]
+
+
+class RevisedSimplex:
+    """
+    The two-phase revised simplex method for the bounded standard linear programming.
+    ----------
+    Max cx
+    s.t.
+    Ax = b
+    0 <= x <= u
+    ----------
+    The upper bounds are handled in the ratio test, a nonbasic variable is either at zero
+    or at its upper bound, so no extra row is needed for a bounded variable.
+    In phase I the singleton columns and artificial variables make the initial basis,
+    in phase II the artificial variables never enter the basis again.
+    With the dual steepest edge pricing, the initial basis is made dual feasible by shifting the costs,
+    the dual simplex reaches a feasible basis and the primal simplex removes the shifts instead.
+
+    paras:
+        c: the cost function vector,
+        A: the left hand side matrix, a Numpy Ndarray or a scipy.sparse matrix,
+        b: the right hand side vector,
+        upper_bound: the upper bound vector, inf for infinite, if None, all the upper bounds are infinite,
+            a negative upper bound is rejected,
+        max_iteration: the maximum number of pivots, if None, there is no limit,
+        refactor_frequency: the maximum number of eta vectors before a re-factorization,
+        stats: the solve statistics to record in, if None, a new one is created,
+        callback: the function called with the solver after each iteration, if None, nothing is called,
+        pricing: the pricing of the entering and leaving variables, a simplex type of Dantzig's rule (primal),
+            the partial pricing, Devex or the dual steepest edge.
+    """
+    def __init__(self, c, A, b, upper_bound=None, max_iteration=None, refactor_frequency=64, stats=None,
+                 callback=None, pricing=const.SIMPLEX_PRIMAL):
+        if pricing not in PRICING_LIST:
+            raise ValueError("Pricing not valid")
+        self.m, self.n = A.shape
+        # negate the rows with negative right hand side, so the initial basic solution is feasible.
+        self.row_sign = np.where(b < 0, -1.0, 1.0)
+        self.A = sp.csc_matrix(sp.diags(self.row_sign).dot(sp.csc_matrix(A)))
+        self.A.eliminate_zeros()
+        self.b = b * self.row_sign
+        self.c = np.asarray(c, dtype=float)
+        if upper_bound is None:
+            self.upper_bound = np.full(self.n, np.inf)
+        else:
+            self.upper_bound = np.asarray(upper_bound, dtype=float)
+            if (self.upper_bound < 0).any():
+                raise ValueError("Negative upper bound")
+        self.max_iteration = max_iteration
+        self.refactor_frequency = refactor_frequency
+        self.pricing = pricing
+        # the column where the partial pricing continues, the dual steepest edge weights of the rows
+        # and the iteration they are updated to.
+        self.partial_start = 0
+        self.edge_weight = None
+        self.edge_iteration = -1
+
+        self.basis = None
+        self.x_basis = None
+        # if a nonbasic variable is at its upper bound.
+        self.at_upper = None
+        self.factor = None
+        self.iteration = 0
+        self.stats = SolveStats(pricing) if stats is None else stats
+        self.callback = callback
+        # the phase running now, for the callback.
+        self.phase = None
+        # the status to stop with before the next pivot, set by interrupt.
+        self.interrupt_status = None
+
+        self.status = const.STATUS_UNSOLVED
+        self.x = None
+        self.objective_value = None
+
+    def attach(self, stats, callback=None):
+        """
+        record the next solves in another solve statistics, with another callback.
+
+        paras:
+            stats: the solve statistics,
+            callback: the function called with the solver after each iteration, if None, nothing is called.
+        """
+        self.stats = stats
+        self.callback = callback
+        self.interrupt_status = None
+        if self.factor is not None:
+            self.factor.stats = stats
+
+    def interrupt(self, status=const.STATUS_CANCELLED):
+        """
+        stop the iterations before the next pivot, it is called by the callback or from another thread.
+        The basis is kept, so the solve can be continued by resolve.
+
+        paras:
+            status: the status to stop with, the time limit or the cancelled.
+        """
+        self.interrupt_status = status
+
+    def run_phase(self, phase, method, *args):
+        """
+        run a phase of the iterations, its wall time and iterations are recorded.
+
+        paras:
+            phase: the name of the phase,
+            method: the method of the phase,
+            args: the arguments of the method.
+
+        returns:
+            the result of the method.
+        """
+        self.phase = phase
+        iteration = self.iteration
+        with self.stats.timer(phase):
+            result = method(*args)
+        self.stats.add_iteration(phase, self.iteration - iteration)
+        return result
+
+    def progress(self):
+        """
+        get the progress of the iterations, which is computed on demand for the callback.
+
+        returns:
+            a dict of the phase, the iteration, the objective value of the standard form
+            and the infeasibility, the sum of the bound violations and the artificial variables in the basis.
+        """
+        x = self.solution()
+        basic_upper = self.upper_bound[self.basis]
+        artificial = self.basis >= self.n
+        violation = np.maximum(-self.x_basis, self.x_basis - basic_upper)
+        infeasibility = np.maximum(violation, 0).sum() + np.abs(self.x_basis[artificial]).sum()
+        return {
+            "phase": self.phase,
+            "iteration": self.iteration,
+            "objective_value": float(self.c.dot(x)),
+            "infeasibility": float(infeasibility)
+        }
+
+    def initial_basis(self):
+        """
+        build the initial basis of phase I, a row is covered by a singleton column with
+        a positive coefficient if its basic value is within the upper bound, or by an
+        artificial variable otherwise.
+
+        returns:
+            basis: the column indices of the initial basis, the artificial columns
+                are indexed from n.
+        """
+        singleton = np.flatnonzero(np.diff(self.A.indptr) == 1)
+        rows = self.A.indices[self.A.indptr[singleton]]
+        coefficients = self.A.data[self.A.indptr[singleton]]
+        valid = (coefficients > 0) & (self.b[rows] <= self.upper_bound[singleton] * coefficients)
+        rows, first = np.unique(rows[valid], return_index=True)
+
+        basis = np.full(self.m, -1)
+        basis[rows] = singleton[valid][first]
+
+        uncovered = np.flatnonzero(basis < 0)
+        basis[uncovered] = self.n + np.arange(uncovered.shape[0])
+        artificial = sp.csc_matrix(
+            (np.ones(uncovered.shape[0]), (uncovered, np.arange(uncovered.shape[0]))),
+            shape=(self.m, uncovered.shape[0])
+        )
+        self.A = sp.hstack((self.A, artificial), format="csc")
+        self.upper_bound = np.concatenate((self.upper_bound, np.full(uncovered.shape[0], np.inf)))
+        return basis
+
+    def column(self, j):
+        """
+        get a dense column of the left hand side matrix.
+
+        paras:
+            j: the index of the column.
+
+        returns:
+            the column vector.
+        """
+        a = np.zeros(self.m)
+        start, end = self.A.indptr[j], self.A.indptr[j + 1]
+        a[self.A.indices[start:end]] = self.A.data[start:end]
+        return a
+
+    def basic_solution(self):
+        """
+        compute the values of the basic variables from the nonbasic variables at their bounds.
+
+        returns:
+            the basic solution vector.
+        """
+        upper = np.flatnonzero(self.at_upper)
+        return self.factor.ftran(self.b - self.A[:, upper].dot(self.upper_bound[upper]))
+
+    def pivot(self, r, q, alpha, direction, theta, leave_at_upper):
+        """
+        the entering column q moves by theta in the direction, and replaces the r-th basic column.
+
+        paras:
+            r: the position of the leaving column in the basis,
+            q: the index of the entering column,
+            alpha: the entering column after the forward transformation,
+            direction: 1 if the entering variable increases from zero, -1 if it decreases from the upper bound,
+            theta: the step length,
+            leave_at_upper: if the leaving variable becomes nonbasic at its upper bound.
+        """
+        value = (self.upper_bound[q] if self.at_upper[q] else 0) + direction * theta
+        self.x_basis -= direction * theta * alpha
+        self.at_upper[self.basis[r]] = leave_at_upper
+        self.at_upper[q] = False
+        self.x_basis[r] = value
+        self.basis[r] = q
+
+        if self.factor.update(r, alpha, self.basis):
+            self.x_basis = self.basic_solution()
+        self.iteration += 1
+        self.stats.pivot_count += 1
+        if theta <= const.TOL_PRIMAL:
+            self.stats.degenerate_count += 1
+
+    def ratio_test(self, alpha, direction, q, bland):
+        """
+        the bounded ratio test, the basic variables stay within zero and the upper bounds.
+
+        paras:
+            alpha: the entering column after the forward transformation,
+            direction: 1 if the entering variable increases from zero, -1 if it decreases from the upper bound,
+            q: the index of the entering column,
+            bland: if the smallest basic index breaks the tie.
+
+        returns:
+            r: the position of the leaving column, -1 for a bound flip of the entering variable,
+            theta: the step length, inf if the problem is unbounded,
+            leave_at_upper: if the leaving variable becomes nonbasic at its upper bound.
+        """
+        delta = direction * alpha
+        basic_upper = self.upper_bound[self.basis]
+        decrease = np.flatnonzero(delta > const.TOL_PIVOT)
+        increase = np.flatnonzero((delta < -const.TOL_PIVOT) & np.isfinite(basic_upper))
+
+        positions = np.concatenate((decrease, increase))
+        ratio = np.concatenate((
+            np.maximum(self.x_basis[decrease], 0) / delta[decrease],
+            np.maximum(basic_upper[increase] - self.x_basis[increase], 0) / -delta[increase]
+        ))
+        if positions.shape[0] == 0 or ratio.min() >= self.upper_bound[q]:
+            return -1, self.upper_bound[q], False
+
+        ties = np.flatnonzero(ratio <= ratio.min() + const.TOL_PRIMAL)
+        if bland:
+            k = ties[self.basis[positions[ties]].argmin()]
+        else:
+            k = ties[np.abs(alpha[positions[ties]]).argmax()]
+        return positions[k], ratio[k], k >= decrease.shape[0]
+
+    def price_full(self, cost, n_enter, enterable, bland):
+        """
+        Dantzig's rule over all the columns, the column with the largest gain enters,
+        or the first column with a positive gain by Bland's rule.
+
+        paras:
+            cost: the cost function vector of all the columns,
+            n_enter: only the first n_enter columns are allowed to enter the basis,
+            enterable: the mask of the columns which may enter, the fixed columns never enter,
+            bland: if Bland's rule is used.
+
+        returns:
+            the index of the entering column, -1 if there is none.
+        """
+        y = self.factor.btran(cost[self.basis])
+        reduced_cost = (cost - self.A.T.dot(y))[:n_enter]
+        gain = self.gain(reduced_cost, enterable)
+        if bland:
+            candidates = np.flatnonzero(gain > const.TOL_DUAL)
+            return candidates[0] if candidates.shape[0] > 0 else -1
+        q = gain.argmax()
+        return q if gain[q] > const.TOL_DUAL else -1
+
+    def price_partial(self, cost, n_enter, enterable):
+        """
+        the partial pricing, the columns are priced segment by segment from where the last search stopped,
+        and the column with the largest gain in the first segment with an improving column enters.
+
+        paras:
+            cost: the cost function vector of all the columns,
+            n_enter: only the first n_enter columns are allowed to enter the basis,
+            enterable: the mask of the columns which may enter, the fixed columns never enter.
+
+        returns:
+            the index of the entering column, -1 if there is none.
+        """
+        y = self.factor.btran(cost[self.basis])
+        size = max(64, -(-n_enter // 8))
+        count = -(-n_enter // size)
+        first = (self.partial_start // size) % max(count, 1)
+        for k in range(count):
+            start = ((first + k) % count) * size
+            end = min(start + size, n_enter)
+            reduced_cost = cost[start:end] - self.A[:, start:end].T.dot(y)
+            gain = self.gain(reduced_cost, enterable[start:end], start)
+            q = gain.argmax()
+            if gain[q] > const.TOL_DUAL:
+                self.partial_start = end
+                return start + q
+        return -1
+
+    def gain(self, reduced_cost, enterable, start=0):
+        """
+        get the objective gain per unit move of the nonbasic columns,
+        a column at zero improves by increasing, a column at its upper bound by decreasing.
+
+        paras:
+            reduced_cost: the reduced cost vector of a range of columns,
+            enterable: the mask of the columns in the range which may enter,
+            start: the first column of the range.
+
+        returns:
+            the gain vector, 0 for the basic and the fixed columns.
+        """
+        end = start + reduced_cost.shape[0]
+        gain = np.where(self.at_upper[start:end], -reduced_cost, reduced_cost)
+        gain[~enterable] = 0
+        basic = self.basis[(self.basis >= start) & (self.basis < end)]
+        gain[basic - start] = 0
+        return gain
+
+    def pivot_row(self, r):
+        """
+        get the r-th row of the basis inverse and the r-th row of the tableau.
+
+        paras:
+            r: the position in the basis.
+
+        returns:
+            rho: the r-th row of the basis inverse,
+            alpha_row: the r-th row of B^-1 A over all the columns.
+        """
+        e = np.zeros(self.m)
+        e[r] = 1
+        rho = self.factor.btran(e)
+        return rho, self.A.T.dot(rho)
+
+    def primal(self, cost, n_enter):
+        """
+        the primal simplex iterations from the current feasible basis.
+        The entering column is chosen by the pricing of the solver, Dantzig's rule, the partial pricing
+        or the Devex reference weights, and by Bland's rule on a long degenerate run to avoid cycling.
+        With Devex the reduced costs are updated by the pivot row instead of being computed again.
+
+        paras:
+            cost: the cost function vector of all the columns,
+            n_enter: only the first n_enter columns are allowed to enter the basis.
+
+        returns:
+            the status.
+        """
+        degenerate_count = 0
+        # a fixed column can only flip between its equal bounds, it never enters.
+        enterable = self.upper_bound[:n_enter] > 0
+        devex = self.pricing == const.SIMPLEX_DEVEX
+        reduced_cost = None
+        # if the reduced costs are computed from the basis, not updated by the pivot rows.
+        fresh = False
+        weight = np.ones(n_enter)
+        while True:
+            if self.interrupt_status is not None:
+                return self.interrupt_status
+            if self.max_iteration is not None and self.iteration >= self.max_iteration:
+                return const.STATUS_ITERATION_LIMIT
+
+            bland = degenerate_count > self.m
+            if devex and not bland:
+                if reduced_cost is None:
+                    y = self.factor.btran(cost[self.basis])
+                    reduced_cost = cost - self.A.T.dot(y)
+                    fresh = True
+                gain = self.gain(reduced_cost[:n_enter], enterable)
+                score = np.where(gain > const.TOL_DUAL, gain * gain / weight, 0)
+                q = score.argmax()
+                if score[q] <= 0:
+                    # the updated reduced costs are checked by computing them again before stopping.
+                    if not fresh:
+                        reduced_cost = None
+                        continue
+                    return const.STATUS_OPTIMAL
+            elif self.pricing == const.SIMPLEX_PARTIAL_PRICING and not bland:
+                q = self.price_partial(cost, n_enter, enterable)
+                if q < 0:
+                    return const.STATUS_OPTIMAL
+            else:
+                q = self.price_full(cost, n_enter, enterable, bland)
+                if q < 0:
+                    return const.STATUS_OPTIMAL
+
+            direction = -1 if self.at_upper[q] else 1
+            alpha = self.factor.ftran(self.column(q))
+            r, theta, leave_at_upper = self.ratio_test(alpha, direction, q, bland)
+            if theta == np.inf:
+                # the drift of the updated reduced costs may make a column look improving.
+                if devex and reduced_cost is not None and not fresh:
+                    reduced_cost = None
+                    continue
+                return const.STATUS_UNBOUNDED
+
+            degenerate_count = degenerate_count + 1 if theta <= const.TOL_PRIMAL else 0
+            if r < 0:
+                # the entering variable reaches its other bound before any basic variable.
+                self.x_basis -= direction * theta * alpha
+                self.at_upper[q] = not self.at_upper[q]
+                self.iteration += 1
+                self.stats.bound_flip_count += 1
+                if theta <= const.TOL_PRIMAL:
+                    self.stats.degenerate_count += 1
+            elif devex and reduced_cost is not None:
+                _, alpha_row = self.pivot_row(r)
+                leaving = self.basis[r]
+                ratio = alpha_row / alpha[r]
+                reduced_cost = reduced_cost - reduced_cost[q] * ratio
+                reduced_cost[q] = 0
+                # the reference weights, reset when they grow too large.
+                weight = np.maximum(weight, ratio[:n_enter] ** 2 * weight[q])
+                if leaving < n_enter:
+                    weight[leaving] = max(weight[q] / alpha[r] ** 2, 1.0)
+                weight[q] = 1.0
+                if weight.max() > 1e8:
+                    weight = np.ones(n_enter)
+                self.pivot(r, q, alpha, direction, theta, leave_at_upper)
+                fresh = False
+                if not self.factor.eta_list:
+                    reduced_cost = None
+            else:
+                self.pivot(r, q, alpha, direction, theta, leave_at_upper)
+                reduced_cost = None
+            if self.callback is not None:
+                self.callback(self)
+
+    def dual(self, cost):
+        """
+        the dual simplex iterations from the current dual feasible basis,
+        the artificial variables never enter the basis.
+        The leaving row has the largest bound violation, or the largest violation scaled by
+        the dual steepest edge weight with the dual steepest edge pricing.
+        The reduced costs are updated by the pivot row instead of being computed again.
+
+        paras:
+            cost: the cost function vector of all the columns.
+
+        returns:
+            the status.
+        """
+        steepest_edge = self.pricing == const.SIMPLEX_DUAL_STEEPEST_EDGE
+        # the weights are only valid for the basis they are updated with.
+        if steepest_edge and (self.edge_weight is None or self.edge_iteration != self.iteration):
+            self.edge_weight = np.ones(self.m)
+        reduced_cost = None
+        while True:
+            if self.interrupt_status is not None:
+                self.edge_iteration = self.iteration
+                return self.interrupt_status
+            if self.max_iteration is not None and self.iteration >= self.max_iteration:
+                self.edge_iteration = self.iteration
+                return const.STATUS_ITERATION_LIMIT
+
+            # the leaving variable is the basic variable with the largest (scaled) bound violation.
+            basic_upper = self.upper_bound[self.basis]
+            violation = np.maximum(-self.x_basis, self.x_basis - basic_upper)
+            if steepest_edge:
+                score = np.where(violation > const.TOL_PRIMAL, violation * violation / self.edge_weight, 0)
+                r = score.argmax()
+            else:
+                r = violation.argmax()
+            if violation[r] <= const.TOL_PRIMAL:
+                self.edge_iteration = self.iteration
+                return const.STATUS_OPTIMAL
+            leave_at_upper = self.x_basis[r] > basic_upper[r]
+            target = basic_upper[r] if leave_at_upper else 0
+
+            rho, alpha_row = self.pivot_row(r)
+            if reduced_cost is None:
+                y = self.factor.btran(cost[self.basis])
+                reduced_cost = cost - self.A.T.dot(y)
+
+            # a nonbasic variable is eligible if moving it from its bound pushes x_r toward the target.
+            direction = np.where(self.at_upper[:self.n], -1.0, 1.0)
+            push = -direction * alpha_row[:self.n] if not leave_at_upper else direction * alpha_row[:self.n]
+            eligible = push > const.TOL_PIVOT
+            eligible[self.basis[self.basis < self.n]] = False
+            candidates = np.flatnonzero(eligible)
+            if candidates.shape[0] == 0:
+                self.edge_iteration = self.iteration
+                return const.STATUS_NO_SOLUTION
+
+            # the dual ratio test keeps the reduced costs dual feasible.
+            ratio = np.abs(reduced_cost[candidates]) / np.abs(alpha_row[candidates])
+            ties = candidates[ratio <= ratio.min() + const.TOL_DUAL]
+            q = ties[np.abs(alpha_row[ties]).argmax()]
+
+            alpha = self.factor.ftran(self.column(q))
+            if steepest_edge:
+                tau = self.factor.ftran(rho)
+                scale = alpha / alpha[r]
+                weight_r = self.edge_weight[r]
+                self.edge_weight = np.maximum(self.edge_weight - 2 * scale * tau + scale * scale * weight_r, 1e-4)
+                self.edge_weight[r] = max(weight_r / alpha[r] ** 2, 1e-4)
+
+            reduced_cost = reduced_cost - reduced_cost[q] / alpha[r] * alpha_row
+            reduced_cost[q] = 0
+            theta = (self.x_basis[r] - target) / (alpha[r] * direction[q])
+            self.pivot(r, q, alpha, direction[q], theta, leave_at_upper)
+            if not self.factor.eta_list:
+                reduced_cost = None
+            if self.callback is not None:
+                self.callback(self)
+
+    def drive_out_artificial(self):
+        """
+        pivot the artificial variables at zero level out of the basis after phase I,
+        an artificial variable stays in the basis if its row is redundant.
+        """
+        for r in np.flatnonzero(self.basis >= self.n):
+            e = np.zeros(self.m)
+            e[r] = 1
+            row = self.A.T.dot(self.factor.btran(e))[:self.n]
+            row[self.basis[self.basis < self.n]] = 0
+            q = np.abs(row).argmax()
+            if abs(row[q]) > const.TOL_PIVOT:
+                self.pivot(r, q, self.factor.ftran(self.column(q)), 1, 0, False)
+
+    def solution(self):
+        """
+        get the values of the columns, excluding the artificial variables.
+
+        returns:
+            the solution vector.
+        """
+        x = np.where(self.at_upper[:self.n], self.upper_bound[:self.n], 0)
+        in_basis = self.basis < self.n
+        x[self.basis[in_basis]] = self.x_basis[in_basis]
+        return x
+
+    def solve(self):
+        """
+        solve the linear programming by the two-phase method.
+
+        returns:
+            the status.
+        """
+        if self.m == 0:
+            self.basis = np.zeros(0, dtype=int)
+            self.at_upper = self.c > const.TOL_DUAL
+            self.x = np.where(self.at_upper, self.upper_bound, 0)
+            self.objective_value = self.c.dot(self.x)
+            self.status = const.STATUS_UNBOUNDED if np.isinf(self.objective_value) else const.STATUS_OPTIMAL
+            return self.status
+
+        self.basis = self.initial_basis()
+        n_total = self.A.shape[1]
+        self.at_upper = np.zeros(n_total, dtype=bool)
+        self.factor = BasisFactor(self.A, self.basis, self.refactor_frequency, self.stats)
+        self.x_basis = self.factor.ftran(self.b)
+        if self.pricing == const.SIMPLEX_DUAL_STEEPEST_EDGE:
+            return self.solve_dual()
+
+        # phase I, maximize the negative sum of the artificial variables.
+        cost = np.zeros(n_total)
+        cost[self.n:] = -1
+        self.status = self.run_phase(const.PHASE_ONE, self.primal, cost, n_total)
+        if self.status in INTERRUPT_STATUS_LIST:
+            return self.status
+        if cost[self.basis].dot(self.x_basis) < -const.TOL_PRIMAL * max(1.0, np.abs(self.b).max()):
+            self.status = const.STATUS_NO_SOLUTION
+            return self.status
+        self.run_phase(const.PHASE_ONE, self.drive_out_artificial)
+        # the artificial variables left in the basis are fixed at zero.
+        self.upper_bound[self.n:] = 0
+
+        # phase II
+        self.status = self.run_phase(const.PHASE_TWO, self.primal, self.phase_two_cost(), self.n)
+        return self.finish()
+
+    def solve_dual(self):
+        """
+        solve from the initial basis by the dual simplex method and then the primal simplex method.
+        The artificial variables are fixed at zero, so they are the infeasible basic variables to drive out.
+        A nonbasic column with a wrong-signed reduced cost is put at its upper bound if it is finite,
+        or its cost is shifted to make the reduced cost zero otherwise. After the dual simplex the basis
+        is primal feasible, and the primal simplex with the true costs removes the shifts.
+
+        returns:
+            the status.
+        """
+        self.upper_bound[self.n:] = 0
+        cost = self.phase_two_cost()
+        y = self.factor.btran(cost[self.basis])
+        reduced_cost = (cost - self.A.T.dot(y))[:self.n]
+        nonbasic = np.ones(self.n, dtype=bool)
+        nonbasic[self.basis[self.basis < self.n]] = False
+        wrong = nonbasic & (reduced_cost > const.TOL_DUAL)
+        closed = np.isfinite(self.upper_bound[:self.n])
+        self.at_upper[:self.n] = wrong & closed
+        shifted_cost = cost.copy()
+        shift = np.flatnonzero(wrong & ~closed)
+        shifted_cost[shift] -= reduced_cost[shift]
+        self.x_basis = self.basic_solution()
+
+        self.status = self.run_phase(const.PHASE_DUAL, self.dual, shifted_cost)
+        if self.status != const.STATUS_OPTIMAL:
+            return self.finish()
+        self.status = self.run_phase(const.PHASE_TWO, self.primal, cost, self.n)
+        return self.finish()
+
+    def phase_two_cost(self):
+        """
+        get the cost function vector of all the columns in phase II.
+        """
+        cost = np.zeros(self.A.shape[1])
+        cost[:self.n] = self.c
+        return cost
+
+    def finish(self):
+        """
+        set the solution and objective value from the final basis.
+
+        returns:
+            the status.
+        """
+        self.x = self.solution()
+        self.objective_value = self.c.dot(self.x)
+        return self.status
+
+    def copy(self):
+        """
+        copy the solver with its current basis, so that both can be re-optimized independently,
+        the matrix and the solve statistics are shared.
+
+        returns:
+            the simplex solver.
+        """
+        result = copy.copy(self)
+        result.upper_bound = self.upper_bound.copy()
+        if self.basis is not None:
+            result.basis = self.basis.copy()
+            result.at_upper = self.at_upper.copy()
+        if self.x_basis is not None:
+            result.x_basis = self.x_basis.copy()
+        if self.factor is not None:
+            result.factor = self.factor.copy()
+        return result
+
+    def update(self, c=None, b=None, upper_bound=None):
+        """
+        change the cost function, the right hand side or the upper bounds, the basis is kept.
+
+        paras:
+            c: the new cost function vector, if None, it is not changed,
+            b: the new right hand side vector, if None, it is not changed,
+            upper_bound: the new upper bound vector, if None, it is not changed, it must be nonnegative.
+        """
+        if c is not None:
+            self.c = np.asarray(c, dtype=float)
+        if b is not None:
+            self.b = b * self.row_sign
+        if upper_bound is not None:
+            if (np.asarray(upper_bound) < 0).any():
+                raise ValueError("Negative upper bound")
+            self.upper_bound[:self.n] = upper_bound
+            # a nonbasic variable can not stay at an infinite upper bound.
+            self.at_upper[:self.n] &= np.isfinite(self.upper_bound[:self.n])
+
+    def add_columns(self, position, columns, c, b, upper_bound):
+        """
+        insert new nonbasic columns at zero, the basis and its factorization are kept.
+
+        paras:
+            position: the index vector of the old columns to insert the new columns before,
+            columns: the matrix of the new columns,
+            c: the new cost function vector of all the columns,
+            b: the new right hand side vector,
+            upper_bound: the new upper bound vector of all the columns.
+        """
+        self.A, old_index = insert_columns(self.A, position, sp.diags(self.row_sign).dot(columns))
+        self.upper_bound = np.concatenate((upper_bound, self.upper_bound[self.n:]))
+        self.n += columns.shape[1]
+        self.c = np.asarray(c, dtype=float)
+        self.b = b * self.row_sign
+        if self.basis is not None:
+            self.basis = old_index[self.basis]
+            self.at_upper = np.insert(self.at_upper, position, False)
+        if self.factor is not None:
+            self.factor.A = self.A
+
+    def add_rows(self, rows, slack_sign, c, b, upper_bound):
+        """
+        add new rows, each one with its slack column in the basis, or an artificial variable fixed at zero
+        for an equation. The basis stays dual feasible, and the basis matrix is factorized again.
+
+        paras:
+            rows: the matrix of the new rows over the old columns,
+            slack_sign: the vector of the coefficient of the slack column of each new row, 0 for an equation,
+            c: the new cost function vector of all the columns,
+            b: the new right hand side vector,
+            upper_bound: the new upper bound vector of all the columns.
+        """
+        k = rows.shape[0]
+        n_artificial = self.A.shape[1] - self.n
+        slack = np.flatnonzero(slack_sign)
+        equation = np.flatnonzero(slack_sign == 0)
+        A = sp.vstack((self.A, sp.hstack((rows, sp.csr_matrix((k, n_artificial))))), format="csc")
+        A, old_index = insert_columns(
+            A, np.full(slack.shape[0], self.n),
+            sp.csc_matrix((slack_sign[slack], (self.m + slack, np.arange(slack.shape[0]))),
+                          shape=(self.m + k, slack.shape[0]))
+        )
+        self.A = sp.hstack((
+            A, sp.csc_matrix((np.ones(equation.shape[0]), (self.m + equation, np.arange(equation.shape[0]))),
+                             shape=(self.m + k, equation.shape[0]))
+        ), format="csc")
+
+        new_basis = np.empty(k, dtype=self.basis.dtype)
+        new_basis[slack] = self.n + np.arange(slack.shape[0])
+        new_basis[equation] = A.shape[1] + np.arange(equation.shape[0])
+        self.basis = np.concatenate((old_index[self.basis], new_basis))
+        self.at_upper = np.concatenate((
+            np.insert(self.at_upper, np.full(slack.shape[0], self.n), False), np.zeros(equation.shape[0], dtype=bool)
+        ))
+        self.upper_bound = np.concatenate((upper_bound, self.upper_bound[self.n:], np.zeros(equation.shape[0])))
+        self.row_sign = np.concatenate((self.row_sign, np.ones(k)))
+        self.b = b * self.row_sign
+        self.c = np.asarray(c, dtype=float)
+        self.m += k
+        self.n += slack.shape[0]
+        if self.edge_weight is not None:
+            self.edge_weight = np.concatenate((self.edge_weight, np.ones(k)))
+        self.factor = BasisFactor(self.A, self.basis, self.refactor_frequency, self.stats)
+        self.x_basis = self.basic_solution()
+
+    def remove_rows(self, keep_row, keep_column, c):
+        """
+        remove rows whose slack columns are in the basis, with the slack columns,
+        the basis without them is still a basis of the rows left.
+
+        paras:
+            keep_row: the mask of the rows kept,
+            keep_column: the mask of the columns kept, excluding the artificial variables,
+            c: the new cost function vector of all the columns.
+        """
+        artificial_row = self.A[:, self.n:].tocsc()
+        artificial_row = artificial_row.indices[artificial_row.indptr[:-1]]
+        keep_total = np.concatenate((keep_column, keep_row[artificial_row]))
+        keep_position = keep_total[self.basis]
+        if (~keep_position).sum() != (~keep_row).sum():
+            raise ValueError("Only the rows with the slack column in the basis can be removed")
+
+        new_index = np.cumsum(keep_total) - 1
+        self.A = self.A[keep_row][:, keep_total].tocsc()
+        self.basis = new_index[self.basis[keep_position]]
+        self.at_upper = self.at_upper[keep_total]
+        self.upper_bound = self.upper_bound[keep_total]
+        self.row_sign = self.row_sign[keep_row]
+        self.b = self.b[keep_row]
+        self.c = np.asarray(c, dtype=float)
+        self.m = int(keep_row.sum())
+        self.n = int(keep_column.sum())
+        if self.edge_weight is not None:
+            self.edge_weight = self.edge_weight[keep_position]
+        self.factor = BasisFactor(self.A, self.basis, self.refactor_frequency, self.stats) if self.m else None
+        self.x_basis = self.basic_solution() if self.m else np.zeros(0)
+
+    def resolve(self):
+        """
+        re-optimize from the final basis of the previous solve, the primal simplex is used
+        if the basis is still primal feasible (after a cost change), the dual simplex is used
+        if the basis is still dual feasible (after a right hand side or bound change).
+
+        returns:
+            the status, None if the basis is neither primal nor dual feasible.
+        """
+        if self.m == 0:
+            return self.solve()
+        self.x_basis = self.basic_solution()
+        cost = self.phase_two_cost()
+
+        basic_upper = self.upper_bound[self.basis]
+        if ((self.x_basis >= -const.TOL_PRIMAL) & (self.x_basis <= basic_upper + const.TOL_PRIMAL)).all():
+            self.status = self.run_phase(const.PHASE_TWO, self.primal, cost, self.n)
+            return self.finish()
+
+        y = self.factor.btran(cost[self.basis])
+        reduced_cost = (cost - self.A.T.dot(y))[:self.n]
+        gain = np.where(self.at_upper[:self.n], -reduced_cost, reduced_cost)
+        gain[self.basis[self.basis < self.n]] = 0
+        if (gain <= const.TOL_DUAL).all():
+            self.status = self.run_phase(const.PHASE_DUAL, self.dual, cost)
+            return self.finish()
+
+        return None
 
 
 def map_variables(model):
@@ -117,7 +1036,7 @@ def replace_linear_expression(linear_expression, variable_map_dict):
     return replaced_linear_expression, arhs
 
 
-def standardize_model(model):
+def standardize_model(model, variable_map_dict=None):
     """
     get a standard model.
     ----------
@@ -128,12 +1047,14 @@ def standardize_model(model):
     ----------
 
     paras:
-        model: the original model.
+        model: the original model,
+        variable_map_dict: the variable map of the model, if None, it will be generated.
 
     returns:
         the standardized model.
     """
-    variable_map_dict = map_variables(model)
+    if variable_map_dict is None:
+        variable_map_dict = map_variables(model)
     standard_model = Model(name="standard " + model.name, sense=const.SENSE_MAX)
 
     # add the standard variables to the standard model.
@@ -168,7 +1089,7 @@ def standardize_model(model):
         model.objective.oppose()
 
     # constrains
-    for original_constrain in model.constrain_dict.values():
+    for original_constrain in model.constraint_dict.values():
         lhs, arhs = replace_linear_expression(original_constrain.lhs, variable_map_dict)
         constrain = Constraint(name=original_constrain.name + "_replaced", lhs=lhs, sense=const.SENSE_EQ, rhs=original_constrain.rhs + arhs)
 
@@ -186,7 +1107,7 @@ def standardize_model(model):
     return standard_model
 
 
-def matrix_generation(standard_model, variable_index_dict, constrain_index_dict):
+def matrix_generation(standard_model, variable_index_dict, constrain_index_dict, sparse=True):
     """
     For a standard model, we have following structure:
     ------------------
@@ -194,13 +1115,15 @@ def matrix_generation(standard_model, variable_index_dict, constrain_index_dict)
     s.t.
     Ax = b
     ------------------
-    This function will generate the Numpy Ndarray format data.
+    This function will generate the Numpy Ndarray format data,
+    the left hand side matrix is built from the COO items of the row storage as the scipy.sparse CSC format.
 
 
     paras:
         standard_model: a model with standard formation,
         variable_index_dict: the dict for variable's index,
-        constrain_index_dict: the dict for constraint's index.
+        constrain_index_dict: the dict for constraint's index,
+        sparse: if False, the left hand side matrix is a dense Numpy Ndarray, only for tiny models.
 
     returns:
         c: the cost function vector,
@@ -217,21 +1140,26 @@ def matrix_generation(standard_model, variable_index_dict, constrain_index_dict)
         index = variable_index_dict[variable_name]
         c[index] = value
 
-    A = np.zeros((m, n))
+    rows = standard_model.rows
+    column_map = np.array([variable_index_dict[name] for name in standard_model.columns.name_list], dtype=int)
+    row_map = np.array([constrain_index_dict[name] for name in rows.name_list], dtype=int)
     b = np.zeros(m)
-    for constrain_name, constrain in standard_model.constrain_dict.items():
-        row_index = constrain_index_dict[constrain_name]
-        for variable_name, value in constrain.lhs.coefficient_dict.items():
-            column_index = variable_index_dict[variable_name]
-            A[row_index, column_index] = value
-        b[row_index] = constrain.rhs
+    b[row_map] = rows.rhs.view()
+
+    A = sp.csc_matrix(
+        (rows.coefficient.view(), (row_map[rows.row.view()], column_map[rows.column.view()])),
+        shape=(m, n), dtype=float
+    )
+    A.eliminate_zeros()
+    if not sparse:
+        A = A.toarray()
 
     return c, A, b
 
 
 def is_solvable(A, b):
     """
-    To valid if the linear equations Ax=b is solvable.
+    To valid if the linear equations Ax=b is solvable, by the sparse rank-revealing elimination.
 
     paras:
         A: the left hand side matrix,
@@ -240,73 +1168,446 @@ def is_solvable(A, b):
     returns:
         True\False
     """
-    m = b.shape[0]
-    _A = np.concatenate((A, b.reshape(m, 1)), axis=1)
-    if np.linalg.matrix_rank(A) == np.linalg.matrix_rank(_A):
-        return True
-    else:
-        return False
+    return RowRank(A, b).is_consistent()
 
 
-def search_init_solution(A, b):
+def assign_solution(model, variable_map_dict, standard_value_dict):
     """
-    For a linear equations Ax=b, search a extreme point as a initial solution.
+    map the values of the standard variables back to the original variables.
 
     paras:
-        A: the left hand side matrix,
-        b: the right hand side vector.
+        model: the original model,
+        variable_map_dict: the variable map of the model,
+        standard_value_dict: the dict for standard variable's value.
     """
-    m, n = A.shape
+    for variable in model.variable_dict.values():
+        if variable.get_bound_type() == const.BOUND_TWO_OPEN:
+            x1, x2 = variable_map_dict[const.BOUND_TWO_OPEN][variable.name]
+            variable.value = standard_value_dict[x1.name] - standard_value_dict[x2.name]
+        elif variable.get_bound_type() == const.BOUND_LEFT_OPEN:
+            x1, shift = variable_map_dict[const.BOUND_LEFT_OPEN][variable.name]
+            variable.value = shift - standard_value_dict[x1.name]
+        elif variable.get_bound_type() == const.BOUND_RIGHT_OPEN:
+            x1, shift = variable_map_dict[const.BOUND_RIGHT_OPEN][variable.name]
+            variable.value = standard_value_dict[x1.name] + shift
+        else:
+            x1, shift, _ = variable_map_dict[const.BOUND_TWO_CLOSED][variable.name]
+            variable.value = standard_value_dict[x1.name] + shift
 
-    for item in itertools.permutations(range(n)[::-1], m):
-        _A = A[:, item]
-        basic_solution = np.linalg.solve(_A, b)
 
-        for value in basic_solution:
-            if value < 0:
-                break
-        else:
-            init_solution = np.zeros(n)
-            init_basic_position = np.zeros(n)
+class SimplexCache:
+    """
+    the standard form and the final simplex state of a model, it is kept on the model
+    so that the next solve can warm-start if only the objective, rhs or bounds are changed.
+
+    paras:
+        model: the solved model,
+        form: the standard form of the model,
+        solver: the simplex solver with the final basis, None if only the standard form is cached.
+    """
+    def __init__(self, model, form, solver):
+        self.form = form
+        self.solver = solver
+        # if the form and the solver are shared with the cache of a clone, they are copied before a warm start.
+        self.shared = False
+        self.structure = structure_key(model)
+        self.sense = model.sense
+        self.objective = objective_vector(model)
+        self.objective_constant = model.objective.constant
+        self.rhs = model.rows.rhs.view().copy()
+        self.lower_bound = model.columns.lower_bound.view().copy()
+        self.upper_bound = model.columns.upper_bound.view().copy()
+
+    def clone(self):
+        """
+        get a cache sharing the standard form and the solver, for the clone of the model.
+        Both caches copy them before the next warm start, the compared arrays are never changed and stay shared.
+
+        returns:
+            the simplex cache.
+        """
+        result = copy.copy(self)
+        result.shared = self.shared = True
+        return result
+
+    def own(self):
+        """
+        copy the standard form and the solver if they are shared, before they are changed by a warm start.
+        """
+        if self.shared:
+            self.form = copy.copy(self.form)
+            if self.solver is not None:
+                self.solver = self.solver.copy()
+            self.shared = False
+
+    def add_columns(self, model):
+        """
+        add the columns of the variables added to the model since the last solve to the standard form
+        and to the final basis, so that the next solve warm-starts with the new columns nonbasic.
+
+        paras:
+            model: the model, nothing else must be changed since the last solve.
+        """
+        self.own()
+        n = self.form.n_original
+        position, columns = self.form.add_columns(model)
+        if self.solver is not None:
+            if self.solver.basis is None:
+                self.solver = None
+            else:
+                self.solver.add_columns(position, columns, self.form.c, self.form.b, self.form.upper_bound)
+        self.structure = structure_key(model)
+        self.objective = np.concatenate((self.objective, objective_vector(model)[n:]))
+        self.lower_bound = np.concatenate((self.lower_bound, model.columns.lower_bound.view()[n:]))
+        self.upper_bound = np.concatenate((self.upper_bound, model.columns.upper_bound.view()[n:]))
+
+    def add_rows(self, model):
+        """
+        add the rows of the constraints added to the model since the last solve to the standard form
+        and to the final basis, so that the next solve warm-starts by the dual simplex.
+
+        paras:
+            model: the model, nothing else must be changed since the last solve.
+        """
+        self.own()
+        rows, slack_sign = self.form.add_rows(model)
+        if self.solver is not None:
+            if self.solver.basis is None or self.solver.factor is None:
+                self.solver = None
+            else:
+                self.solver.add_rows(rows, slack_sign, self.form.c, self.form.b, self.form.upper_bound)
+        self.structure = structure_key(model)
+        self.rhs = model.rows.rhs.view().copy()
+
+    def remove_rows(self, model, rows):
+        """
+        remove inequality rows from the standard form and the final basis, after the constraints are
+        removed from the model, the slack column of each row must be in the basis.
 
-            for index, value in enumerate(basic_solution):
-                position = item[index]
-                init_solution[position] = value
-                init_basic_position[position] = 1
+        paras:
+            model: the model, nothing else must be changed since the last solve,
+            rows: the index vector of the old rows removed.
+        """
+        self.own()
+        keep_row, keep_column = self.form.remove_rows(model, rows)
+        if self.solver is not None:
+            if self.solver.basis is None or self.solver.factor is None:
+                self.solver = None
+            else:
+                self.solver.remove_rows(keep_row, keep_column, self.form.c)
+        self.structure = structure_key(model)
+        self.rhs = model.rows.rhs.view().copy()
+
+
+def structure_key(model):
+    """
+    get the key of the model's structure, the warm start is only valid for the same key,
+    which covers the matrix, the senses and the finiteness of the bounds.
+
+    paras:
+        model: the model.
+
+    returns:
+        the structure key.
+    """
+    return (
+        len(model.columns),
+        len(model.rows),
+        model.rows.version,
+        model.rows.sense.view().tobytes(),
+        np.isfinite(model.columns.lower_bound.view()).tobytes(),
+        np.isfinite(model.columns.upper_bound.view()).tobytes()
+    )
 
-            return init_solution, init_basic_position
 
+def warm_solve(model, cache, max_iteration=None, stats=None, callback=None, pricing=None):
+    """
+    re-solve a model from the cached final basis, only the changed parts of the standard form are updated.
+    If only the standard form is cached, it is solved from scratch without being generated again.
+
+    paras:
+        model: the model,
+        cache: the simplex cache of the model,
+        max_iteration: the maximum number of pivots, if None, there is no limit,
+        stats: the solve statistics to record in, if None, a new one is created,
+        callback: the function called with the simplex solver after each iteration, if None, nothing is called,
+        pricing: the pricing of the simplex solver, if None, the cached solver keeps its own.
 
-def simplex_method(model, simplex_type):
+    returns:
+        the status, None if the warm start is not applicable.
     """
-    Use the simplex method to solve the linear programming.
+    if structure_key(model) != cache.structure:
+        return None
+    if stats is None:
+        stats = SolveStats(const.SIMPLEX_PRIMAL)
+
+    cache.own()
+    form = cache.form
+    objective_changed = (
+        model.sense != cache.sense
+        or model.objective.constant != cache.objective_constant
+        or not np.array_equal(objective_vector(model), cache.objective)
+    )
+    bound_changed = not (
+        np.array_equal(model.columns.lower_bound.view(), cache.lower_bound)
+        and np.array_equal(model.columns.upper_bound.view(), cache.upper_bound)
+    )
+    rhs_changed = not np.array_equal(model.rows.rhs.view(), cache.rhs)
+
+    with stats.timer(const.PHASE_STANDARDIZE):
+        if bound_changed:
+            form.update_bounds(model)
+        elif rhs_changed:
+            form.update_rhs(model)
+        if objective_changed or bound_changed:
+            form.update_objective(model)
+
+    if cache.solver is None:
+        cache.solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration,
+                                      stats=stats, callback=callback, pricing=pricing or const.SIMPLEX_PRIMAL)
+        return cache.solver.solve()
+
+    cache.solver.attach(stats, callback)
+    if pricing is not None:
+        cache.solver.pricing = pricing
+
+    if bound_changed:
+        cache.solver.update(b=form.b, upper_bound=form.upper_bound[:cache.solver.n])
+    elif rhs_changed:
+        cache.solver.update(b=form.b)
+    if objective_changed or bound_changed:
+        cache.solver.update(c=form.c)
+    cache.solver.max_iteration = None if max_iteration is None else cache.solver.iteration + max_iteration
+    return cache.solver.resolve()
+
+
+def crossover(form, interior_point, max_iteration=None, stats=None, callback=None):
+    """
+    solve a standard form by the interior point method and cross over to an optimal basis.
+    The variables at their bounds with positive dual values are fixed there, the simplex method solves
+    the rest, and then the bounds are released and the primal simplex continues from the basis.
+    If the interior point method does not reach the optimal, the simplex method solves from scratch.
+
+    paras:
+        form: the standard form,
+        interior_point: the interior point solver of the standard form,
+        max_iteration: the maximum number of pivots, if None, there is no limit,
+        stats: the solve statistics to record in, if None, a new one is created,
+        callback: the function called with the simplex solver after each pivot, if None, nothing is called.
 
+    returns:
+        the simplex solver with the final basis.
+    """
+    if stats is None:
+        stats = SolveStats(const.SIMPLEX_INTERIOR_POINT)
+    with stats.timer(const.PHASE_INTERIOR_POINT):
+        interior_point_status = interior_point.solve()
+    stats.add_iteration(const.PHASE_INTERIOR_POINT, interior_point.iteration)
+    if interior_point_status != const.STATUS_OPTIMAL:
+        solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration,
+                                stats=stats, callback=callback)
+        solver.solve()
+        return solver
+
+    x = interior_point.x
+    scale = 1 + np.abs(x)
+    at_lower = (x <= 1e-6 * scale) & (interior_point.z > 1e-6)
+    at_upper = (form.upper_bound - x <= 1e-6 * scale) & (interior_point.v > 1e-6) & ~at_lower
+    upper_bound = form.upper_bound.copy()
+    upper_bound[at_lower | at_upper] = 0
+    # a variable fixed at its upper bound is moved to the right hand side.
+    b = form.b - form.A[:, at_upper].dot(form.upper_bound[at_upper])
+
+    solver = RevisedSimplex(form.c, form.A, b, upper_bound, max_iteration=max_iteration, stats=stats,
+                            callback=callback)
+    if solver.solve() != const.STATUS_OPTIMAL:
+        solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration,
+                                stats=stats, callback=callback)
+        solver.solve()
+        return solver
+
+    solver.update(b=form.b, upper_bound=form.upper_bound)
+    nonbasic = np.ones(solver.A.shape[1], dtype=bool)
+    nonbasic[solver.basis] = False
+    fixed = np.flatnonzero((at_lower | at_upper) & nonbasic[:solver.n])
+    solver.at_upper[fixed] = at_upper[fixed]
+    if max_iteration is not None:
+        solver.max_iteration = solver.iteration + max_iteration
+    if solver.resolve() is None:
+        solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration,
+                                stats=stats, callback=callback)
+        solver.solve()
+    return solver
+
+
+def interior_point_method(model, max_iteration=100, callback=None):
+    """
+    Use the primal-dual interior point method to solve the linear programming without the crossover,
+    the values of the variables and the status are written back to the model,
+    and the solve statistics are kept on the model.
 
     paras:
-        model: the original linear programing model.
+        model: the original linear programing model,
+        max_iteration: the maximum number of iterations,
+        callback: the function called with the interior point solver after each iteration, if None, nothing is called.
 
     returns:
-        TBD
+        objective_value: the optimal objective value, None if the model is not solved to optimal,
+        status: the status of the model.
+    """
+    stats = SolveStats(const.SIMPLEX_INTERIOR_POINT)
+    with stats.timer(const.PHASE_MATRIX):
+        model.rows.csr(len(model.columns))
+    with stats.timer(const.PHASE_STANDARDIZE):
+        form = standard_form(model)
+    solver = InteriorPoint(
+        form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration, free_pair=form.free_pair(),
+        callback=callback
+    )
+    with stats.timer(const.PHASE_INTERIOR_POINT):
+        model.status = solver.solve()
+    stats.add_iteration(const.PHASE_INTERIOR_POINT, solver.iteration)
+    stats.status = model.status
+    model.solve_stats = stats
+    model.simplex_cache = None
+    if model.status != const.STATUS_OPTIMAL:
+        return None, model.status
+    model.columns.value[:] = form.recover(solver.x)
+    return form.objective_value(solver.x), model.status
+
+
+def check_linear_model(model):
+    """
+    check that a model has only continuous variables, the simplex method does not solve
+    a model with integer variables as its relaxation silently.
+
+    paras:
+        model: the model.
     """
-    standard_model = standardize_model(model)
+    if (model.columns.cat.view() != CAT_LIST.index(const.CAT_CONTINUOUS)).any():
+        raise ValueError("The model has integer variables, solve it by branch_and_bound")
 
-    variable_list = list(standard_model.variable_dict)
-    constrain_list = list(standard_model.constrain_dict)
 
-    variable_index_dict = dict()
-    constrain_index_dict = dict()
+def simplex_method(model, simplex_type=const.SIMPLEX_PRIMAL, max_iteration=None, warm_start=True, presolve=False,
+                   callback=None):
+    """
+    Use the two-phase revised simplex method to solve the linear programming,
+    the values of the variables and the status are written back to the model,
+    and the solve statistics are kept on the model as solve_stats.
+    The standard form and the final basis are kept on the model, the next solve
+    warm-starts from them if only the objective, rhs or bounds are changed.
+    The basis of a solve stopped by a limit is kept too if it is past phase I, the next solve continues from it.
+    With the presolve, the reduced model is solved from scratch and its solution is postsolved.
+    The model must have only continuous variables, a model with integer variables is solved by branch_and_bound.
+    With the interior point type, a cold solve runs the interior point method and crosses over to a basis.
+    The other types are the pricings of the revised simplex method, primal (Dantzig's rule),
+    the partial pricing, Devex, or the dual steepest edge, which solves from scratch by the dual simplex method,
+    the pivots of each are in model.solve_stats.
+
 
-    for index, variable in enumerate(variable_list):
-        variable_index_dict[variable] = index
-    for index, constrain in enumerate(constrain_list):
-        constrain_index_dict[constrain] = index
+    paras:
+        model: the original linear programing model,
+        simplex_type: the type of the simplex method, primal, partial pricing, Devex, dual steepest edge
+            or interior point,
+        max_iteration: the maximum number of pivots, if None, there is no limit,
+        warm_start: if False, the model is solved from scratch,
+        presolve: if True, the model is reduced by the presolve before it is standardized,
+        callback: the function called with the solver after each iteration, if None, nothing is called,
+            solver.progress() gives the phase, the iteration, the objective value and the infeasibility.
 
-    c, A, b = matrix_generation(standard_model, variable_index_dict, constrain_index_dict)
+    returns:
+        objective_value: the optimal objective value, None if the model is not solved to optimal,
+        status: the status of the model,
+        basis: the column indices of the basis in the standard form, the indices not less than
+            the number of standard columns are the artificial variables of redundant rows,
+            it is the basis of the reduced model with the presolve, None if the presolve decides the status.
+    """
+    if simplex_type not in PRICING_LIST and simplex_type != const.SIMPLEX_INTERIOR_POINT:
+        raise ValueError("Simplex type not valid")
+    check_linear_model(model)
+    pricing = simplex_type if simplex_type in PRICING_LIST else None
+
+    stats = SolveStats(simplex_type)
+    if presolve:
+        reduction = Presolve(model)
+        model.simplex_cache = None
+        with stats.timer(const.PHASE_PRESOLVE):
+            model.status = reduction.run()
+        model.solve_stats = stats
+        if model.status is not None:
+            stats.status = model.status
+            return None, model.status, None
+        objective_value, model.status, basis = simplex_method(
+            reduction.model, simplex_type, max_iteration, False, callback=callback
+        )
+        stats.merge(reduction.model.solve_stats)
+        if model.status == const.STATUS_OPTIMAL:
+            with stats.timer(const.PHASE_POSTSOLVE):
+                model.columns.value[:] = reduction.postsolve(reduction.model.columns.value.view())
+        stats.status = model.status
+        return objective_value, model.status, basis
+
+    status = None
+    cache = model.simplex_cache
+    if warm_start and cache is not None:
+        status = warm_solve(model, cache, max_iteration, stats, callback, pricing)
+        stats.warm_start = status is not None
+
+    if status is None:
+        with stats.timer(const.PHASE_MATRIX):
+            model.rows.csr(len(model.columns))
+        with stats.timer(const.PHASE_STANDARDIZE):
+            form = standard_form(model)
+        if simplex_type == const.SIMPLEX_INTERIOR_POINT:
+            interior_point = InteriorPoint(form.c, form.A, form.b, form.upper_bound, free_pair=form.free_pair(),
+                                           callback=callback)
+            solver = crossover(form, interior_point, max_iteration, stats, callback)
+        else:
+            solver = RevisedSimplex(form.c, form.A, form.b, form.upper_bound, max_iteration=max_iteration,
+                                    stats=stats, callback=callback, pricing=pricing)
+            solver.solve()
+        status = solver.status
+        cache = SimplexCache(model, form, solver)
+
+    model.status = status
+    stats.status = status
+    model.solve_stats = stats
+    model.simplex_cache = None
+    objective_value = None
+    if model.status == const.STATUS_OPTIMAL:
+        model.columns.value[:] = cache.form.recover(cache.solver.x)
+        objective_value = cache.form.objective_value(cache.solver.x)
+        model.simplex_cache = SimplexCache(model, cache.form, cache.solver)
+    elif model.status in INTERRUPT_STATUS_LIST and cache.solver.phase in (const.PHASE_TWO, const.PHASE_DUAL):
+        model.simplex_cache = SimplexCache(model, cache.form, cache.solver)
+
+    return objective_value, model.status, cache.solver.basis
+
+
+def compare_pricing(model, simplex_types=None, max_iteration=None):
+    """
+    solve a clone of the model from scratch with each pricing, to compare their pivots and wall time.
 
-    # check if there has a solution
-    if is_solvable(A, b) == False:
-        standard_model.status == const.STATUS_NO_SOLUTION
-        return
+    paras:
+        model: the original linear programing model, it is not changed,
+        simplex_types: the simplex types to compare, if None, all the pricings are compared,
+        max_iteration: the maximum number of pivots of each solve, if None, there is no limit.
 
-    init_solution, init_basic_position = search_init_solution(A, b)
-    return init_solution, init_basic_position
\ No newline at end of file
+    returns:
+        a dict of the simplex type and the dict of its objective value, status, pivots, iterations and seconds.
+    """
+    simplex_types = PRICING_LIST if simplex_types is None else simplex_types
+    result = dict()
+    for simplex_type in simplex_types:
+        clone = model.clone(model.name + " " + simplex_type)
+        objective_value, status, _ = simplex_method(clone, simplex_type, max_iteration=max_iteration,
+                                                    warm_start=False)
+        stats = clone.solve_stats
+        result[simplex_type] = {
+            "objective_value": objective_value,
+            "status": status,
+            "pivot_count": stats.pivot_count,
+            "iteration": stats.total_iteration(),
+            "seconds": stats.total_time()
+        }
+    return result
@@ -0,0 +1,244 @@
+"""
+This file defines the binary snapshot of a model, which can be loaded without copying.
+Last edited by Teast Ares, 20190130.
+"""
+
+import json
+import numpy as np
+import scipy.sparse as sp
+from util import *
+from constant import const
+from algo.standard_form import *
+from algo.simplex import *
+
+
+# the first bytes of a snapshot file and the alignment of the arrays in it.
+SNAPSHOT_MAGIC = b"ORLABSNP"
+SNAPSHOT_ALIGNMENT = 64
+
+
+def encode_names(name_list):
+    """
+    encode a list of names into a byte vector, the names are separated by a newline.
+
+    paras:
+        name_list: the list of names.
+
+    returns:
+        the byte vector.
+    """
+    text = "\n".join(name_list)
+    if text.count("\n") != max(len(name_list) - 1, 0):
+        raise ValueError("Name with a newline can not be saved")
+    return np.frombuffer(text.encode(), dtype=np.uint8)
+
+
+def decode_names(data, size):
+    """
+    decode a byte vector into a list of names.
+
+    paras:
+        data: the byte vector,
+        size: the number of names.
+
+    returns:
+        the list of names.
+    """
+    if size == 0:
+        return list()
+    return data.tobytes().decode().split("\n")
+
+
+def write_arrays(path, arrays, meta):
+    """
+    write arrays into a single file, each array is aligned so that it can be memory-mapped in place.
+    ----------
+    magic | header size | header (json) | padding | array | padding | array | ...
+    ----------
+
+    paras:
+        path: the path of the file,
+        arrays: the dict of Numpy Ndarrays,
+        meta: the dict of numbers and strings kept in the header.
+    """
+    arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+    layout = dict()
+    offset = 0
+    for key, value in arrays.items():
+        layout[key] = [value.dtype.str, list(value.shape), offset]
+        offset += -(-value.nbytes // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+    header = json.dumps({"meta": meta, "arrays": layout}).encode()
+    start = len(SNAPSHOT_MAGIC) + 8 + len(header)
+    start = -(-start // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for key, value in arrays.items():
+            f.seek(start + layout[key][2])
+            value.tofile(f)
+        f.truncate(start + offset)
+
+
+def read_arrays(path, use_mmap=True):
+    """
+    read the arrays written by write_arrays.
+
+    paras:
+        path: the path of the file,
+        use_mmap: if True, the arrays are copy-on-write views of the memory-mapped file,
+            otherwise the file is read into memory.
+
+    returns:
+        arrays: the dict of Numpy Ndarrays,
+        meta: the dict of numbers and strings kept in the header.
+    """
+    if use_mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    if buffer[:len(SNAPSHOT_MAGIC)].tobytes() != SNAPSHOT_MAGIC:
+        raise ValueError("Not a snapshot file")
+
+    header_size = int(buffer[len(SNAPSHOT_MAGIC):len(SNAPSHOT_MAGIC) + 8].view(np.uint64)[0])
+    header_start = len(SNAPSHOT_MAGIC) + 8
+    header = json.loads(buffer[header_start:header_start + header_size].tobytes().decode())
+    start = -(-(header_start + header_size) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+    arrays = dict()
+    for key, (dtype, shape, offset) in header["arrays"].items():
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        arrays[key] = buffer[start + offset:start + offset + size].view(dtype).reshape(shape)
+    return arrays, header["meta"]
+
+
+def form_is_current(model, cache):
+    """
+    check if the cached standard form matches the current model exactly.
+
+    paras:
+        model: the model,
+        cache: the simplex cache of the model.
+
+    returns:
+        True if the cached standard form can be saved.
+    """
+    return (
+        structure_key(model) == cache.structure
+        and model.sense == cache.sense
+        and model.objective.constant == cache.objective_constant
+        and np.array_equal(objective_vector(model), cache.objective)
+        and np.array_equal(model.rows.rhs.view(), cache.rhs)
+        and np.array_equal(model.columns.lower_bound.view(), cache.lower_bound)
+        and np.array_equal(model.columns.upper_bound.view(), cache.upper_bound)
+    )
+
+
+def save_snapshot(model, path, with_form=True):
+    """
+    save a model into a binary snapshot file, the constraint matrix is saved in the CSR order.
+
+    paras:
+        model: the model,
+        path: the path of the file,
+        with_form: if True, the standard form is saved as well, so that it is not generated again after loading,
+            the cached one of the last solve is used if it is still valid.
+    """
+    columns = model.columns
+    rows = model.rows
+    n = len(columns)
+    A = rows.csr(n)
+    arrays = {
+        "variable_names": encode_names(columns.name_list),
+        "lower_bound": columns.lower_bound.view(),
+        "upper_bound": columns.upper_bound.view(),
+        "cat": columns.cat.view(),
+        "value": columns.value.view(),
+        "objective": objective_vector(model),
+        "constraint_names": encode_names(rows.name_list),
+        "sense": rows.sense.view(),
+        "rhs": rows.rhs.view(),
+        "row": np.repeat(np.arange(len(rows), dtype=np.int64), np.diff(A.indptr)),
+        "column": A.indices.astype(np.int64),
+        "coefficient": A.data,
+        "indptr": A.indptr,
+        "indices": A.indices
+    }
+    meta = {
+        "name": model.name,
+        "sense": model.sense,
+        "objective_constant": float(model.objective.constant),
+        "n": n,
+        "m": len(rows),
+        "form": None
+    }
+
+    if with_form:
+        cache = model.simplex_cache
+        if cache is not None and form_is_current(model, cache):
+            form = cache.form
+        else:
+            form = standard_form(model)
+        form_meta = dict()
+        for key, value in form.to_arrays().items():
+            if isinstance(value, np.ndarray):
+                arrays["form_" + key] = value
+            else:
+                form_meta[key] = value
+        meta["form"] = form_meta
+
+    write_arrays(path, arrays, meta)
+
+
+def load_snapshot(path, use_mmap=True):
+    """
+    load a model from a binary snapshot file, the arrays are not copied until they are changed or grow.
+    If the standard form is saved, it is cached on the model, so the first solve starts from it directly.
+
+    paras:
+        path: the path of the file,
+        use_mmap: if True, the file is memory-mapped, otherwise it is read into memory.
+
+    returns:
+        the model.
+    """
+    arrays, meta = read_arrays(path, use_mmap)
+    n = meta["n"]
+    m = meta["m"]
+    model = Model(name=meta["name"], sense=meta["sense"])
+
+    columns = model.columns
+    columns.name_list = decode_names(arrays["variable_names"], n)
+    columns.index_dict = dict(zip(columns.name_list, range(n)))
+    columns.lower_bound = GrowableArray.from_array(arrays["lower_bound"])
+    columns.upper_bound = GrowableArray.from_array(arrays["upper_bound"])
+    columns.cat = GrowableArray.from_array(arrays["cat"])
+    columns.value = GrowableArray.from_array(arrays["value"])
+
+    rows = model.rows
+    rows.name_list = decode_names(arrays["constraint_names"], m)
+    rows.index_dict = dict(zip(rows.name_list, range(m)))
+    rows.sense = GrowableArray.from_array(arrays["sense"])
+    rows.rhs = GrowableArray.from_array(arrays["rhs"])
+    rows.row = GrowableArray.from_array(arrays["row"])
+    rows.column = GrowableArray.from_array(arrays["column"])
+    rows.coefficient = GrowableArray.from_array(arrays["coefficient"])
+    # the saved items are in the CSR order without duplicates, so the matrix is restored in place.
+    rows.csr_cache = sp.csr_matrix((arrays["coefficient"], arrays["indices"], arrays["indptr"]), shape=(m, n))
+    rows.csr_version = rows.version
+
+    objective = arrays["objective"]
+    nonzero = np.flatnonzero(objective)
+    model.objective.add_items([model.get_variable(j) for j in nonzero], objective[nonzero].tolist())
+    model.objective.constant = meta["objective_constant"]
+
+    if meta["form"] is not None:
+        form_arrays = dict(meta["form"])
+        for key, value in arrays.items():
+            if key.startswith("form_"):
+                form_arrays[key[len("form_"):]] = value
+        form = StandardForm.from_arrays(form_arrays, rows.csr_cache)
+        model.simplex_cache = SimplexCache(model, form, None)
+    return model
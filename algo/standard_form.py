@@ -0,0 +1,399 @@
+"""
+This file defines the standard form of a linear programming.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from util import *
+from constant import const
+
+
+def bound_type_vector(lower_bound, upper_bound):
+    """
+    classify the bound types of the variables.
+
+    paras:
+        lower_bound: the lower bound vector, -inf for negative infinite,
+        upper_bound: the upper bound vector, inf for infinite.
+
+    returns:
+        the bound type vector.
+    """
+    lower_closed = np.isfinite(lower_bound)
+    upper_closed = np.isfinite(upper_bound)
+    return np.where(
+        lower_closed,
+        np.where(upper_closed, const.BOUND_TWO_CLOSED, const.BOUND_RIGHT_OPEN),
+        np.where(upper_closed, const.BOUND_LEFT_OPEN, const.BOUND_TWO_OPEN)
+    )
+
+
+def bound_range(lower_bound, upper_bound):
+    """
+    get the upper bounds of the shifted variables, the width of the closed bounds and inf for the others.
+    A lower bound above its upper bound is rejected, the roundoff within the primal tolerance is clipped to zero.
+
+    paras:
+        lower_bound: the lower bound vector, -inf for negative infinite,
+        upper_bound: the upper bound vector, inf for infinite.
+
+    returns:
+        the upper bound vector of the shifted variables.
+    """
+    closed = np.isfinite(lower_bound) & np.isfinite(upper_bound)
+    width = np.full(lower_bound.shape[0], np.inf)
+    width[closed] = upper_bound[closed] - lower_bound[closed]
+    if (width < -const.TOL_PRIMAL * (1 + np.abs(upper_bound))).any():
+        raise ValueError("Lower bound above upper bound")
+    return np.maximum(width, 0)
+
+
+def insert_columns(A, position, columns):
+    """
+    insert columns into a matrix, before the given columns of the matrix.
+
+    paras:
+        A: the matrix in the scipy.sparse CSC format,
+        position: the index vector of the columns of A to insert before, in the order of the new columns,
+            the number of columns of A to insert at the end,
+        columns: the matrix of the new columns.
+
+    returns:
+        the matrix in the scipy.sparse CSC format,
+        the index vector of the old columns in the new matrix.
+    """
+    n = A.shape[1]
+    index = np.insert(np.arange(n), position, n + np.arange(columns.shape[1]))
+    result = sp.hstack((A, columns), format="csc")[:, index]
+    return result, np.flatnonzero(index < n)
+
+
+class StandardForm:
+    """
+    the standard form of a linear programming, which is generated by array transforms.
+    ----------
+    Max cx
+    s.t.
+    Ax = b
+    0 <= x <= u
+    ----------
+    The columns of the standard form are, in order, one structural column for each original variable,
+    the negative part of the two-side open variables and the slack of the inequality rows.
+    The rows are the original rows, the upper bounds are kept in u instead of extra rows.
+    An original variable x_j = shift_j + sign_j * x'_j (- x''_j if it is two-side open).
+
+    paras:
+        model: the original model.
+    """
+    def __init__(self, model):
+        n = len(model.columns)
+        m = len(model.rows)
+        lower_bound = model.columns.lower_bound.view()
+        upper_bound = model.columns.upper_bound.view()
+        bound_type = bound_type_vector(lower_bound, upper_bound)
+
+        # x = -x' + upper_bound for left-side open variables, x = x' + lower_bound for the others.
+        self.sign = np.where(bound_type == const.BOUND_LEFT_OPEN, -1.0, 1.0)
+        self.free = np.flatnonzero(bound_type == const.BOUND_TWO_OPEN)
+
+        self.original_A = model.rows.csr(n)
+        sense = model.rows.sense.view()
+        self.slack_row = np.flatnonzero(sense != SENSE_LIST.index(const.SENSE_EQ))
+        slack_sign = np.where(sense[self.slack_row] == SENSE_LIST.index(const.SENSE_LEQ), 1.0, -1.0)
+
+        n_slack = self.slack_row.shape[0]
+        self.A = sp.hstack((
+            self.original_A.dot(sp.diags(self.sign)),
+            -self.original_A[:, self.free],
+            sp.csr_matrix((slack_sign, (self.slack_row, np.arange(n_slack))), shape=(m, n_slack))
+        ), format="csc")
+
+        self.n_original = n
+        self.m_original = m
+        self.shift = None
+        self.upper_bound = None
+        self.b = None
+        self.c = None
+        self.sense_sign = None
+        self.objective_offset = None
+        self.update_bounds(model)
+        self.update_objective(model)
+
+    @classmethod
+    def from_arrays(cls, arrays, original_A):
+        """
+        restore a standard form from its arrays without generating it again.
+
+        paras:
+            arrays: the dict of arrays and numbers given by to_arrays,
+            original_A: the left hand side matrix of the original model in the CSR format.
+
+        returns:
+            the standard form.
+        """
+        form = cls.__new__(cls)
+        form.sign = arrays["sign"]
+        form.free = arrays["free"]
+        form.slack_row = arrays["slack_row"]
+        form.original_A = original_A
+        form.A = sp.csc_matrix(
+            (arrays["A_data"], arrays["A_indices"], arrays["A_indptr"]),
+            shape=(int(arrays["m"]), arrays["A_indptr"].shape[0] - 1)
+        )
+        form.n_original = int(arrays["n_original"])
+        form.m_original = int(arrays["m_original"])
+        form.shift = arrays["shift"]
+        form.upper_bound = arrays["upper_bound"]
+        form.b = arrays["b"]
+        form.c = arrays["c"]
+        form.sense_sign = float(arrays["sense_sign"])
+        form.objective_offset = float(arrays["objective_offset"])
+        return form
+
+    def to_arrays(self):
+        """
+        get the arrays of the standard form, the original matrix is not included.
+
+        returns:
+            a dict of Numpy Ndarrays and numbers.
+        """
+        return {
+            "sign": self.sign,
+            "free": self.free,
+            "slack_row": self.slack_row,
+            "A_data": self.A.data,
+            "A_indices": self.A.indices,
+            "A_indptr": self.A.indptr,
+            "m": self.A.shape[0],
+            "n_original": self.n_original,
+            "m_original": self.m_original,
+            "shift": self.shift,
+            "upper_bound": self.upper_bound,
+            "b": self.b,
+            "c": self.c,
+            "sense_sign": self.sense_sign,
+            "objective_offset": self.objective_offset
+        }
+
+    def update_rhs(self, model):
+        """
+        update the right hand side from the model, the matrix is not changed.
+
+        paras:
+            model: the original model.
+        """
+        self.b = model.rows.rhs.view() - self.original_A.dot(self.shift)
+
+    def update_bounds(self, model):
+        """
+        update the shift, the upper bounds and the right hand side from the model,
+        the bound types of the variables must not be changed.
+
+        paras:
+            model: the original model.
+        """
+        self.set_bounds(model.columns.lower_bound.view(), model.columns.upper_bound.view(), model.rows.rhs.view())
+
+    def set_bounds(self, lower_bound, upper_bound, rhs):
+        """
+        set the shift, the upper bounds and the right hand side from bound vectors.
+        A variable may get a finite bound which its bound type in the standard form does not have,
+        unless it is two-side open in the standard form.
+
+        paras:
+            lower_bound: the lower bound vector, -inf for negative infinite,
+            upper_bound: the upper bound vector, inf for infinite,
+            rhs: the right hand side vector of the original rows.
+        """
+        self.shift = np.where(
+            self.sign < 0, upper_bound,
+            np.where(np.isfinite(lower_bound), lower_bound, np.where(np.isfinite(upper_bound), upper_bound, 0.0))
+        )
+        structural_upper_bound = bound_range(lower_bound, upper_bound)
+        self.upper_bound = np.concatenate((
+            structural_upper_bound, np.full(self.A.shape[1] - self.n_original, np.inf)
+        ))
+        self.b = rhs - self.original_A.dot(self.shift)
+
+    def update_objective(self, model):
+        """
+        update the cost function vector and the objective offset from the model.
+
+        paras:
+            model: the original model.
+        """
+        original_c = objective_vector(model)
+        # the standard form always maximizes.
+        self.sense_sign = 1.0 if model.sense == const.SENSE_MAX else -1.0
+        self.c = np.concatenate((
+            self.sense_sign * original_c * self.sign,
+            -self.sense_sign * original_c[self.free],
+            np.zeros(self.slack_row.shape[0])
+        ))
+        self.objective_offset = original_c.dot(self.shift) + model.objective.constant
+
+    def add_columns(self, model):
+        """
+        add the columns of the variables added to the model since the standard form was generated,
+        without generating the other columns again. The structural columns of the new variables
+        are inserted after the old structural columns, and their negative parts after the old negative parts.
+
+        paras:
+            model: the original model, the variables and constraints before must not be changed.
+
+        returns:
+            position: the index vector of the old columns to insert the new columns before,
+            columns: the matrix of the new columns.
+        """
+        n = self.n_original
+        n_new = len(model.columns)
+        lower_bound = model.columns.lower_bound.view()[n:]
+        upper_bound = model.columns.upper_bound.view()[n:]
+        bound_type = bound_type_vector(lower_bound, upper_bound)
+        sign = np.where(bound_type == const.BOUND_LEFT_OPEN, -1.0, 1.0)
+        free = np.flatnonzero(bound_type == const.BOUND_TWO_OPEN)
+
+        self.original_A = model.rows.csr(n_new)
+        new_A = self.original_A[:, n:].tocsc()
+        columns = sp.hstack((new_A.dot(sp.diags(sign)), -new_A[:, free]), format="csc")
+        position = np.concatenate((
+            np.full(n_new - n, n), np.full(free.shape[0], n + self.free.shape[0])
+        ))
+        self.A, _ = insert_columns(self.A, position, columns)
+
+        shift = np.where(
+            sign < 0, upper_bound,
+            np.where(np.isfinite(lower_bound), lower_bound, np.where(np.isfinite(upper_bound), upper_bound, 0.0))
+        )
+        structural_upper_bound = bound_range(lower_bound, upper_bound)
+        original_c = objective_vector(model)[n:]
+        self.upper_bound = np.insert(
+            self.upper_bound, position, np.concatenate((structural_upper_bound, np.full(free.shape[0], np.inf)))
+        )
+        self.c = np.insert(self.c, position, np.concatenate((
+            self.sense_sign * original_c * sign, -self.sense_sign * original_c[free]
+        )))
+        self.b = self.b - new_A.dot(shift)
+        self.objective_offset += original_c.dot(shift)
+        self.sign = np.concatenate((self.sign, sign))
+        self.free = np.concatenate((self.free, n + free))
+        self.shift = np.concatenate((self.shift, shift))
+        self.n_original = n_new
+        return position, columns
+
+    def add_rows(self, model):
+        """
+        add the rows of the constraints added to the model since the standard form was generated,
+        the slack columns of the new inequality rows are added after the old slack columns.
+
+        paras:
+            model: the original model, the variables and constraints before must not be changed.
+
+        returns:
+            rows: the matrix of the new rows over the old columns,
+            slack_sign: the vector of the coefficient of the slack column of each new row, 0 for an equation.
+        """
+        m = self.m_original
+        m_new = len(model.rows)
+        n_slack = self.slack_row.shape[0]
+        self.original_A = model.rows.csr(self.n_original)
+        new_A = self.original_A[m:]
+        sense = model.rows.sense.view()[m:]
+        slack_sign = np.where(
+            sense == SENSE_LIST.index(const.SENSE_EQ), 0.0,
+            np.where(sense == SENSE_LIST.index(const.SENSE_LEQ), 1.0, -1.0)
+        )
+        slack = np.flatnonzero(slack_sign)
+
+        rows = sp.hstack((
+            new_A.dot(sp.diags(self.sign)), -new_A[:, self.free], sp.csr_matrix((m_new - m, n_slack))
+        ), format="csr")
+        self.A = sp.hstack((
+            sp.vstack((self.A, rows)),
+            sp.csr_matrix((slack_sign[slack], (m + slack, np.arange(slack.shape[0]))),
+                          shape=(m_new, slack.shape[0]))
+        ), format="csc")
+        self.slack_row = np.concatenate((self.slack_row, m + slack))
+        self.b = np.concatenate((self.b, model.rows.rhs.view()[m:] - new_A.dot(self.shift)))
+        self.c = np.concatenate((self.c, np.zeros(slack.shape[0])))
+        self.upper_bound = np.concatenate((self.upper_bound, np.full(slack.shape[0], np.inf)))
+        self.m_original = m_new
+        return rows, slack_sign
+
+    def remove_rows(self, model, rows):
+        """
+        remove inequality rows and their slack columns, after the constraints are removed from the model.
+
+        paras:
+            model: the original model, the constraints are removed,
+            rows: the index vector of the old rows to remove.
+
+        returns:
+            keep_row: the mask of the old rows kept,
+            keep_column: the mask of the old columns kept.
+        """
+        keep_row = np.ones(self.m_original, dtype=bool)
+        keep_row[rows] = False
+        keep_slack = keep_row[self.slack_row]
+        if (~keep_slack).sum() != np.size(rows):
+            raise ValueError("Only inequality rows can be removed")
+        keep_column = np.concatenate((np.ones(self.A.shape[1] - self.slack_row.shape[0], dtype=bool), keep_slack))
+
+        self.A = self.A[keep_row][:, keep_column].tocsc()
+        self.slack_row = (np.cumsum(keep_row) - 1)[self.slack_row[keep_slack]]
+        self.b = self.b[keep_row]
+        self.c = self.c[keep_column]
+        self.upper_bound = self.upper_bound[keep_column]
+        self.m_original = int(keep_row.sum())
+        self.original_A = model.rows.csr(self.n_original)
+        return keep_row, keep_column
+
+    def free_pair(self):
+        """
+        get the columns of the positive and negative parts of the two-side open variables.
+
+        returns:
+            the positive part column vector and the negative part column vector.
+        """
+        return self.free, self.n_original + np.arange(self.free.shape[0])
+
+    def recover(self, x):
+        """
+        map a solution of the standard form back to the original variables.
+
+        paras:
+            x: the solution vector of the standard form.
+
+        returns:
+            the solution vector of the original variables.
+        """
+        n = self.n_original
+        result = self.shift + self.sign * x[:n]
+        result[self.free] -= x[n:n + self.free.shape[0]]
+        return result
+
+    def objective_value(self, x):
+        """
+        get the original objective value of a solution of the standard form.
+
+        paras:
+            x: the solution vector of the standard form.
+
+        returns:
+            the objective value.
+        """
+        return float(self.sense_sign * self.c.dot(x) + self.objective_offset)
+
+
+def standard_form(model):
+    """
+    get the standard form of a model by array transforms.
+
+    paras:
+        model: the original model.
+
+    returns:
+        the standard form.
+    """
+    return StandardForm(model)
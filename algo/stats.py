@@ -0,0 +1,160 @@
+"""
+This file defines the statistics of a solve, which are kept on the model after the solve.
+Last edited by Teast Ares, 20190130.
+"""
+
+import time
+import contextlib
+from constant import const
+
+
+class SolveStats:
+    """
+    the statistics of a solve, the wall time and the iterations of each phase, the pivots,
+    and the factorizations of the basis matrix.
+
+    paras:
+        engine: the name of the method, the simplex type or the branch and bound.
+    """
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.status = const.STATUS_UNSOLVED
+        self.warm_start = False
+        # the seconds and the iterations of each phase.
+        self.time_dict = dict()
+        self.iteration_dict = dict()
+
+        self.pivot_count = 0
+        self.bound_flip_count = 0
+        # the pivots and bound flips with a zero step length.
+        self.degenerate_count = 0
+        self.refactor_count = 0
+        self.node_count = 0
+        # the nonzeros of the last factorized basis matrix and of its LU factors,
+        # and the largest ratio of them and the most nonzeros in the eta file.
+        self.basis_nnz = 0
+        self.factor_nnz = 0
+        self.max_fill = 0.0
+        self.max_eta_nnz = 0
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        """
+        add the wall time of the block in the with statement to a phase.
+
+        paras:
+            phase: the name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase, seconds):
+        """
+        add the wall time to a phase.
+
+        paras:
+            phase: the name of the phase,
+            seconds: the wall time.
+        """
+        self.time_dict[phase] = self.time_dict.get(phase, 0.0) + seconds
+
+    def add_iteration(self, phase, iteration):
+        """
+        add the iterations to a phase.
+
+        paras:
+            phase: the name of the phase,
+            iteration: the number of iterations.
+        """
+        self.iteration_dict[phase] = self.iteration_dict.get(phase, 0) + iteration
+
+    def record_factor(self, basis_nnz, factor_nnz):
+        """
+        record a factorization of the basis matrix.
+
+        paras:
+            basis_nnz: the nonzeros of the basis matrix,
+            factor_nnz: the nonzeros of the LU factors.
+        """
+        self.refactor_count += 1
+        self.basis_nnz = basis_nnz
+        self.factor_nnz = factor_nnz
+        self.max_fill = max(self.max_fill, factor_nnz / max(basis_nnz, 1))
+
+    def merge(self, other):
+        """
+        add the statistics of another solve, such as the solve of the reduced model after the presolve.
+
+        paras:
+            other: the solve statistics.
+        """
+        for phase, seconds in other.time_dict.items():
+            self.add_time(phase, seconds)
+        for phase, iteration in other.iteration_dict.items():
+            self.add_iteration(phase, iteration)
+        self.warm_start = self.warm_start or other.warm_start
+        self.pivot_count += other.pivot_count
+        self.bound_flip_count += other.bound_flip_count
+        self.degenerate_count += other.degenerate_count
+        self.refactor_count += other.refactor_count
+        self.node_count += other.node_count
+        if other.refactor_count:
+            self.basis_nnz = other.basis_nnz
+            self.factor_nnz = other.factor_nnz
+        self.max_fill = max(self.max_fill, other.max_fill)
+        self.max_eta_nnz = max(self.max_eta_nnz, other.max_eta_nnz)
+
+    def total_time(self):
+        """
+        get the wall time of all the phases.
+
+        returns:
+            the seconds.
+        """
+        return sum(self.time_dict.values())
+
+    def total_iteration(self):
+        """
+        get the iterations of all the phases.
+
+        returns:
+            the number of iterations.
+        """
+        return sum(self.iteration_dict.values())
+
+    def to_dict(self):
+        """
+        get the statistics as a dict of numbers and strings.
+
+        returns:
+            the dict.
+        """
+        result = dict(self.__dict__)
+        result["time_dict"] = dict(self.time_dict)
+        result["iteration_dict"] = dict(self.iteration_dict)
+        return result
+
+    def __str__(self):
+        line_list = ["{engine}, {status}, {seconds:.4f}s, {iteration} iterations".format(
+            engine=self.engine, status=self.status, seconds=self.total_time(), iteration=self.total_iteration()
+        )]
+        for phase, seconds in self.time_dict.items():
+            line_list.append("  {phase:<16}{seconds:>10.4f}s{iteration:>10}".format(
+                phase=phase, seconds=seconds, iteration=self.iteration_dict.get(phase, "")
+            ))
+        line_list.append(
+            "  pivots {pivot}, bound flips {flip}, degenerate {degenerate}, refactorizations {refactor}, "
+            "fill {fill:.2f}, eta nonzeros {eta}".format(
+                pivot=self.pivot_count, flip=self.bound_flip_count, degenerate=self.degenerate_count,
+                refactor=self.refactor_count, fill=self.max_fill, eta=self.max_eta_nnz
+            )
+        )
+        if self.node_count:
+            line_list.append("  nodes {node}".format(node=self.node_count))
+        return "\n".join(line_list)
+
+    def __repr__(self):
+        return str(self)
@@ -0,0 +1,2 @@
+from benchmark.generator import *
+from benchmark.runner import *
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+This file defines the command line of the benchmark suite.
+----------
+python -m benchmark --sizes small medium --output result.jsonl
+python -m benchmark --compare baseline.jsonl result.jsonl
+----------
+Last edited by Teast Ares, 20190130.
+"""
+
+import sys
+import json
+import argparse
+from constant import const
+from algo import *
+from benchmark.generator import *
+from benchmark.runner import *
+
+
+def main(argv=None):
+    """
+    run the benchmark suite, or compare two result files.
+
+    paras:
+        argv: the command line arguments, if None, they are taken from sys.argv.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmark")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATOR_DICT), default=None)
+    parser.add_argument("--sizes", nargs="+", default=["small", "medium"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--max-iteration", type=int, default=None)
+    parser.add_argument("--simplex-type", choices=PRICING_LIST + [const.SIMPLEX_INTERIOR_POINT],
+                        default=const.SIMPLEX_PRIMAL)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), default=None)
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        comparison_list = compare_results(read_results(args.compare[0]), read_results(args.compare[1]))
+        for comparison in comparison_list:
+            print(json.dumps(comparison))
+        return
+
+    record_list = run_suite(args.generators, args.sizes, args.seed, args.repeat, not args.no_memory,
+                            args.max_iteration, args.output, args.simplex_type)
+    print(format_records(record_list))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,169 @@
+"""
+This file defines the deterministic generators of the benchmark models.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from util import *
+from constant import const
+
+
+def random_sparse_lp(size, seed=0):
+    """
+    generate a random sparse linear programming with all the bound types, which is feasible and bounded.
+    There are size rows and 2 * size columns, with 5 nonzeros in each column on average.
+
+    paras:
+        size: the number of rows,
+        seed: the random seed.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    m, n = size, 2 * size
+    A = sp.random(m, n, density=min(1.0, 5 / m), random_state=rng, format="csr",
+                  data_rvs=lambda k: rng.integers(-9, 10, k).astype(float))
+    # a quarter of the columns are bounded on both sides, the others have no upper bound.
+    lower_bound = np.zeros(n)
+    upper_bound = np.full(n, np.inf)
+    closed = rng.random(n) < 0.25
+    lower_bound[closed] = -5
+    upper_bound[closed] = 5
+    # the point x0 is feasible, and the columns without upper bounds have positive costs in the minimization.
+    x0 = np.where(closed, rng.uniform(-5, 5, n), rng.uniform(0, 5, n))
+    cost = np.where(closed, rng.uniform(-10, 10, n), rng.uniform(1, 10, n))
+    senses = rng.choice([const.SENSE_LEQ, const.SENSE_GEQ, const.SENSE_EQ], m, p=[0.45, 0.45, 0.1])
+    activity = A.dot(x0)
+    slack = rng.uniform(0, 10, m)
+    rhs = np.where(senses == const.SENSE_LEQ, activity + slack,
+                   np.where(senses == const.SENSE_GEQ, activity - slack, activity))
+
+    model = Model("random sparse lp " + str(size), sense=const.SENSE_MIN)
+    model.add_variables_from_arrays(lower_bound, upper_bound, objective=cost)
+    model.add_constraints_from_matrix(A, senses, rhs)
+    return model
+
+
+def transportation(size, seed=0):
+    """
+    generate a transportation problem with size sources and 2 * size sinks, the supply exceeds the demand.
+
+    paras:
+        size: the number of sources,
+        seed: the random seed.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    source, sink = size, 2 * size
+    demand = rng.integers(10, 100, sink).astype(float)
+    supply = rng.dirichlet(np.ones(source)) * demand.sum() * 1.2 + 1
+    cost = rng.uniform(1, 20, source * sink)
+
+    model = Model("transportation " + str(size), sense=const.SENSE_MIN)
+    model.add_variables_from_arrays(0, None, objective=cost)
+    # the variable of the source i and the sink j is i * sink + j.
+    column = np.arange(source * sink)
+    supply_matrix = sp.csr_matrix((np.ones(source * sink), (column // sink, column)), shape=(source, source * sink))
+    demand_matrix = sp.csr_matrix((np.ones(source * sink), (column % sink, column)), shape=(sink, source * sink))
+    model.add_constraints_from_matrix(supply_matrix, const.SENSE_LEQ, supply,
+                                      names=["supply" + str(i) for i in range(source)])
+    model.add_constraints_from_matrix(demand_matrix, const.SENSE_GEQ, demand,
+                                      names=["demand" + str(j) for j in range(sink)])
+    return model
+
+
+def assignment(size, seed=0):
+    """
+    generate an assignment problem of size workers and size jobs, relaxed to the linear programming.
+
+    paras:
+        size: the number of workers,
+        seed: the random seed.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(1, 100, size * size)
+
+    model = Model("assignment " + str(size), sense=const.SENSE_MIN)
+    model.add_variables_from_arrays(0, 1, objective=cost)
+    column = np.arange(size * size)
+    worker_matrix = sp.csr_matrix((np.ones(size * size), (column // size, column)), shape=(size, size * size))
+    job_matrix = sp.csr_matrix((np.ones(size * size), (column % size, column)), shape=(size, size * size))
+    model.add_constraints_from_matrix(worker_matrix, const.SENSE_EQ, 1,
+                                      names=["worker" + str(i) for i in range(size)])
+    model.add_constraints_from_matrix(job_matrix, const.SENSE_EQ, 1,
+                                      names=["job" + str(j) for j in range(size)])
+    return model
+
+
+def knapsack_relaxation(size, seed=0):
+    """
+    generate the linear programming relaxation of a multi-dimensional knapsack problem,
+    with 10 * size items and size knapsack constraints.
+
+    paras:
+        size: the number of knapsack constraints,
+        seed: the random seed.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    item = 10 * size
+    weight = rng.integers(1, 50, (size, item)).astype(float)
+    value = weight.mean(axis=0) + rng.uniform(0, 20, item)
+    capacity = weight.sum(axis=1) / 2
+
+    model = Model("knapsack relaxation " + str(size), sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(0, 1, objective=value)
+    model.add_constraints_from_matrix(weight, const.SENSE_LEQ, capacity)
+    return model
+
+
+def set_cover(size, seed=0):
+    """
+    generate the linear programming relaxation of a set cover problem with size elements and 2 * size sets,
+    each set covers 2% of the elements, and each element is covered by at least one set.
+
+    paras:
+        size: the number of elements,
+        seed: the random seed.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    element, subset = size, 2 * size
+    cover = sp.random(element, subset, density=0.02, random_state=rng, format="lil", data_rvs=np.ones)
+    for i in np.flatnonzero(np.diff(cover.tocsr().indptr) == 0):
+        cover[i, rng.integers(subset)] = 1.0
+    cost = rng.uniform(1, 10, subset)
+
+    model = Model("set cover " + str(size), sense=const.SENSE_MIN)
+    model.add_variables_from_arrays(0, 1, objective=cost)
+    model.add_constraints_from_matrix(cover.tocsr(), const.SENSE_GEQ, 1)
+    return model
+
+
+# the generators by name, and the size parameter of each generator at each benchmark size.
+GENERATOR_DICT = {
+    "random_sparse_lp": random_sparse_lp,
+    "transportation": transportation,
+    "assignment": assignment,
+    "knapsack_relaxation": knapsack_relaxation,
+    "set_cover": set_cover
+}
+SIZE_DICT = {
+    "small": {"random_sparse_lp": 50, "transportation": 10, "assignment": 10, "knapsack_relaxation": 5,
+              "set_cover": 50},
+    "medium": {"random_sparse_lp": 200, "transportation": 20, "assignment": 25, "knapsack_relaxation": 20,
+               "set_cover": 200},
+    "large": {"random_sparse_lp": 500, "transportation": 40, "assignment": 50, "knapsack_relaxation": 50,
+              "set_cover": 500}
+}
@@ -0,0 +1,290 @@
+"""
+This file defines the benchmark runner, which times each phase of building and solving the generated models.
+Last edited by Teast Ares, 20190130.
+"""
+
+import gc
+import json
+import time
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+from util import *
+from constant import const
+from algo import *
+from benchmark.generator import *
+
+
+# the phases in the order they run, each one takes the result of the phases before it.
+PHASE_LIST = ["build", "standardize", "matrix", "standard_form", "solve"]
+
+
+def run_phases(generator, scale, seed, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL):
+    """
+    run all the phases once on a generated model.
+
+    paras:
+        generator: the model generator,
+        scale: the size parameter of the generator,
+        seed: the random seed,
+        max_iteration: the maximum number of pivots of the solve, if None, there is no limit,
+        simplex_type: the simplex type of the solve.
+
+    returns:
+        a generator of (phase, result), each item is yielded right after its phase.
+    """
+    model = generator(scale, seed)
+    yield "build", model
+    standard_model = standardize_model(model)
+    yield "standardize", standard_model
+    yield "matrix", matrix_generation(standard_model, standard_model.columns.index_dict, standard_model.rows.index_dict)
+    yield "standard_form", standard_form(model)
+    yield "solve", simplex_method(model, simplex_type, max_iteration=max_iteration, warm_start=False)
+
+
+def time_phases(generator, scale, seed, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL):
+    """
+    get the wall time of each phase.
+
+    paras:
+        generator: the model generator,
+        scale: the size parameter of the generator,
+        seed: the random seed,
+        max_iteration: the maximum number of pivots of the solve, if None, there is no limit,
+        simplex_type: the simplex type of the solve.
+
+    returns:
+        time_dict: the seconds of each phase,
+        model: the generated model, solved,
+        result: the result of the solve.
+    """
+    time_dict = dict()
+    phases = run_phases(generator, scale, seed, max_iteration, simplex_type)
+    model = None
+    while True:
+        start = time.perf_counter()
+        try:
+            phase, result = next(phases)
+        except StopIteration:
+            break
+        time_dict[phase] = time.perf_counter() - start
+        if phase == "build":
+            model = result
+    return time_dict, model, result
+
+
+def memory_phases(generator, scale, seed, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL):
+    """
+    get the peak memory allocated in each phase, the phases are slower under the tracing,
+    so they are timed in separated runs.
+
+    paras:
+        generator: the model generator,
+        scale: the size parameter of the generator,
+        seed: the random seed,
+        max_iteration: the maximum number of pivots of the solve, if None, there is no limit,
+        simplex_type: the simplex type of the solve.
+
+    returns:
+        the bytes of the peak memory of each phase, on top of the memory at the start of the phase.
+    """
+    memory_dict = dict()
+    phases = run_phases(generator, scale, seed, max_iteration, simplex_type)
+    tracemalloc.start()
+    try:
+        while True:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            try:
+                phase, _ = next(phases)
+            except StopIteration:
+                break
+            memory_dict[phase] = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return memory_dict
+
+
+def run_case(name, size, seed=0, repeat=3, memory=True, max_iteration=None, simplex_type=const.SIMPLEX_PRIMAL):
+    """
+    benchmark a generator at a size.
+
+    paras:
+        name: the name of the generator,
+        size: the benchmark size, small, medium or large, or an integer size parameter of the generator,
+        seed: the random seed,
+        repeat: the number of timed runs, the fastest time of each phase is kept,
+        memory: if True, the peak memory of each phase is measured in one more run,
+        max_iteration: the maximum number of pivots of the solve, if None, there is no limit,
+        simplex_type: the simplex type of the solve.
+
+    returns:
+        the record of the case, a dict of numbers and strings.
+    """
+    if name not in GENERATOR_DICT:
+        raise ValueError("Generator not valid")
+    generator = GENERATOR_DICT[name]
+    scale = SIZE_DICT[size][name] if size in SIZE_DICT else int(size)
+
+    time_dict = dict()
+    for _ in range(repeat):
+        gc.collect()
+        run_time_dict, model, (objective_value, status, _) = time_phases(generator, scale, seed, max_iteration,
+                                                                         simplex_type)
+        for phase, seconds in run_time_dict.items():
+            time_dict[phase] = min(seconds, time_dict.get(phase, np.inf))
+
+    record = {
+        "generator": name,
+        "size": str(size),
+        "scale": scale,
+        "seed": seed,
+        "simplex_type": simplex_type,
+        "n": len(model.columns),
+        "m": len(model.rows),
+        "nnz": int(model.rows.csr(len(model.columns)).nnz),
+        "status": status,
+        "objective_value": objective_value,
+        "pivot_count": model.solve_stats.pivot_count,
+        "iteration": model.solve_stats.total_iteration(),
+        "time": time_dict
+    }
+    if memory:
+        gc.collect()
+        record["peak_memory"] = memory_phases(generator, scale, seed, max_iteration, simplex_type)
+    return record
+
+
+def environment():
+    """
+    get the description of the code and the machine, so that the results of different commits can be told apart.
+
+    returns:
+        a dict of strings.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def run_suite(names=None, sizes=("small", "medium"), seed=0, repeat=3, memory=True, max_iteration=None,
+              path=None, simplex_type=const.SIMPLEX_PRIMAL):
+    """
+    benchmark the generators at the sizes, the records are written as JSON lines.
+
+    paras:
+        names: the names of the generators, if None, all the generators are run,
+        sizes: the benchmark sizes,
+        seed: the random seed,
+        repeat: the number of timed runs of each case,
+        memory: if True, the peak memory of each phase is measured,
+        max_iteration: the maximum number of pivots of each solve, if None, there is no limit,
+        path: the path of the output file, if None, the records are only returned,
+        simplex_type: the simplex type of each solve.
+
+    returns:
+        the list of records, each one has the environment in it.
+    """
+    names = list(GENERATOR_DICT) if names is None else list(names)
+    env = environment()
+    record_list = list()
+    output = None if path is None else open(path, "w")
+    try:
+        for size in sizes:
+            for name in names:
+                record = run_case(name, size, seed, repeat, memory, max_iteration, simplex_type)
+                record.update(env)
+                record_list.append(record)
+                if output is not None:
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+    finally:
+        if output is not None:
+            output.close()
+    return record_list
+
+
+def read_results(path):
+    """
+    read the records written by run_suite.
+
+    paras:
+        path: the path of the file.
+
+    returns:
+        the list of records.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_results(baseline, current):
+    """
+    compare two benchmark runs case by case.
+
+    paras:
+        baseline: the list of records of the baseline,
+        current: the list of records to compare.
+
+    returns:
+        a list of dicts, each one has the case and the ratio current / baseline of the time
+        and the peak memory of each phase, a ratio above 1 is a regression.
+    """
+    def case(record):
+        return (record["generator"], record["size"], record["seed"],
+                record.get("simplex_type", const.SIMPLEX_PRIMAL))
+
+    baseline_dict = {case(record): record for record in baseline}
+    comparison_list = list()
+    for record in current:
+        key = case(record)
+        if key not in baseline_dict:
+            continue
+        old = baseline_dict[key]
+        comparison = {"generator": key[0], "size": key[1], "seed": key[2], "simplex_type": key[3],
+                      "same_status": old["status"] == record["status"]}
+        if "pivot_count" in old and "pivot_count" in record:
+            comparison["pivot_count"] = record["pivot_count"] / old["pivot_count"] if old["pivot_count"] else None
+        for measure in ("time", "peak_memory"):
+            if measure in old and measure in record:
+                comparison[measure] = {
+                    phase: record[measure][phase] / old[measure][phase] if old[measure][phase] > 0 else None
+                    for phase in PHASE_LIST if phase in old[measure] and phase in record[measure]
+                }
+        comparison_list.append(comparison)
+    return comparison_list
+
+
+def format_records(record_list):
+    """
+    format the records as a text table.
+
+    paras:
+        record_list: the list of records.
+
+    returns:
+        the table string.
+    """
+    line_list = ["{:<22}{:<8}{:>7}{:>7}{:>8}".format("generator", "size", "n", "m", "nnz")
+                 + "".join("{:>15}".format(phase) for phase in PHASE_LIST) + "{:>9}".format("pivots") + "  status"]
+    for record in record_list:
+        line = "{:<22}{:<8}{:>7}{:>7}{:>8}".format(
+            record["generator"], record["size"], record["n"], record["m"], record["nnz"]
+        )
+        for phase in PHASE_LIST:
+            seconds = record["time"].get(phase)
+            line += "{:>15}".format("-" if seconds is None else "{:.4f}s".format(seconds))
+        line += "{:>9}".format(record.get("pivot_count", "-"))
+        line_list.append(line + "  " + record["status"])
+    return "\n".join(line_list)
@@ -49,3 +49,47 @@ const.STATUS_UNSOLVED = "Unsolved"
 const.STATUS_OPTIMAL = "Optimal"
 const.STATUS_NO_SOLUTION = "No feasible solution"
 const.STATUS_UNBOUNDED = "Unbounded"
+const.STATUS_ITERATION_LIMIT = "Iteration limit"
+const.STATUS_NODE_LIMIT = "Node limit"
+const.STATUS_TIME_LIMIT = "Time limit"
+const.STATUS_ROUND_LIMIT = "Round limit"
+const.STATUS_CANCELLED = "Cancelled"
+
+# the type of the simplex method
+const.SIMPLEX_PRIMAL = "Primal"
+const.SIMPLEX_PARTIAL_PRICING = "Partial pricing"
+const.SIMPLEX_DEVEX = "Devex"
+const.SIMPLEX_DUAL_STEEPEST_EDGE = "Dual steepest edge"
+const.SIMPLEX_INTERIOR_POINT = "Interior point"
+
+# the node selection of the branch and bound
+const.NODE_BEST_BOUND = "Best bound"
+const.NODE_DEPTH_FIRST = "Depth first"
+const.BRANCH_AND_BOUND = "Branch and bound"
+
+# the column generation
+const.COLUMN_GENERATION = "Column generation"
+
+# the cutting plane
+const.CUTTING_PLANE = "Cutting plane"
+
+# the result cache
+const.RESULT_CACHE = "Result cache"
+
+# the phases of a solve in the solve statistics
+const.PHASE_PRESOLVE = "Presolve"
+const.PHASE_MATRIX = "Matrix build"
+const.PHASE_STANDARDIZE = "Standardize"
+const.PHASE_ONE = "Phase I"
+const.PHASE_TWO = "Phase II"
+const.PHASE_DUAL = "Dual simplex"
+const.PHASE_INTERIOR_POINT = "Interior point"
+const.PHASE_PRICING = "Pricing"
+const.PHASE_SEPARATION = "Separation"
+const.PHASE_POSTSOLVE = "Postsolve"
+
+# the numerical tolerances
+const.TOL_PIVOT = 1e-9
+const.TOL_PRIMAL = 1e-9
+const.TOL_DUAL = 1e-9
+const.TOL_INTEGER = 1e-6
@@ -0,0 +1,56 @@
+"""
+This file defines the random models shared by the tests.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from constant import const
+
+
+def random_model(seed=0, m=12, n=20, sense=const.SENSE_MAX, low=-4, high=6, integer=True, density=1.0,
+                 lower_bound=0, upper_bound=5.0, center=2.5, row_sense=const.SENSE_LEQ, row_order=None, rhs_shift=0.0,
+                 name="random"):
+    """
+    generate a random dense linear programming, which is feasible and bounded.
+    The point x = center satisfies the less || equal rows and the great || equal rows with a random slack,
+    and the equal rows exactly.
+
+    paras:
+        seed: the random seed,
+        m: the number of rows,
+        n: the number of columns,
+        sense: the sense of the objective,
+        low: the lowest coefficient of the matrix,
+        high: the highest coefficient of the matrix, excluded if integer,
+        integer: if True, the coefficients are integers, or else they are uniform,
+        density: the probability of an entry to be nonzero,
+        lower_bound: the lower bound of the variables, a number or a vector,
+        upper_bound: the upper bound of the variables, a number or a vector,
+        center: the value of every variable at the feasible point,
+        row_sense: the sense of the rows, a sense or a list of senses,
+        row_order: the order to add the rows in, if None, they are added in the generated order,
+        rhs_shift: the number added to every right hand side,
+        name: the name of the model.
+
+    returns:
+        the model.
+    """
+    rng = np.random.default_rng(seed)
+    A = rng.integers(low, high, (m, n)).astype(float) if integer else rng.uniform(low, high, (m, n))
+    if density < 1:
+        A *= rng.random((m, n)) < density
+    row_sense = np.array([row_sense] * m if isinstance(row_sense, str) else row_sense, dtype=object)
+    slack = rng.random(m)
+    rhs = A.dot(np.full(n, center)) + np.where(
+        row_sense == const.SENSE_LEQ, slack, np.where(row_sense == const.SENSE_GEQ, -slack, 0)
+    ) + rhs_shift
+    objective = rng.normal(size=n)
+    if row_order is not None:
+        A, row_sense, rhs = A[row_order], row_sense[row_order], rhs[row_order]
+
+    model = Model(name, sense=sense)
+    model.add_variables_from_arrays(np.broadcast_to(lower_bound, n).astype(float),
+                                    np.broadcast_to(upper_bound, n).astype(float), objective=objective)
+    model.add_constraints_from_matrix(A, list(row_sense), rhs)
+    return model
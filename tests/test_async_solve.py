@@ -0,0 +1,114 @@
+"""
+This file tests the asyncio interface of the solve.
+Last edited by Teast Ares, 20190130.
+"""
+
+import asyncio
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def positive_model(seed=0, m=60, n=80):
+    """
+    get a random feasible and bounded model, max cx, s.t. Ax <= b, 0 <= x <= 5, A >= 0,
+    so the slack basis is feasible and a solve stopped by a limit is past phase I.
+    """
+    return random_model(seed, m, n, low=0, high=6)
+
+
+def cold_objective_value(model):
+    objective_value, status, _ = simplex_method(model.copy("cold"), warm_start=False)
+    assert status == const.STATUS_OPTIMAL
+    return objective_value
+
+
+def cold_iteration(model):
+    cold = model.copy("cold")
+    simplex_method(cold, warm_start=False)
+    return cold.solve_stats.total_iteration()
+
+
+def test_await_result():
+    async def main(model):
+        return await solve_async(model, warm_start=False)
+
+    model = positive_model()
+    objective_value, status = asyncio.run(main(model))
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(cold_objective_value(model))
+    assert model.check_solution()["feasible"]
+
+
+def test_progress_stream():
+    async def main(model):
+        task = solve_async(model, warm_start=False)
+        progress_list = [progress async for progress in task]
+        return progress_list, await task
+
+    model = positive_model(1)
+    progress_list, (objective_value, status) = asyncio.run(main(model))
+    assert status == const.STATUS_OPTIMAL
+    assert len(progress_list) == model.solve_stats.total_iteration() > 0
+    assert [progress["iteration"] for progress in progress_list] == list(range(1, len(progress_list) + 1))
+    assert {"phase", "objective_value", "infeasibility", "seconds"} <= set(progress_list[-1])
+    assert progress_list[-1]["infeasibility"] == pytest.approx(0, abs=1e-7)
+
+
+def test_progress_interval():
+    async def main(model, progress_interval):
+        task = solve_async(model, warm_start=False, progress_interval=progress_interval)
+        return [progress async for progress in task], await task
+
+    progress_list, _ = asyncio.run(main(positive_model(2), 3))
+    assert all(progress["iteration"] % 3 == 0 for progress in progress_list)
+    progress_list, (_, status) = asyncio.run(main(positive_model(2), None))
+    assert progress_list == [] and status == const.STATUS_OPTIMAL
+
+
+@pytest.mark.parametrize("limit", ["time_limit", "iteration_limit"])
+def test_limit_keeps_best_known_solution(limit):
+    async def main(model, **kwargs):
+        return await solve_async(model, warm_start=False, **kwargs)
+
+    model = positive_model(3)
+    objective_value, status = asyncio.run(main(model, **{limit: 0 if limit == "time_limit" else 3}))
+    assert status == (const.STATUS_TIME_LIMIT if limit == "time_limit" else const.STATUS_ITERATION_LIMIT)
+    assert objective_value is not None and objective_value <= cold_objective_value(model) + 1e-7
+    assert objective_value == pytest.approx(model.objective.value())
+    assert model.check_solution()["feasible"]
+
+    # the next solve continues from the kept basis.
+    objective_value, status = asyncio.run(main(model))
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(cold_objective_value(model))
+
+
+def test_cancel():
+    async def main(model):
+        task = solve_async(model, warm_start=False)
+        async for progress in task:
+            task.cancel()
+        return await task
+
+    model = positive_model(4, 150, 200)
+    objective_value, status = asyncio.run(main(model))
+    assert status == const.STATUS_CANCELLED
+    assert model.solve_stats.total_iteration() < cold_iteration(model)
+
+
+def test_invalid_arguments():
+    async def main(model, **kwargs):
+        return solve_async(model, **kwargs)
+
+    model = positive_model()
+    with pytest.raises(ValueError):
+        asyncio.run(main(model, simplex_type="unknown"))
+    with pytest.raises(ValueError):
+        asyncio.run(main(model, time_limit=-1))
+    for progress_interval in [0, -1, 1.5]:
+        with pytest.raises(ValueError):
+            asyncio.run(main(model, progress_interval=progress_interval))
@@ -0,0 +1,45 @@
+"""
+This file tests the batch solving of independent models.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def batch_model(seed):
+    """
+    get a random model, the seeds divisible by 5 give an infeasible one.
+    """
+    model = random_model(seed, 6, 8, low=-3, high=5, upper_bound=4.0, center=2.0, name="random{}".format(seed))
+    model.objective.constant = 1.5
+    if seed % 5 == 0:
+        model.add_constraints_from_matrix(np.ones((1, 8)), const.SENSE_GEQ, 100)
+    return model
+
+
+def test_model_arrays_round_trip():
+    model = batch_model(1)
+    copy = model_from_arrays(model_arrays(model))
+    assert copy.sense == model.sense
+    assert np.array_equal(objective_vector(copy), objective_vector(model))
+    assert np.array_equal(copy.rows.csr(8).toarray(), model.rows.csr(8).toarray())
+    assert simplex_method(copy)[:2] == simplex_method(model)[:2]
+
+
+def test_solve_many_matches_sequential():
+    expected = [simplex_method(batch_model(seed))[:2] for seed in range(8)]
+    for workers in (1, 2):
+        models = [batch_model(seed) for seed in range(8)]
+        summary = solve_many(models, workers=workers)
+        for model, (objective_value, status), (expected_value, expected_status) in zip(models, summary, expected):
+            assert status == expected_status == model.status
+            if status == const.STATUS_OPTIMAL:
+                assert abs(objective_value - expected_value) < 1e-9
+                assert model.check_solution()["feasible"]
+                assert abs(model.check_solution()["objective_value"] - objective_value) < 1e-9
+            else:
+                assert status == const.STATUS_NO_SOLUTION and objective_value is None
@@ -0,0 +1,58 @@
+"""
+This file tests the benchmark generators and runner.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from constant import const
+from algo import *
+from benchmark.generator import *
+from benchmark.runner import *
+from benchmark.__main__ import main
+
+
+@pytest.mark.parametrize("name", list(GENERATOR_DICT))
+def test_generators(name):
+    generator = GENERATOR_DICT[name]
+    model = generator(SIZE_DICT["small"][name], 0)
+    same = generator(SIZE_DICT["small"][name], 0)
+    n = len(model.columns)
+    # a seed gives the same model.
+    assert np.array_equal(model.rows.csr(n).toarray(), same.rows.csr(n).toarray())
+    assert np.array_equal(objective_vector(model), objective_vector(same))
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert model.check_solution()["feasible"]
+
+
+def test_run_case():
+    record = run_case("transportation", "small", repeat=1)
+    assert record["generator"] == "transportation" and record["status"] == const.STATUS_OPTIMAL
+    assert set(record["time"]) == set(PHASE_LIST)
+    assert set(record["peak_memory"]) == set(PHASE_LIST)
+    assert record["m"] > 0 and record["n"] > 0 and record["nnz"] > 0
+    with pytest.raises(ValueError):
+        run_case("unknown", "small")
+
+
+def test_suite_and_compare(tmp_path):
+    path = str(tmp_path / "result.jsonl")
+    record_list = run_suite(["knapsack_relaxation", "set_cover"], ["small"], repeat=1, memory=False, path=path)
+    assert read_results(path) == record_list
+    comparison_list = compare_results(record_list, read_results(path))
+    assert len(comparison_list) == 2
+    for comparison in comparison_list:
+        assert comparison["same_status"]
+        assert all(ratio == 1 for ratio in comparison["time"].values() if ratio is not None)
+    assert "knapsack_relaxation" in format_records(record_list)
+
+
+def test_command_line(tmp_path, capsys):
+    path = str(tmp_path / "result.jsonl")
+    main(["--generators", "assignment", "--sizes", "small", "--repeat", "1", "--no-memory", "--output", path,
+          "--simplex-type", const.SIMPLEX_DEVEX])
+    assert "assignment" in capsys.readouterr().out
+    assert read_results(path)[0]["simplex_type"] == const.SIMPLEX_DEVEX
+    main(["--compare", path, path])
+    assert "same_status" in capsys.readouterr().out
@@ -0,0 +1,73 @@
+"""
+This file tests the native upper bounds of the revised simplex method.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import pytest
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+
+
+def test_no_bound_rows():
+    model = Model("bounded", sense=const.SENSE_MAX)
+    variables = [Variable("x{}".format(j), upper_bound=j + 1) for j in range(4)]
+    for variable in variables:
+        model.add_variable(variable)
+    model.set_objective(quicksum(variables))
+    model.add_constraint(Constraint("c", quicksum(variables), const.SENSE_LEQ, 7))
+    form = standard_form(model)
+    assert form.A.shape[0] == 1
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 7) < 1e-9
+    assert model.check_solution()["feasible"]
+
+
+def test_nonbasic_at_upper_bound():
+    # max x + y, s.t. x + y <= 10, 0 <= x <= 2, 0 <= y <= 3, both variables end at their upper bounds.
+    solver = RevisedSimplex(np.array([1.0, 1.0, 0.0]), sp.csc_matrix([[1.0, 1.0, 1.0]]), np.array([10.0]),
+                            np.array([2.0, 3.0, np.inf]))
+    assert solver.solve() == const.STATUS_OPTIMAL
+    assert np.allclose(solver.solution(), [2, 3, 5])
+
+
+def test_bounded_unbounded_direction():
+    # the bound stops a direction which would be unbounded without it.
+    solver = RevisedSimplex(np.array([1.0, 0.0]), sp.csc_matrix([[1.0, -1.0]]), np.array([0.0]),
+                            np.array([4.0, np.inf]))
+    assert solver.solve() == const.STATUS_OPTIMAL
+    assert np.allclose(solver.solution(), [4, 4])
+
+
+def test_negative_upper_bound():
+    with pytest.raises(ValueError):
+        RevisedSimplex(np.ones(2), sp.csc_matrix([[1.0, 1.0]]), np.array([1.0]), np.array([1.0, -1.0]))
+
+
+def test_crossing_bounds():
+    with pytest.raises(ValueError):
+        bound_range(np.array([0.0, 3.0]), np.array([1.0, 2.0]))
+    assert np.array_equal(bound_range(np.array([0.0, -np.inf]), np.array([1.0, 2.0])), [1, np.inf])
+
+
+def test_random_bounds_match_linprog():
+    rng = np.random.default_rng(5)
+    for _ in range(30):
+        m, n = rng.integers(2, 8), rng.integers(2, 10)
+        A = rng.integers(-4, 5, (m, n)).astype(float)
+        lower_bound = rng.integers(-3, 2, n).astype(float)
+        upper_bound = lower_bound + rng.integers(0, 5, n)
+        b = A.dot((lower_bound + upper_bound) / 2) + rng.random(m)
+        c = rng.normal(size=n)
+        model = Model("random")
+        model.add_variables_from_arrays(lower_bound, upper_bound, objective=c)
+        model.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+        objective_value, status, _ = simplex_method(model)
+        reference = linprog(c, A_ub=A, b_ub=b, bounds=list(zip(lower_bound, upper_bound)))
+        assert reference.status == 0 and status == const.STATUS_OPTIMAL
+        assert abs(objective_value - reference.fun) < 1e-7 * max(1, abs(reference.fun))
+        assert model.check_solution()["feasible"]
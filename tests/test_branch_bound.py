@@ -0,0 +1,147 @@
+"""
+This file tests the branch and bound method against the brute force enumeration.
+Last edited by Teast Ares, 20190130.
+"""
+
+import asyncio
+import itertools
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+def random_integer_model(seed):
+    """
+    get a random pure integer model, max cx, s.t. Ax <= b, with 0 <= x <= 3.
+    """
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 5), rng.integers(2, 5)
+    A = rng.integers(-2, 6, (m, n)).astype(float)
+    b = rng.integers(3, 12, m).astype(float) + 0.5
+    c = rng.integers(-2, 8, n).astype(float)
+    model = Model("integer", sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(upper_bound=np.full(n, 3.0), cat=const.CAT_INTEGER, objective=c)
+    model.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+    return model, A, b, c
+
+
+def brute_force(A, b, c, values=range(4)):
+    """
+    get the best objective value over all the integer points, None if none is feasible.
+    """
+    best = None
+    for point in itertools.product(values, repeat=c.shape[0]):
+        x = np.array(point, dtype=float)
+        if (A.dot(x) <= b + 1e-9).all() and (best is None or c.dot(x) > best):
+            best = c.dot(x)
+    return best
+
+
+@pytest.mark.parametrize("node_selection", [const.NODE_BEST_BOUND, const.NODE_DEPTH_FIRST])
+def test_matches_brute_force(node_selection):
+    for seed in range(40):
+        model, A, b, c = random_integer_model(seed)
+        objective_value, status = branch_and_bound(model, node_selection)
+        best = brute_force(A, b, c)
+        if best is None:
+            assert status == const.STATUS_NO_SOLUTION and objective_value is None
+            continue
+        assert status == const.STATUS_OPTIMAL
+        assert abs(objective_value - best) < 1e-6
+        result = model.check_solution()
+        assert result["feasible"] and abs(result["objective_value"] - best) < 1e-6
+
+
+def test_knapsack():
+    weight = [12, 7, 11, 8, 9]
+    profit = [24, 13, 23, 15, 16]
+    model = Model("knapsack", sense=const.SENSE_MAX)
+    variables = [Variable("x{}".format(j), cat=const.CAT_BINARY) for j in range(5)]
+    model.add_variables(variables)
+    model.set_objective(dot(variables, profit))
+    model.add_constraint(Constraint("weight", dot(variables, weight), const.SENSE_LEQ, 26))
+    objective_value, status = branch_and_bound(model)
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(51)
+    assert np.allclose(model.columns.value.view(), [0, 1, 1, 1, 0])
+
+
+def test_fractional_bounds():
+    model = Model("fractional", sense=const.SENSE_MAX)
+    x = Variable("x", cat=const.CAT_INTEGER, lower_bound=0.5, upper_bound=2.7)
+    y = Variable("y", upper_bound=1.5)
+    model.add_variables([x, y])
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("c", x - y, const.SENSE_LEQ, 1.2))
+    objective_value, status = branch_and_bound(model)
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(3.5)
+    assert model.columns.value[0] == pytest.approx(2)
+
+
+def test_no_integer_in_bounds():
+    model = Model("empty", sense=const.SENSE_MAX)
+    x = Variable("x", cat=const.CAT_INTEGER, lower_bound=0.2, upper_bound=0.8)
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    model.add_constraint(Constraint("c", x + 0, const.SENSE_LEQ, 5))
+    objective_value, status = branch_and_bound(model)
+    assert status == const.STATUS_NO_SOLUTION and objective_value is None
+
+
+def test_mixed_integer():
+    # max x + y, s.t. 2x + 2y <= 7, y - x <= 0.5, x integer, y continuous.
+    model = Model("mixed", sense=const.SENSE_MAX)
+    x = Variable("x", cat=const.CAT_INTEGER)
+    y = Variable("y")
+    model.add_variables([x, y])
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("c1", 2 * x + 2 * y, const.SENSE_LEQ, 7))
+    model.add_constraint(Constraint("c2", y - x, const.SENSE_LEQ, 0.5))
+    objective_value, status = branch_and_bound(model)
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(3.5)
+    assert abs(model.columns.value[0] - round(model.columns.value[0])) < 1e-9
+
+
+def test_node_limit():
+    # the model of seed 1 needs 11 nodes.
+    model, _, _, _ = random_integer_model(1)
+    _, status = branch_and_bound(model, node_limit=2)
+    assert status == const.STATUS_NODE_LIMIT
+    assert model.solve_stats.node_count == 2
+
+
+def test_workers():
+    for seed in range(6):
+        model, A, b, c = random_integer_model(seed)
+        objective_value, status = branch_and_bound(model, workers=2)
+        best = brute_force(A, b, c)
+        if best is None:
+            assert status == const.STATUS_NO_SOLUTION
+        else:
+            assert status == const.STATUS_OPTIMAL and abs(objective_value - best) < 1e-6
+
+
+def test_invalid_node_selection():
+    with pytest.raises(ValueError):
+        branch_and_bound(random_integer_model(0)[0], node_selection="Random")
+
+
+def test_simplex_rejects_integer_model():
+    model = Model("integer", sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(upper_bound=np.full(2, 10.0), cat=const.CAT_INTEGER, objective=np.ones(2))
+    model.add_constraints_from_matrix(np.array([[2.0, 2.0]]), const.SENSE_LEQ, np.array([3.0]))
+
+    async def main(model):
+        return solve_async(model)
+
+    cache = ResultCache()
+    for solve in [simplex_method, cache.solve, lambda model: solve_many([model], workers=1),
+                  lambda model: asyncio.run(main(model))]:
+        with pytest.raises(ValueError):
+            solve(model)
+    assert len(cache) == 0
+    assert branch_and_bound(model) == (1, const.STATUS_OPTIMAL)
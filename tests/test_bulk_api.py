@@ -0,0 +1,76 @@
+"""
+This file tests the bulk array APIs for adding variables and constraints.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+def test_variables_from_arrays():
+    model = Model("bulk")
+    index = model.add_variables_from_arrays(lower_bound=[0, None, 1], upper_bound=[1, 2, None],
+                                            cat=const.CAT_CONTINUOUS, objective=[1, 0, 3])
+    assert np.array_equal(index, [0, 1, 2])
+    assert model.columns.name_list == ["x0", "x1", "x2"]
+    assert np.array_equal(model.columns.lower_bound.view(), [0, -np.inf, 1])
+    assert np.array_equal(objective_vector(model), [1, 0, 3])
+    index = model.add_variables_from_arrays(cat=const.CAT_BINARY, names=["b0", "b1"])
+    assert np.array_equal(index, [3, 4])
+    assert np.array_equal(model.columns.upper_bound.view()[3:], [1, 1])
+
+
+def test_constraints_from_matrix():
+    model = Model("bulk", sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(upper_bound=[4, 4], objective=[1, 2])
+    A = sp.csr_matrix(np.array([[1.0, 1.0], [1.0, 3.0]]))
+    index = model.add_constraints_from_matrix(A, [const.SENSE_LEQ, const.SENSE_LEQ], [4, 6])
+    assert np.array_equal(index, [0, 1])
+    assert model.rows.name_list == ["c0", "c1"]
+    assert np.array_equal(model.rows.csr(2).toarray(), A.toarray())
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 5) < 1e-9
+
+
+def test_matrix_on_variable_subset():
+    model = Model("subset")
+    model.add_variables_from_arrays(upper_bound=np.ones(4))
+    model.add_constraints_from_matrix(np.array([[2.0, 3.0]]), const.SENSE_GEQ, 1, variables=[3, 1], names=["r"])
+    assert np.array_equal(model.rows.csr(4).toarray(), [[0, 3, 0, 2]])
+    x = Variable("y")
+    model.add_constraints_from_matrix(np.array([[1.0]]), const.SENSE_EQ, 0, variables=[x])
+    assert len(model.columns) == 5
+
+
+def test_mismatched_columns():
+    model = Model("mismatch")
+    model.add_variables_from_arrays(upper_bound=np.ones(2))
+    with pytest.raises(ValueError):
+        model.add_constraints_from_matrix(np.ones((1, 3)), const.SENSE_LEQ, 1)
+    with pytest.raises(ValueError):
+        model.add_constraints_from_matrix(np.ones((1, 1)), const.SENSE_LEQ, 1, variables=[2])
+
+
+def test_matches_object_api():
+    rng = np.random.default_rng(1)
+    A = rng.integers(-3, 4, (5, 6)).astype(float)
+    b = np.abs(A).sum(axis=1)
+    c = rng.normal(size=6)
+    bulk = Model("bulk")
+    bulk.add_variables_from_arrays(upper_bound=np.full(6, 3.0), objective=c)
+    bulk.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+    model = Model("objects")
+    variables = [Variable("v{}".format(j), upper_bound=3) for j in range(6)]
+    model.add_variables(variables)
+    model.set_objective(dot(variables, c))
+    for i in range(5):
+        model.add_constraint(Constraint("r{}".format(i), dot(variables, A[i]), const.SENSE_LEQ, b[i]))
+    bulk_value, bulk_status, _ = simplex_method(bulk)
+    object_value, object_status, _ = simplex_method(model)
+    assert bulk_status == object_status == const.STATUS_OPTIMAL
+    assert abs(bulk_value - object_value) < 1e-9
@@ -0,0 +1,54 @@
+"""
+This file tests the vectorized solution check of a model.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from constant import const
+
+
+def check_model():
+    """
+    get the model min x + y + 2, s.t. x + y <= 4, x - y >= -1, x + 2y = 3, 0 <= x <= 3, y integer.
+    """
+    model = Model("check")
+    x = Variable("x", upper_bound=3)
+    y = Variable("y", cat=const.CAT_INTEGER)
+    model.add_variables([x, y])
+    model.set_objective(x + y + 2)
+    model.add_constraint(Constraint("leq", x + y, const.SENSE_LEQ, 4))
+    model.add_constraint(Constraint("geq", x - y, const.SENSE_GEQ, -1))
+    model.add_constraint(Constraint("eq", x + 2 * y, const.SENSE_EQ, 3))
+    return model
+
+
+def test_feasible():
+    result = check_model().check_solution([1, 1])
+    assert result["feasible"]
+    assert result["objective_value"] == 4
+    assert result["max_violation"] == 0 and result["max_violation_constraint"] is None
+    assert result["bound_violation_variable"] is None and result["integer_violation_variable"] is None
+    assert np.array_equal(result["row_violation"], [0, 0, 0])
+
+
+def test_violations():
+    result = check_model().check_solution([3.5, 0.25])
+    assert not result["feasible"]
+    assert np.allclose(result["row_violation"], [0, 0, 1])
+    assert result["max_violation_constraint"] == "eq" and result["max_violation"] == pytest.approx(1)
+    assert result["bound_violation_variable"] == "x" and result["bound_violation"] == pytest.approx(0.5)
+    assert result["integer_violation_variable"] == "y" and result["integer_violation"] == pytest.approx(0.25)
+
+
+def test_tolerance_and_current_values():
+    model = check_model()
+    model.columns.value[:] = [1 + 1e-8, 1]
+    assert model.check_solution()["feasible"]
+    assert not model.check_solution(tolerance=1e-10)["feasible"]
+
+
+def test_wrong_size():
+    with pytest.raises(ValueError):
+        check_model().check_solution([1, 2, 3])
@@ -0,0 +1,64 @@
+"""
+This file tests the copy-on-write clones of a model.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from algo import *
+from constant import const
+from benchmark.generator import *
+
+
+def test_clone_shares_until_changed():
+    model = transportation(6, 0)
+    clone = model.clone("clone")
+    assert clone.rows.rhs.data is model.rows.rhs.data
+    assert clone.columns.upper_bound.data is model.columns.upper_bound.data
+    clone.rows.rhs[0] = 100
+    clone.columns.upper_bound[1] = 2
+    assert clone.rows.rhs.data is not model.rows.rhs.data
+    assert model.rows.rhs[0] != 100 and model.columns.upper_bound[1] == np.inf
+    # the unchanged arrays are still shared.
+    assert clone.rows.coefficient.data is model.rows.coefficient.data
+
+
+def test_clone_edits_are_independent():
+    model = transportation(6, 0)
+    clone = model.clone("clone")
+    clone.add_variables_from_arrays(upper_bound=[1.0], names=["extra"])
+    clone.add_objective_item(clone.get_variable(len(clone.columns) - 1), -1)
+    clone.add_constraints_from_matrix(np.ones((1, 1)), const.SENSE_LEQ, 1, variables=[len(clone.columns) - 1],
+                                      names=["extra_row"])
+    assert len(model.columns) == len(clone.columns) - 1 and "extra" not in model.columns.index_dict
+    assert len(model.rows) == len(clone.rows) - 1 and "extra_row" not in model.rows.index_dict
+    assert np.array_equal(objective_vector(model), objective_vector(clone)[:-1])
+    clone.remove_constraints(["extra_row"])
+    assert len(clone.rows) == len(model.rows)
+
+
+def test_clone_warm_starts_and_matches_copy():
+    model = transportation(8, 1)
+    base_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    for scenario in range(3):
+        clone = model.clone("scenario{}".format(scenario))
+        clone.rows.rhs[scenario] = clone.rows.rhs[scenario] * 1.5
+        objective_value, status, _ = simplex_method(clone)
+        assert clone.solve_stats.warm_start
+        copy = clone.copy("copy")
+        expected_value, expected_status, _ = simplex_method(copy)
+        assert status == expected_status
+        if status == const.STATUS_OPTIMAL:
+            assert abs(objective_value - expected_value) < 1e-8 * max(1, abs(expected_value))
+    # the base model and its cached basis are not changed by the scenarios.
+    objective_value, status, _ = simplex_method(model)
+    assert abs(objective_value - base_value) < 1e-9 and model.solve_stats.pivot_count == 0
+
+
+def test_copy_is_deep():
+    model = transportation(4, 0)
+    copy = model.copy("copy")
+    copy.rows.rhs[0] = -5
+    copy.columns.lower_bound[0] = 1
+    assert model.rows.rhs[0] != -5 and model.columns.lower_bound[0] == 0
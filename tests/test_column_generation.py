@@ -0,0 +1,89 @@
+"""
+This file tests the column generation on the cutting stock problem.
+Last edited by Teast Ares, 20190130.
+"""
+
+import itertools
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+ROLL_WIDTH = 10
+WIDTH_LIST = [3, 4, 5]
+DEMAND_LIST = [30, 20, 10]
+
+
+def all_patterns():
+    """
+    get all the nonzero cutting patterns which fit in a roll.
+    """
+    return [
+        pattern for pattern in itertools.product(*[range(ROLL_WIDTH // width + 1) for width in WIDTH_LIST])
+        if 0 < np.dot(pattern, WIDTH_LIST) <= ROLL_WIDTH
+    ]
+
+
+def cutting_stock_master(pattern_list):
+    """
+    get the master, min the number of rolls, s.t. each width is cut at least its demand.
+    """
+    master = Model("cutting stock")
+    variables = [Variable("p{}".format(k)) for k in range(len(pattern_list))]
+    master.add_variables(variables)
+    master.set_objective(quicksum(variables))
+    for i, demand in enumerate(DEMAND_LIST):
+        lhs = dot(variables, [pattern[i] for pattern in pattern_list])
+        master.add_constraint(Constraint("w{}".format(i), lhs, const.SENSE_GEQ, demand))
+    return master
+
+
+def pricing(dual_dict, master):
+    """
+    return the pattern with the most negative reduced cost, 1 - the duals times the pattern.
+    """
+    dual = np.array([dual_dict["w{}".format(i)] for i in range(len(WIDTH_LIST))])
+    pattern = min(all_patterns(), key=lambda pattern: 1 - dual.dot(pattern))
+    if 1 - dual.dot(pattern) > -1e-9:
+        return []
+    variable = Variable("g{}".format(len(master.columns)))
+    return [(variable, 1, {"w{}".format(i): count for i, count in enumerate(pattern) if count})]
+
+
+def test_matches_full_model():
+    initial = [tuple(ROLL_WIDTH // width if j == i else 0 for j, width in enumerate(WIDTH_LIST))
+               for i in range(len(WIDTH_LIST))]
+    master = cutting_stock_master(initial)
+    objective_value, status = column_generation(master, pricing)
+    expected_value, expected_status, _ = simplex_method(cutting_stock_master(all_patterns()))
+    assert status == expected_status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(expected_value)
+    assert len(master.columns) > len(initial)
+    assert master.check_solution()["feasible"]
+    assert master.solve_stats.engine == const.COLUMN_GENERATION
+    assert const.PHASE_PRICING in master.solve_stats.time_dict
+
+
+def test_round_limit_and_history():
+    initial = [(3, 0, 0), (0, 2, 0), (0, 0, 2)]
+    generation = ColumnGeneration(cutting_stock_master(initial), pricing, max_round=1)
+    objective_value, status = generation.solve()
+    assert status == const.STATUS_ROUND_LIMIT
+    assert generation.round == 1 and generation.column_count == 1
+    assert len(generation.history) == 1 and generation.history[0][1] == 1
+    # the new column does not make the master worse.
+    assert objective_value <= generation.history[0][0] + 1e-9
+
+
+def test_no_column():
+    master = cutting_stock_master(all_patterns())
+    objective_value, status = column_generation(master, pricing)
+    assert status == const.STATUS_OPTIMAL
+    assert len(master.columns) == len(all_patterns())
+
+
+def test_invalid_simplex_type():
+    with pytest.raises(ValueError):
+        ColumnGeneration(cutting_stock_master(all_patterns()), pricing, simplex_type=const.SIMPLEX_INTERIOR_POINT)
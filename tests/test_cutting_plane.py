@@ -0,0 +1,86 @@
+"""
+This file tests the cutting plane method with lazy constraints.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+def lazy_problem(seed):
+    """
+    get a box model, max cx, s.t. 0 <= x <= 10, and many lazy constraints Ax <= b.
+    """
+    rng = np.random.default_rng(seed)
+    n = 6
+    A = rng.random((60, n)) + 0.1
+    b = A.dot(np.full(n, 2.0)) + rng.random(60)
+    c = rng.random(n) + 0.5
+    model = Model("lazy", sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(upper_bound=np.full(n, 10.0), objective=c)
+    return model, A, b
+
+
+def separation_of(A, b):
+    """
+    get the separation returning the lazy constraints violated by the solution, the 5 most violated.
+    """
+    def separation(x, model):
+        violation = A.dot(x) - b
+        order = np.argsort(-violation)[:5]
+        variables = [model.get_variable(j) for j in range(A.shape[1])]
+        return [Constraint("lazy{}".format(i), dot(variables, A[i]), const.SENSE_LEQ, b[i])
+                for i in order if violation[i] > 1e-7]
+    return separation
+
+
+@pytest.mark.parametrize("age_limit", [None, 1])
+def test_matches_full_model(age_limit):
+    for seed in range(5):
+        model, A, b = lazy_problem(seed)
+        full = model.copy("full")
+        full.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+        expected_value, _, _ = simplex_method(full)
+        objective_value, status = cutting_plane(model, separation_of(A, b), age_limit=age_limit)
+        assert status == const.STATUS_OPTIMAL
+        assert objective_value == pytest.approx(expected_value)
+        assert (A.dot(model.columns.value.view()) <= b + 1e-7).all()
+        assert len(model.rows) < A.shape[0]
+
+
+def test_cut_removal_and_history():
+    model, A, b = lazy_problem(0)
+    plane = CuttingPlane(model, separation_of(A, b), age_limit=0)
+    plane.solve()
+    assert plane.cut_count == sum(added for _, added, _ in plane.history)
+    assert plane.removed_count == sum(removed for _, _, removed in plane.history)
+    assert len(model.rows) == plane.cut_count - plane.removed_count
+    assert set(plane.age_dict) == set(model.rows.name_list)
+
+
+def test_round_limit():
+    model, A, b = lazy_problem(1)
+    objective_value, status = cutting_plane(model, separation_of(A, b), max_round=1)
+    assert status == const.STATUS_ROUND_LIMIT
+    assert model.solve_stats.engine == const.CUTTING_PLANE
+
+
+def test_cut_with_unknown_variable():
+    model, A, b = lazy_problem(2)
+    plane = CuttingPlane(model, separation_of(A, b))
+    plane.solve_model()
+    known = model.get_variable(0) + 0
+    with pytest.raises(ValueError):
+        plane.add_cuts([Constraint("good", known, const.SENSE_LEQ, 1),
+                        Constraint("bad", known + Variable("unknown"), const.SENSE_LEQ, 1)])
+    assert len(model.rows) == 0 and len(model.columns) == A.shape[1]
+    assert simplex_method(model)[1] == const.STATUS_OPTIMAL
+
+
+def test_invalid_simplex_type():
+    model, A, b = lazy_problem(3)
+    with pytest.raises(ValueError):
+        CuttingPlane(model, separation_of(A, b), simplex_type="unknown")
@@ -0,0 +1,97 @@
+"""
+This file tests the operators of the linear expressions, quicksum and dot.
+Last edited by Teast Ares, 20190130.
+"""
+
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+def variables():
+    return Variable("x"), Variable("y"), Variable("z")
+
+
+def test_arithmetic():
+    x, y, z = variables()
+    expression = 2 * x + y * 3 - z / 2 + 4
+    assert isinstance(expression, LinearExpression)
+    assert expression.get_coefficient(x) == 2
+    assert expression.get_coefficient(y) == 3
+    assert expression.get_coefficient(z) == -0.5
+    assert expression.constant == 4
+    negative = -(x - y) - 1
+    assert negative.get_coefficient(x) == -1 and negative.get_coefficient(y) == 1 and negative.constant == -1
+    assert (5 - x).constant == 5 and (5 - x).get_coefficient(x) == -1
+
+
+def test_in_place():
+    x, y, _ = variables()
+    expression = x + 0
+    copy = expression
+    expression += 2 * y
+    expression -= x
+    expression *= 3
+    assert expression is copy
+    assert expression.get_coefficient(x) == 0 and expression.get_coefficient(y) == 6
+
+
+def test_not_aliased():
+    x, y, _ = variables()
+    expression = x + y
+    total = expression + x
+    assert expression.get_coefficient(x) == 1 and total.get_coefficient(x) == 2
+
+
+def test_comparison_constraints():
+    x, y, _ = variables()
+    constraint = 2 * x + 1 <= y + 5
+    assert isinstance(constraint, Constraint)
+    assert constraint.sense == const.SENSE_LEQ and constraint.rhs == 4
+    assert constraint.lhs.get_coefficient(x) == 2 and constraint.lhs.get_coefficient(y) == -1
+    assert (x >= 1).sense == const.SENSE_GEQ
+    assert (x + y == 3).sense == const.SENSE_EQ
+
+
+def test_constraint_has_no_truth_value():
+    x, y, z = variables()
+    with pytest.raises(TypeError):
+        bool(x == y)
+    # a list is searched by ==, so it raises instead of finding the wrong variable.
+    with pytest.raises(TypeError):
+        x in [y]
+    with pytest.raises(TypeError):
+        [y, x, z].index(x)
+    # the hash is by identity, so the sets and the dicts of variables work.
+    assert x in {y, x} and z not in {x: 1, y: 2}
+
+
+def test_quicksum_and_dot():
+    x, y, z = variables()
+    total = quicksum([x, 2 * y, z + 1, 3])
+    assert [total.get_coefficient(v) for v in (x, y, z)] == [1, 2, 1] and total.constant == 4
+    product = dot([x, y, x], [1, 2, 3])
+    assert product.get_coefficient(x) == 4 and product.get_coefficient(y) == 2
+
+
+def test_non_number_coefficient():
+    x, y, _ = variables()
+    for operation in (lambda: x * y, lambda: y * (x + 1), lambda: (x + 1) * "a", lambda: "a" * (2 * x),
+                      lambda: x / y, lambda: (x + y) / None):
+        with pytest.raises(TypeError):
+            operation()
+
+
+def test_term_constraint_solves():
+    model = Model("terms", sense=const.SENSE_MAX)
+    x, y, _ = variables()
+    model.add_variable(x)
+    model.add_variable(y)
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("c1", 2 * x, const.SENSE_LEQ, 6))
+    model.add_constraint(Constraint("c2", y, const.SENSE_LEQ, 1))
+    model.add_constraint(x + y <= 3.5, name="c3")
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 3.5) < 1e-9
@@ -0,0 +1,93 @@
+"""
+This file tests the primal-dual interior point method and its crossover.
+Last edited by Teast Ares, 20190130.
+"""
+
+import warnings
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+from tests.test_simplex import small_model
+
+
+def random_lp(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(3, 10), rng.integers(4, 14)
+    A = rng.integers(-4, 6, (m, n)).astype(float)
+    upper_bound = np.where(rng.random(n) < 0.5, rng.integers(1, 6, n), np.inf)
+    b = A.dot(np.minimum(upper_bound, 2) / 2) + rng.random(m)
+    c = rng.normal(size=n)
+    model = Model("random")
+    model.add_variables_from_arrays(upper_bound=upper_bound, objective=c)
+    model.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+    return model, A, b, c, upper_bound
+
+
+def test_known_optimum():
+    for solve in (interior_point_method, lambda model: simplex_method(model, const.SIMPLEX_INTERIOR_POINT)[:2]):
+        model = small_model()
+        objective_value, status = solve(model)
+        assert status == const.STATUS_OPTIMAL
+        assert objective_value == pytest.approx(11, rel=1e-7)
+        assert np.allclose(model.columns.value.view(), [3, 1], atol=1e-6)
+
+
+def test_crossover_gives_vertex():
+    model = small_model()
+    objective_value, status, basis = simplex_method(model, const.SIMPLEX_INTERIOR_POINT)
+    assert status == const.STATUS_OPTIMAL
+    assert objective_value == pytest.approx(11, abs=1e-9)
+    assert len(basis) == 3
+    # the crossover basis warm-starts the next simplex solve.
+    model.get_constraint(0).rhs = 3.5
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert objective_value == pytest.approx(10, abs=1e-9)
+
+
+def test_random_match_linprog():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for seed in range(20):
+            model, A, b, c, upper_bound = random_lp(seed)
+            reference = linprog(c, A_ub=A, b_ub=b, bounds=[(0, u if np.isfinite(u) else None) for u in upper_bound])
+            objective_value, status, _ = simplex_method(model, const.SIMPLEX_INTERIOR_POINT)
+            if reference.status == 3:
+                assert status == const.STATUS_UNBOUNDED
+                continue
+            assert reference.status == 0 and status == const.STATUS_OPTIMAL
+            assert objective_value == pytest.approx(reference.fun, rel=1e-7, abs=1e-7)
+            assert model.check_solution()["feasible"]
+
+
+def test_infeasible_and_unbounded_are_not_optimal():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        model = Model("infeasible")
+        x = Variable("x")
+        model.add_variable(x)
+        model.set_objective(x + 0)
+        model.add_constraint(Constraint("low", x + 0, const.SENSE_GEQ, 5))
+        model.add_constraint(Constraint("high", x + 0, const.SENSE_LEQ, 3))
+        objective_value, status = interior_point_method(model)
+        assert status != const.STATUS_OPTIMAL and objective_value is None
+        assert simplex_method(model, const.SIMPLEX_INTERIOR_POINT)[1] == const.STATUS_NO_SOLUTION
+
+        model = Model("unbounded", sense=const.SENSE_MAX)
+        x = Variable("x")
+        y = Variable("y")
+        model.add_variables([x, y])
+        model.set_objective(x + y)
+        model.add_constraint(Constraint("c", x - y, const.SENSE_LEQ, 1))
+        objective_value, status = interior_point_method(model)
+        assert status != const.STATUS_OPTIMAL and objective_value is None
+        assert simplex_method(model, const.SIMPLEX_INTERIOR_POINT)[1] == const.STATUS_UNBOUNDED
+
+
+def test_iteration_callback():
+    iteration_list = list()
+    interior_point_method(small_model(), callback=lambda solver: iteration_list.append(solver.iteration))
+    assert iteration_list == list(range(1, len(iteration_list) + 1))
@@ -0,0 +1,61 @@
+"""
+This file tests the sparse matrix generation of the standard model.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from util import *
+from algo import *
+from constant import const
+
+
+def standard_data(sparse=True):
+    """
+    standardize max x + 2y, s.t. x + y <= 4, 3x - y >= 1, 0 <= x <= 5, and generate its matrices.
+    """
+    model = Model("model", sense=const.SENSE_MAX)
+    x = Variable("x", upper_bound=5)
+    y = Variable("y")
+    model.add_variable(x)
+    model.add_variable(y)
+    model.set_objective(x + 2 * y)
+    model.add_constraint(Constraint("c1", x + y, const.SENSE_LEQ, 4))
+    model.add_constraint(Constraint("c2", 3 * x - y, const.SENSE_GEQ, 1))
+    standard_model = standardize_model(model)
+    variable_index_dict = {name: i for i, name in enumerate(standard_model.columns.name_list)}
+    constrain_index_dict = {name: i for i, name in enumerate(standard_model.rows.name_list)}
+    return standard_model, matrix_generation(standard_model, variable_index_dict, constrain_index_dict, sparse)
+
+
+def test_sparse_csc():
+    standard_model, (c, A, b) = standard_data()
+    assert sp.issparse(A) and A.format == "csc"
+    assert A.shape == (len(standard_model.rows), len(standard_model.columns))
+    assert c.shape == (A.shape[1],) and b.shape == (A.shape[0],)
+    # the explicit zeros are eliminated.
+    assert (A.data != 0).all()
+
+
+def test_dense_matches_sparse():
+    _, (c, A, b) = standard_data()
+    _, (c_dense, A_dense, b_dense) = standard_data(sparse=False)
+    assert isinstance(A_dense, np.ndarray)
+    assert np.array_equal(A.toarray(), A_dense)
+    assert np.array_equal(c, c_dense) and np.array_equal(b, b_dense)
+
+
+def test_rows_match_constraints():
+    standard_model, (c, A, b) = standard_data()
+    dense = A.toarray()
+    for i, name in enumerate(standard_model.rows.name_list):
+        constraint = standard_model.constraint_dict[name]
+        assert b[i] == constraint.rhs
+        for variable_name, coefficient in constraint.lhs.coefficient_dict.items():
+            assert dense[i, standard_model.columns.name_list.index(variable_name)] == coefficient
+
+
+def test_is_solvable():
+    A = sp.csc_matrix(np.array([[1.0, 1.0], [2.0, 2.0]]))
+    assert is_solvable(A, np.array([1.0, 2.0]))
+    assert not is_solvable(A, np.array([1.0, 3.0]))
@@ -0,0 +1,147 @@
+"""
+This file tests the MPS and CPLEX LP readers and writers.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+
+
+def mixed_model():
+    """
+    get a model with all the senses, the bound types, an integer, a binary and an objective constant.
+    """
+    model = Model("mixed", sense=const.SENSE_MAX)
+    x = Variable("x", upper_bound=4)
+    y = Variable("y", lower_bound=None)
+    z = Variable("z", lower_bound=-2, upper_bound=None)
+    w = Variable("w", cat=const.CAT_INTEGER, lower_bound=1, upper_bound=9)
+    b = Variable("b", cat=const.CAT_BINARY)
+    v = Variable("v", lower_bound=None, upper_bound=3)
+    model.add_variables([x, y, z, w, b, v])
+    model.set_objective(3 * x - 2.5 * y + z + w + 4 * b + v + 7)
+    model.add_constraint(Constraint("c1", x + y + z, const.SENSE_LEQ, 10))
+    model.add_constraint(Constraint("c2", x - y + 0.125 * w, const.SENSE_GEQ, -3))
+    model.add_constraint(Constraint("c3", y + z + b + v, const.SENSE_EQ, 2))
+    model.add_constraint(Constraint("c4", z - 1e-3 * w, const.SENSE_LEQ, 5))
+    return model
+
+
+def assert_same_model(model, other):
+    assert other.sense == model.sense
+    assert other.columns.name_list == model.columns.name_list
+    assert other.rows.name_list == model.rows.name_list
+    assert np.array_equal(objective_vector(other), objective_vector(model))
+    assert other.objective.constant == model.objective.constant
+    assert np.array_equal(other.columns.lower_bound.view(), model.columns.lower_bound.view())
+    assert np.array_equal(other.columns.upper_bound.view(), model.columns.upper_bound.view())
+    assert np.array_equal(other.columns.cat.view(), model.columns.cat.view())
+    assert np.array_equal(other.rows.sense.view(), model.rows.sense.view())
+    assert np.array_equal(other.rows.rhs.view(), model.rows.rhs.view())
+    n = len(model.columns)
+    assert np.array_equal(other.rows.csr(n).toarray(), model.rows.csr(n).toarray())
+
+
+@pytest.mark.parametrize("fixed", [False, True])
+@pytest.mark.parametrize("suffix", [".mps", ".mps.gz"])
+def test_mps_round_trip(tmp_path, fixed, suffix):
+    model = mixed_model()
+    path = str(tmp_path / ("model" + suffix))
+    write_mps(model, path, fixed=fixed)
+    assert_same_model(model, read_mps(path, fixed=fixed))
+    if suffix == ".mps":
+        assert_same_model(model, read_mps(path, fixed=fixed, use_mmap=True))
+
+
+@pytest.mark.parametrize("suffix", [".lp", ".lp.gz"])
+def test_lp_round_trip(tmp_path, suffix):
+    model = mixed_model()
+    path = str(tmp_path / ("model" + suffix))
+    write_lp(model, path)
+    assert_same_model(model, read_lp(path))
+
+
+@pytest.mark.parametrize("write, read", [(write_lp, read_lp), (write_mps, read_mps)])
+def test_unused_and_reordered_columns(tmp_path, write, read):
+    model = Model("unused")
+    model.add_variables([Variable("x{}".format(j)) for j in range(4)])
+    x0, x1, x2, x3 = (model.get_variable(j) for j in range(4))
+    # x1 has no entry at all, x3 is only in the objective, before the others.
+    model.set_objective(2 * x3 + x0)
+    model.add_constraint(Constraint("c1", x2 + x0, const.SENSE_GEQ, 1))
+    path = str(tmp_path / "model")
+    write(model, path)
+    assert_same_model(model, read(path))
+
+
+def test_read_mps_sections(tmp_path):
+    path = tmp_path / "ranges.mps"
+    path.write_text("\n".join([
+        "NAME example",
+        "* a comment",
+        "ROWS",
+        " N obj",
+        " L lim",
+        " G low",
+        " E fix",
+        "COLUMNS",
+        "    x obj 1 lim 1",
+        "    x low 1",
+        "    MARKER 'MARKER' 'INTORG'",
+        "    y obj 2 lim 1",
+        "    y fix 1",
+        "    MARKER 'MARKER' 'INTEND'",
+        "RHS",
+        "    rhs lim 4 low 1",
+        "    rhs fix 3",
+        "RANGES",
+        "    rng lim 2",
+        "BOUNDS",
+        " UP bnd x 5",
+        " MI bnd y",
+        " UP bnd y 3",
+        "ENDATA",
+        ""
+    ]))
+    model = read_mps(str(path))
+    assert model.name == "example"
+    # the ranged row lim, 2 <= x + y <= 4, is split into two rows.
+    assert len(model.rows) == 4
+    assert np.array_equal(model.columns.upper_bound.view(), [5, 3])
+    assert model.columns.lower_bound[1] == -np.inf
+    assert model.columns.cat[1] == CAT_LIST.index(const.CAT_INTEGER)
+    objective_value, status = branch_and_bound(model)
+    # y = 3 by fix, then x is at least max(1, 2 - 3) = 1.
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 7) < 1e-9
+
+
+def test_read_lp(tmp_path):
+    path = tmp_path / "model.lp"
+    path.write_text("\n".join([
+        "\\ a comment",
+        "Maximize",
+        " obj: 3 x + 2 y",
+        "Subject To",
+        " c1: x + y <= 4",
+        " c2: x + 3 y <= 6",
+        " c3: x >= -1",
+        "Bounds",
+        " x <= 3",
+        " -inf <= y <= 10",
+        "General",
+        " y",
+        "End",
+        ""
+    ]))
+    model = read_lp(str(path))
+    assert model.sense == const.SENSE_MAX
+    assert model.rows.name_list == ["c1", "c2", "c3"]
+    assert model.columns.upper_bound[0] == 3 and model.columns.lower_bound[1] == -np.inf
+    assert model.columns.cat[1] == CAT_LIST.index(const.CAT_INTEGER)
+    objective_value, status = branch_and_bound(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 11) < 1e-9
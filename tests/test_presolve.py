@@ -0,0 +1,90 @@
+"""
+This file tests the presolve and the postsolve.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+
+
+def reducible_model():
+    """
+    get a model with a fixed variable, a singleton row, a duplicate row, an empty row and a dependent equation,
+    min x + 2y + 3z - w, s.t. x + y + z + w = 6, 2x + 2y + 2z + 2w = 12, y <= 2, x + y <= 5, 2x + 2y <= 10.
+    """
+    model = Model("reducible")
+    x = Variable("x")
+    y = Variable("y")
+    z = Variable("z", lower_bound=1, upper_bound=1)
+    w = Variable("w", upper_bound=3)
+    model.add_variables([x, y, z, w])
+    model.set_objective(x + 2 * y + 3 * z - w)
+    model.add_constraint(Constraint("sum", x + y + z + w, const.SENSE_EQ, 6))
+    model.add_constraint(Constraint("double", 2 * x + 2 * y + 2 * z + 2 * w, const.SENSE_EQ, 12))
+    model.add_constraint(Constraint("single", y + 0, const.SENSE_LEQ, 2))
+    model.add_constraint(Constraint("pair", x + y, const.SENSE_LEQ, 5))
+    model.add_constraint(Constraint("pair_twice", 2 * x + 2 * y, const.SENSE_LEQ, 10))
+    model.add_constraint(Constraint("empty", 0 * x, const.SENSE_LEQ, 1))
+    return model
+
+
+def test_reduces_and_postsolves():
+    model = reducible_model()
+    reduction = presolve(model)
+    assert reduction.status is None
+    assert len(reduction.model.rows) < len(model.rows)
+    assert len(reduction.model.columns) < len(model.columns)
+    objective_value, status, _ = simplex_method(model, presolve=True)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 2) < 1e-9
+    assert model.check_solution()["feasible"]
+    assert abs(model.check_solution()["objective_value"] - objective_value) < 1e-9
+
+
+def test_detects_infeasible():
+    model = Model("infeasible")
+    x = Variable("x", upper_bound=1)
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    model.add_constraint(Constraint("low", 2 * x, const.SENSE_GEQ, 3))
+    objective_value, status, basis = simplex_method(model, presolve=True)
+    assert status == const.STATUS_NO_SOLUTION
+    assert objective_value is None and basis is None
+
+
+def test_inconsistent_equations():
+    model = Model("inconsistent")
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variables([x, y])
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("e1", x + y, const.SENSE_EQ, 1))
+    model.add_constraint(Constraint("e2", 2 * x + 2 * y, const.SENSE_EQ, 3))
+    assert simplex_method(model, presolve=True)[1] == const.STATUS_NO_SOLUTION
+
+
+def test_random_models_match():
+    rng = np.random.default_rng(7)
+    for seed in range(30):
+        m, n = rng.integers(3, 10), rng.integers(3, 12)
+        A = rng.integers(-3, 4, (m, n)).astype(float) * (rng.random((m, n)) < 0.5)
+        # duplicate some rows, so the presolve has something to remove.
+        A = np.vstack((A, 2 * A[:2]))
+        lower_bound = rng.integers(-2, 1, n).astype(float)
+        upper_bound = lower_bound + rng.integers(0, 4, n)
+        b = A.dot(lower_bound) + rng.integers(0, 3, A.shape[0])
+        c = rng.normal(size=n)
+        model = Model("random")
+        model.add_variables_from_arrays(lower_bound, upper_bound, objective=c)
+        model.add_constraints_from_matrix(A, const.SENSE_LEQ, b)
+        objective_value, status, _ = simplex_method(model, presolve=True)
+        reference = linprog(c, A_ub=A, b_ub=b, bounds=list(zip(lower_bound, upper_bound)))
+        if reference.status == 2:
+            assert status == const.STATUS_NO_SOLUTION
+            continue
+        assert status == const.STATUS_OPTIMAL
+        assert abs(objective_value - reference.fun) < 1e-7 * max(1, abs(reference.fun))
+        assert model.check_solution()["feasible"]
@@ -0,0 +1,84 @@
+"""
+This file tests the pricing strategies of the revised simplex method.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+from benchmark.generator import *
+from tests.test_simplex import small_model
+
+
+@pytest.mark.parametrize("pricing", PRICING_LIST)
+def test_random_match_linprog(pricing):
+    rng = np.random.default_rng(11)
+    for _ in range(20):
+        m, n = rng.integers(3, 9), rng.integers(3, 12)
+        A = rng.integers(-4, 6, (m, n)).astype(float)
+        b = A.dot(rng.random(n) * 3) + rng.normal(size=m)
+        c = rng.normal(size=n)
+        senses = rng.choice([const.SENSE_LEQ, const.SENSE_GEQ, const.SENSE_EQ], m, p=[0.5, 0.3, 0.2])
+        model = Model("random")
+        model.add_variables_from_arrays(lower_bound=-1, upper_bound=np.full(n, 4.0), objective=c)
+        model.add_constraints_from_matrix(A, senses, b)
+        objective_value, status, _ = simplex_method(model, pricing)
+        sign = np.where(senses == const.SENSE_GEQ, -1.0, 1.0)
+        inequality = senses != const.SENSE_EQ
+        reference = linprog(c, A_ub=(A * sign[:, None])[inequality], b_ub=(b * sign)[inequality],
+                            A_eq=A[~inequality], b_eq=b[~inequality], bounds=[(-1, 4)] * n)
+        if reference.status == 2:
+            assert status == const.STATUS_NO_SOLUTION
+            continue
+        assert status == const.STATUS_OPTIMAL
+        assert objective_value == pytest.approx(reference.fun, rel=1e-7, abs=1e-7)
+        assert model.check_solution()["feasible"]
+
+
+@pytest.mark.parametrize("pricing", PRICING_LIST)
+def test_statuses(pricing):
+    assert simplex_method(small_model(), pricing)[:2] == (pytest.approx(11), const.STATUS_OPTIMAL)
+    model = Model("unbounded", sense=const.SENSE_MAX)
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variables([x, y])
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("c", x - y, const.SENSE_LEQ, 1))
+    assert simplex_method(model, pricing)[1] == const.STATUS_UNBOUNDED
+    model = Model("infeasible")
+    x = Variable("x")
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    model.add_constraint(Constraint("low", x + 0, const.SENSE_GEQ, 5))
+    model.add_constraint(Constraint("high", x + 0, const.SENSE_LEQ, 3))
+    assert simplex_method(model, pricing)[1] == const.STATUS_NO_SOLUTION
+
+
+def test_compare_pricing():
+    model = set_cover(40, 0)
+    result = compare_pricing(model)
+    assert list(result) == PRICING_LIST
+    value_list = [record["objective_value"] for record in result.values()]
+    assert all(record["status"] == const.STATUS_OPTIMAL for record in result.values())
+    assert max(value_list) - min(value_list) < 1e-7 * max(1, abs(value_list[0]))
+    # the model itself is not solved.
+    assert model.simplex_cache is None
+
+
+def test_warm_start_with_other_pricing():
+    model = random_sparse_lp(40, 0)
+    simplex_method(model, const.SIMPLEX_DEVEX)
+    model.rows.rhs[0] = model.rows.rhs[0] + 1
+    objective_value, status, _ = simplex_method(model, const.SIMPLEX_DUAL_STEEPEST_EDGE)
+    assert model.solve_stats.warm_start
+    expected_value, expected_status, _ = simplex_method(model.copy("cold"))
+    assert status == expected_status
+    assert objective_value == pytest.approx(expected_value, rel=1e-8)
+
+
+def test_invalid_pricing():
+    with pytest.raises(ValueError):
+        simplex_method(small_model(), "Steepest")
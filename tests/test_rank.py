@@ -0,0 +1,94 @@
+"""
+This file tests the rank-revealing row elimination and the equation diagnostics.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import pytest
+import algo.rank
+from util import *
+from algo import *
+from constant import const
+
+
+@pytest.fixture(params=["dense", "sparse"])
+def kernel(request, monkeypatch):
+    """
+    factorize the kernels by the dense QR decomposition or by the sparse elimination.
+    """
+    monkeypatch.setattr(algo.rank, "RANK_DENSE_SIZE", 1 << 30 if request.param == "dense" else 0)
+    return request.param
+
+
+def test_matches_matrix_rank(kernel):
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        m, n = rng.integers(1, 20), rng.integers(1, 20)
+        r = rng.integers(1, min(m, n) + 1)
+        A = (rng.integers(-3, 4, (m, r)) * (rng.random((m, r)) < 0.6)).dot(rng.integers(-3, 4, (r, n))).astype(float)
+        b = A.dot(rng.normal(size=n))
+        if rng.random() < 0.5:
+            b[rng.integers(m)] += 1
+        rank = RowRank(A, b, track=True)
+        expected = np.linalg.matrix_rank(A)
+        assert rank.rank == expected
+        assert len(rank.dependent) == m - expected
+        assert rank.is_consistent() == (np.linalg.matrix_rank(np.column_stack((A, b))) == expected)
+        assert set(rank.inconsistent) <= set(rank.dependent)
+        # each dependent row is cancelled by its recorded combination.
+        for i, combination in rank.combination_dict.items():
+            total = sum(weight * A[r] for r, weight in combination.items())
+            assert np.abs(total).max() < 1e-8
+            assert combination[i] != 0
+
+
+def test_transportation_kernel(kernel):
+    # the supply and demand rows of a transportation model, their sums are equal, so one row is dependent.
+    size = 30
+    column = np.arange(size * size)
+    A = sp.csr_matrix((np.ones(2 * size * size), (np.concatenate((column // size, size + column % size)),
+                                                  np.concatenate((column, column)))),
+                      shape=(2 * size, size * size))
+    rank = RowRank(A, np.full(2 * size, 5.0))
+    assert rank.rank == 2 * size - 1 and rank.is_consistent()
+    b = np.full(2 * size, 5.0)
+    b[0] = 6
+    assert not RowRank(A, b).is_consistent()
+
+
+def test_singletons_only():
+    A = sp.csr_matrix(np.array([[1.0, 0, 0], [0, 2.0, 0], [3.0, 4.0, 0], [0, 0, 0]]))
+    rank = RowRank(A, np.array([1.0, 2.0, 7.0, 0.0]))
+    assert rank.rank == 2
+    assert len(rank.dependent) == 2 and 3 in rank.dependent
+    assert rank.is_consistent()
+
+
+def test_is_solvable():
+    A = np.array([[1.0, 2.0], [2.0, 4.0]])
+    assert is_solvable(A, np.array([1.0, 2.0]))
+    assert not is_solvable(A, np.array([1.0, 3.0]))
+
+
+def test_equation_diagnostics():
+    model = Model("diagnostics")
+    x = Variable("x")
+    y = Variable("y")
+    z = Variable("z")
+    w = Variable("w")
+    model.add_variables([x, y, z, w])
+    model.set_objective(x + y + z + w)
+    model.add_constraint(Constraint("a", x + y, const.SENSE_EQ, 1))
+    model.add_constraint(Constraint("b", y + z, const.SENSE_EQ, 2))
+    model.add_constraint(Constraint("sum", x + 2 * y + z, const.SENSE_EQ, 3))
+    model.add_constraint(Constraint("p", w + 0, const.SENSE_EQ, 1))
+    model.add_constraint(Constraint("q", 2 * w, const.SENSE_EQ, 3))
+    model.add_constraint(Constraint("inequality", x + y, const.SENSE_LEQ, 0))
+    redundant_list, conflict_dict = equation_diagnostics(model)
+    # either row of a dependent set may be the one reported.
+    assert len(redundant_list) == 1 and redundant_list[0] in ("a", "b", "sum")
+    assert len(conflict_dict) == 1 and set(conflict_dict) <= {"p", "q"}
+    weight_dict = next(iter(conflict_dict.values()))
+    assert set(weight_dict) == {"p", "q"}
+    assert weight_dict["p"] == pytest.approx(-2 * weight_dict["q"])
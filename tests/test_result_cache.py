@@ -0,0 +1,130 @@
+"""
+This file tests the model fingerprint and the cache of the solve results.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def test_hit_and_miss():
+    cache = ResultCache()
+    model = random_model()
+    objective_value, status = cache.solve(model)
+    assert status == const.STATUS_OPTIMAL
+    values = model.columns.value.view().copy()
+
+    other = random_model()
+    assert cache.solve(other) == (objective_value, status)
+    assert other.solve_stats.engine == const.RESULT_CACHE
+    assert np.array_equal(other.columns.value.view(), values)
+    counters = cache.counters()
+    assert (counters["hit_count"], counters["miss_count"], counters["entry_count"]) == (1, 1, 1)
+
+
+def test_fingerprint():
+    model = random_model()
+    assert model_fingerprint(model) == model_fingerprint(random_model())
+    # the order of the rows does not change the fingerprint, but the structure is positional.
+    permuted = random_model(row_order=np.arange(12)[::-1])
+    assert model_fingerprint(permuted) == model_fingerprint(model)
+    assert structure_fingerprint(permuted) != structure_fingerprint(model)
+    # the rhs changes the fingerprint, but not the structure.
+    shifted = random_model(rhs_shift=1.0)
+    assert model_fingerprint(shifted) != model_fingerprint(model)
+    assert structure_fingerprint(shifted) == structure_fingerprint(model)
+    # the columns are positional.
+    changed = random_model()
+    changed.get_variable(0).upper_bound = 4
+    assert model_fingerprint(changed) != model_fingerprint(model)
+
+
+def test_permuted_rows_hit():
+    cache = ResultCache()
+    objective_value, _ = cache.solve(random_model())
+    permuted = random_model(row_order=np.random.default_rng(1).permutation(12))
+    assert cache.solve(permuted)[0] == objective_value
+    assert cache.hit_count == 1
+    assert permuted.check_solution()["feasible"]
+    # the basis of other rows is not seeded.
+    assert permuted.simplex_cache is None
+
+
+def test_warm_start_from_same_structure():
+    cache = ResultCache()
+    cache.solve(random_model())
+    model = random_model(rhs_shift=-3.0)
+    objective_value, status = cache.solve(model)
+    assert (cache.miss_count, cache.warm_count) == (2, 1)
+    assert model.solve_stats.warm_start
+    cold_objective_value, cold_status, _ = simplex_method(random_model(rhs_shift=-3.0), warm_start=False)
+    assert status == cold_status
+    assert objective_value == pytest.approx(cold_objective_value)
+
+
+def test_lru_eviction():
+    cache = ResultCache()
+    cache.solve(random_model())
+    size = cache.size
+    cache = ResultCache(max_size=int(size * 2.5))
+    for shift in [0.0, 1.0, 2.0]:
+        cache.solve(random_model(rhs_shift=shift))
+    assert len(cache) == 2 and cache.size <= cache.max_size
+    cache.solve(random_model(rhs_shift=1.0))
+    assert cache.hit_count == 1
+    cache.solve(random_model(rhs_shift=0.0))
+    assert cache.hit_count == 1 and cache.miss_count == 4
+
+
+def test_disk_tier(tmp_path):
+    cache = ResultCache(path=str(tmp_path))
+    objective_value, status = cache.solve(random_model())
+    assert cache.disk_size > 0
+
+    other_cache = ResultCache(path=str(tmp_path))
+    assert other_cache.disk_size == cache.disk_size
+    model = random_model(row_order=np.arange(12)[::-1])
+    assert other_cache.solve(model) == (objective_value, status)
+    assert (other_cache.disk_hit_count, other_cache.miss_count, len(other_cache)) == (1, 0, 1)
+    assert model.check_solution()["feasible"]
+
+    other_cache.clear()
+    assert len(other_cache) == 0 and other_cache.disk_size == 0
+    assert other_cache.get(random_model()) is None
+    assert other_cache.disk_hit_count == 1
+
+
+def test_disk_size_limit(tmp_path):
+    cache = ResultCache(path=str(tmp_path))
+    cache.solve(random_model())
+    cache = ResultCache(max_size=0, path=str(tmp_path), max_disk_size=int(cache.disk_size * 2.5))
+    for shift in [1.0, 2.0, 3.0]:
+        cache.solve(random_model(rhs_shift=shift))
+    assert cache.disk_size <= cache.max_disk_size
+    assert len(cache.disk_files()) == 2
+    assert len(cache) == 0
+
+
+def test_non_final_status_not_cached():
+    cache = ResultCache()
+    model = random_model()
+    objective_value, status = cache.solve(model, max_iteration=1)
+    assert status == const.STATUS_ITERATION_LIMIT
+    assert len(cache) == 0
+    objective_value, status = cache.solve(random_model())
+    assert status == const.STATUS_OPTIMAL and cache.miss_count == 2
+
+
+def test_infeasible_cached():
+    cache = ResultCache()
+    model = random_model()
+    model.add_constraint(Constraint("conflict", model.get_variable(0) + 0, const.SENSE_GEQ, 6))
+    assert cache.solve(model)[1] == const.STATUS_NO_SOLUTION
+    other = random_model()
+    other.add_constraint(Constraint("another", other.get_variable(0) + 0, const.SENSE_GEQ, 6))
+    assert cache.solve(other) == (None, const.STATUS_NO_SOLUTION)
+    assert cache.hit_count == 1
@@ -0,0 +1,92 @@
+"""
+This file tests the sensitivity analysis from the final basis.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def production_model():
+    """
+    get the model max 3x + 2y, s.t. x + y <= 4, x + 3y <= 7, x <= 3, whose optimum (3, 1) is not degenerate.
+    """
+    model = Model("production", sense=const.SENSE_MAX)
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variables([x, y])
+    model.set_objective(3 * x + 2 * y)
+    model.add_constraint(Constraint("c1", x + y, const.SENSE_LEQ, 4))
+    model.add_constraint(Constraint("c2", x + 3 * y, const.SENSE_LEQ, 7))
+    model.add_constraint(Constraint("c3", x + 0, const.SENSE_LEQ, 3))
+    return model
+
+
+def uniform_model(seed):
+    """
+    get a random model with uniform coefficients, whose optimal basis is not degenerate.
+    """
+    return random_model(seed, 6, 9, low=-1, high=3, integer=False, upper_bound=3.0, center=0.5)
+
+
+def test_known_values():
+    model = production_model()
+    simplex_method(model)
+    result = sensitivity_analysis(model)
+    assert result["dual"] == pytest.approx({"c1": 2, "c2": 0, "c3": 1})
+    assert result["reduced_cost"] == pytest.approx({"x": 0, "y": 0})
+    assert result["rhs_range"]["c1"] == pytest.approx((3, 13 / 3))
+    assert result["rhs_range"]["c2"] == pytest.approx((6, np.inf))
+    assert result["rhs_range"]["c3"] == pytest.approx((2.5, 4))
+    assert result["cost_range"]["x"] == pytest.approx((2, np.inf))
+    assert result["cost_range"]["y"] == pytest.approx((0, 3))
+
+
+def test_duals_by_finite_differences():
+    step = 1e-4
+    for seed in range(10):
+        model = uniform_model(seed)
+        base_value, status, _ = simplex_method(model)
+        assert status == const.STATUS_OPTIMAL
+        arrays = sensitivity_arrays(model)
+        for i in range(len(model.rows)):
+            if arrays["rhs_high"][i] - model.rows.rhs[i] < 2 * step:
+                continue
+            copy = model.copy("copy")
+            copy.rows.rhs[i] = copy.rows.rhs[i] + step
+            objective_value, _, _ = simplex_method(copy)
+            assert (objective_value - base_value) / step == pytest.approx(arrays["dual"][i], abs=1e-6)
+
+
+def test_cost_ranges_keep_solution():
+    for seed in range(10):
+        model = uniform_model(seed)
+        simplex_method(model)
+        arrays = sensitivity_arrays(model)
+        x = model.columns.value.view().copy()
+        objective = objective_vector(model)
+        for j in range(len(model.columns)):
+            for bound in (arrays["cost_low"][j], arrays["cost_high"][j]):
+                if not np.isfinite(bound):
+                    continue
+                copy = model.copy("copy")
+                inside = objective[j] + 0.99 * (bound - objective[j])
+                copy.add_objective_item(copy.get_variable(j), inside - objective[j])
+                simplex_method(copy)
+                # the old solution is still optimal inside the range.
+                assert objective_vector(copy).dot(copy.columns.value.view()) == pytest.approx(
+                    objective_vector(copy).dot(x), abs=1e-7)
+
+
+def test_not_optimal_or_changed():
+    model = production_model()
+    with pytest.raises(ValueError):
+        sensitivity_analysis(model)
+    simplex_method(model)
+    model.rows.rhs[0] = 5
+    with pytest.raises(ValueError):
+        sensitivity_analysis(model)
@@ -0,0 +1,113 @@
+"""
+This file tests the two-phase revised simplex method.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+
+
+def small_model(sense=const.SENSE_MAX):
+    """
+    get the model max 3x + 2y, s.t. x + y <= 4, x + 3y <= 6, x <= 3, whose optimum is 11 at (3, 1).
+    """
+    model = Model("small", sense=sense)
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variable(x)
+    model.add_variable(y)
+    model.set_objective(3 * x + 2 * y)
+    model.add_constraint(Constraint("c1", x + y, const.SENSE_LEQ, 4))
+    model.add_constraint(Constraint("c2", x + 3 * y, const.SENSE_LEQ, 6))
+    model.add_constraint(Constraint("c3", x + 0, const.SENSE_LEQ, 3))
+    return model
+
+
+def test_known_optimum():
+    model = small_model()
+    objective_value, status, basis = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert model.status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 11) < 1e-9
+    assert np.allclose(model.columns.value.view(), [3, 1])
+    assert len(basis) == 3
+
+
+def test_minimize_with_equality_and_geq():
+    model = Model("min")
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variable(x)
+    model.add_variable(y)
+    model.set_objective(2 * x + 3 * y)
+    model.add_constraint(Constraint("sum", x + y, const.SENSE_EQ, 10))
+    model.add_constraint(Constraint("low", x + 0, const.SENSE_GEQ, 2))
+    model.add_constraint(Constraint("high", x + 0, const.SENSE_LEQ, 6))
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 24) < 1e-9
+    assert np.allclose(model.columns.value.view(), [6, 4])
+
+
+def test_infeasible():
+    model = Model("infeasible")
+    x = Variable("x")
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    model.add_constraint(Constraint("low", x + 0, const.SENSE_GEQ, 5))
+    model.add_constraint(Constraint("high", x + 0, const.SENSE_LEQ, 3))
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_NO_SOLUTION
+    assert objective_value is None
+
+
+def test_unbounded():
+    model = Model("unbounded", sense=const.SENSE_MAX)
+    x = Variable("x")
+    y = Variable("y")
+    model.add_variable(x)
+    model.add_variable(y)
+    model.set_objective(x + y)
+    model.add_constraint(Constraint("c", x - y, const.SENSE_LEQ, 1))
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_UNBOUNDED
+    assert objective_value is None
+
+
+def test_free_variable():
+    model = Model("free")
+    x = Variable("x", lower_bound=None)
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    model.add_constraint(Constraint("c", x + 0, const.SENSE_GEQ, -7))
+    objective_value, status, _ = simplex_method(model)
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value + 7) < 1e-9
+
+
+def test_simplex_class():
+    objective_value, status, _ = Simplex(small_model()).solve()
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - 11) < 1e-9
+
+
+def test_revised_simplex_matches_linprog():
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        m, n = rng.integers(2, 10), rng.integers(2, 14)
+        A = rng.integers(-5, 6, (m, n)) * (rng.random((m, n)) < 0.7)
+        b = A.dot(rng.random(n) * 5)
+        c = rng.normal(size=n)
+        solver = RevisedSimplex(c, sp.csc_matrix(A.astype(float)), b, np.full(n, 10.0))
+        solver.solve()
+        reference = linprog(-c, A_eq=A, b_eq=b, bounds=[(0, 10)] * n)
+        assert reference.status == 0
+        assert solver.status == const.STATUS_OPTIMAL
+        x = solver.solution()
+        assert abs(c.dot(x) + reference.fun) < 1e-6 * max(1, abs(reference.fun))
+        assert np.abs(A.dot(x) - b).max() < 1e-6
+        assert (x >= -1e-9).all() and (x <= 10 + 1e-9).all()
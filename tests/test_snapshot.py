@@ -0,0 +1,80 @@
+"""
+This file tests the binary model snapshot.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def snapshot_model():
+    """
+    get a sparse random model with all the senses, negative lower bounds and an objective constant.
+    """
+    model = random_model(2, 8, 10, low=-3, high=5, density=0.6, lower_bound=-1, upper_bound=np.arange(1, 11.0),
+                         center=0.5, row_sense=[const.SENSE_LEQ] * 6 + [const.SENSE_GEQ, const.SENSE_EQ],
+                         name="snapshot")
+    model.objective.constant = 2.0
+    return model
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+@pytest.mark.parametrize("with_form", [True, False])
+def test_round_trip(tmp_path, use_mmap, with_form):
+    model = snapshot_model()
+    path = str(tmp_path / "model.snap")
+    save_snapshot(model, path, with_form=with_form)
+    loaded = load_snapshot(path, use_mmap=use_mmap)
+    assert loaded.name == model.name and loaded.sense == model.sense
+    assert loaded.columns.name_list == model.columns.name_list
+    assert loaded.rows.name_list == model.rows.name_list
+    assert np.array_equal(objective_vector(loaded), objective_vector(model))
+    assert loaded.objective.constant == model.objective.constant
+    assert np.array_equal(loaded.rows.csr(10).toarray(), model.rows.csr(10).toarray())
+    assert np.array_equal(loaded.rows.rhs.view(), model.rows.rhs.view())
+    assert (loaded.simplex_cache is not None) == with_form
+    objective_value, status, _ = simplex_method(loaded)
+    expected_value, expected_status, _ = simplex_method(model)
+    assert status == expected_status == const.STATUS_OPTIMAL
+    assert abs(objective_value - expected_value) < 1e-9
+
+
+def test_loaded_model_is_editable(tmp_path):
+    path = str(tmp_path / "model.snap")
+    save_snapshot(snapshot_model(), path)
+    loaded = load_snapshot(path)
+    loaded.get_variable(0).upper_bound = 0.5
+    loaded.add_constraint(Constraint("extra", loaded.get_variable(1) + loaded.get_variable(2), const.SENSE_LEQ, 1))
+    objective_value, status, _ = simplex_method(loaded)
+    assert status == const.STATUS_OPTIMAL
+    assert loaded.check_solution()["feasible"]
+    # the file is not changed by the edits.
+    again = load_snapshot(path)
+    assert again.columns.upper_bound[0] == 1 and len(again.rows) == 8
+
+
+def test_solved_form_is_reused(tmp_path):
+    model = snapshot_model()
+    simplex_method(model)
+    path = str(tmp_path / "model.snap")
+    save_snapshot(model, path)
+    loaded = load_snapshot(path)
+    assert np.array_equal(loaded.simplex_cache.form.A.toarray(), model.simplex_cache.form.A.toarray())
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "model.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+
+def test_name_with_newline(tmp_path):
+    model = snapshot_model()
+    model.add_variables_from_arrays(names=["bad\nname"])
+    with pytest.raises(ValueError):
+        save_snapshot(model, str(tmp_path / "model.snap"))
@@ -0,0 +1,74 @@
+"""
+This file tests the vectorized standard form of a model.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from scipy.optimize import linprog
+from util import *
+from algo import *
+from constant import const
+
+
+def bound_model():
+    """
+    get a model with the four bound types, min x - y + 2z - w, s.t. x + y + z + w >= -3, x - z <= 4.
+    """
+    model = Model("bounds")
+    x = Variable("x", lower_bound=None)
+    y = Variable("y", lower_bound=None, upper_bound=2)
+    z = Variable("z", lower_bound=1)
+    w = Variable("w", lower_bound=-1, upper_bound=5)
+    for variable in (x, y, z, w):
+        model.add_variable(variable)
+    model.set_objective(x - y + 2 * z - w)
+    model.add_constraint(Constraint("c1", x + y + z + w, const.SENSE_GEQ, -3))
+    model.add_constraint(Constraint("c2", x - z, const.SENSE_LEQ, 4))
+    model.add_constraint(Constraint("c3", x + y, const.SENSE_LEQ, 10))
+    return model
+
+
+def test_bound_types():
+    lower_bound = np.array([-np.inf, -np.inf, 1, -1])
+    upper_bound = np.array([np.inf, 2, np.inf, 5])
+    assert list(bound_type_vector(lower_bound, upper_bound)) == [
+        const.BOUND_TWO_OPEN, const.BOUND_LEFT_OPEN, const.BOUND_RIGHT_OPEN, const.BOUND_TWO_CLOSED
+    ]
+
+
+def test_shape():
+    form = standard_form(bound_model())
+    # four structural columns, one negative part of the free variable and three slacks.
+    assert form.A.shape == (3, 8)
+    assert form.c.shape == (8,) and form.b.shape == (3,) and form.upper_bound.shape == (8,)
+    assert form.upper_bound[3] == 6
+    assert (form.upper_bound[[0, 1, 2, 4, 5, 6, 7]] == np.inf).all()
+
+
+def test_recover_feasible_point():
+    model = bound_model()
+    form = standard_form(model)
+    original = np.array([0.5, 1.0, 2.0, 0.0])
+    # the standard point of the original point, the slacks close the inequality rows.
+    x = np.zeros(8)
+    x[0] = 0.5
+    x[1] = 2 - 1.0
+    x[2] = 2 - 1
+    x[3] = 0 + 1
+    A = model.rows.csr(4)
+    x[5] = A[0].dot(original)[0] + 3
+    x[6] = 4 - A[1].dot(original)[0]
+    x[7] = 10 - A[2].dot(original)[0]
+    assert np.abs(form.A.dot(x) - form.b).max() < 1e-12
+    assert np.allclose(form.recover(x), original)
+    assert abs(form.objective_value(x) - (0.5 - 1 + 4)) < 1e-12
+
+
+def test_optimum_matches_linprog():
+    model = bound_model()
+    objective_value, status, _ = simplex_method(model)
+    reference = linprog([1, -1, 2, -1], A_ub=[[-1, -1, -1, -1], [1, 0, -1, 0], [1, 1, 0, 0]], b_ub=[3, 4, 10],
+                        bounds=[(None, None), (None, 2), (1, None), (-1, 5)])
+    assert status == const.STATUS_OPTIMAL
+    assert abs(objective_value - reference.fun) < 1e-9
+    assert model.check_solution()["feasible"]
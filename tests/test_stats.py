@@ -0,0 +1,73 @@
+"""
+This file tests the solve statistics and the iteration callback.
+Last edited by Teast Ares, 20190130.
+"""
+
+from constant import const
+from algo import *
+from benchmark.generator import *
+
+
+def test_phases_recorded():
+    model = transportation(8, 0)
+    objective_value, status, _ = simplex_method(model)
+    stats = model.solve_stats
+    assert stats.status == status == const.STATUS_OPTIMAL
+    assert stats.engine == const.SIMPLEX_PRIMAL and not stats.warm_start
+    for phase in (const.PHASE_MATRIX, const.PHASE_STANDARDIZE, const.PHASE_ONE, const.PHASE_TWO):
+        assert phase in stats.time_dict
+    assert stats.total_time() >= stats.time_dict[const.PHASE_TWO] >= 0
+    assert stats.pivot_count + stats.bound_flip_count >= stats.total_iteration() > 0
+    assert stats.refactor_count >= 1 and stats.factor_nnz >= stats.basis_nnz > 0
+    result = stats.to_dict()
+    assert result["pivot_count"] == stats.pivot_count and result["time_dict"] == stats.time_dict
+    assert const.PHASE_TWO in str(stats)
+
+
+def test_presolve_phases():
+    model = transportation(6, 0)
+    simplex_method(model, presolve=True)
+    assert const.PHASE_PRESOLVE in model.solve_stats.time_dict
+    assert const.PHASE_POSTSOLVE in model.solve_stats.time_dict
+
+
+def test_callback_progress():
+    model = random_sparse_lp(40, 1)
+    progress_list = list()
+    simplex_method(model, callback=lambda solver: progress_list.append(solver.progress()))
+    assert [progress["iteration"] for progress in progress_list] == list(range(1, len(progress_list) + 1))
+    assert len(progress_list) == model.solve_stats.total_iteration()
+    assert {progress["phase"] for progress in progress_list} <= {const.PHASE_ONE, const.PHASE_TWO}
+    last = progress_list[-1]
+    assert last["infeasibility"] < 1e-9
+
+
+def test_iteration_limit_and_interrupt():
+    model = random_sparse_lp(40, 2)
+    objective_value, status, _ = simplex_method(model, max_iteration=3)
+    assert status == const.STATUS_ITERATION_LIMIT and objective_value is None
+    assert model.solve_stats.total_iteration() == 3
+
+    model = random_sparse_lp(40, 2)
+
+    def stop(solver):
+        if solver.iteration == 2:
+            solver.interrupt(const.STATUS_TIME_LIMIT)
+
+    objective_value, status, _ = simplex_method(model, callback=stop)
+    assert status == const.STATUS_TIME_LIMIT and model.solve_stats.status == status
+    assert model.solve_stats.total_iteration() == 2
+
+
+def test_merge():
+    stats = SolveStats(const.SIMPLEX_PRIMAL)
+    stats.add_time(const.PHASE_ONE, 1.0)
+    stats.pivot_count = 2
+    other = SolveStats(const.SIMPLEX_PRIMAL)
+    other.add_time(const.PHASE_ONE, 0.5)
+    other.add_iteration(const.PHASE_TWO, 4)
+    other.pivot_count = 3
+    other.warm_start = True
+    stats.merge(other)
+    assert stats.time_dict[const.PHASE_ONE] == 1.5 and stats.iteration_dict[const.PHASE_TWO] == 4
+    assert stats.pivot_count == 5 and stats.warm_start
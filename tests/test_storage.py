@@ -0,0 +1,88 @@
+"""
+This file tests the columnar storage of the variables and the constraints.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+from util import *
+from constant import const
+
+
+def test_growable_array():
+    array = GrowableArray(float, capacity=2)
+    for i in range(5):
+        array.append(i)
+    array.extend([5, 6])
+    assert len(array) == 7
+    assert np.array_equal(array.view(), np.arange(7))
+    array[0] = 10
+    assert array[0] == 10
+    copy = array.copy()
+    copy[1] = -1
+    assert array[1] == 1
+
+
+def test_column_store():
+    columns = ColumnStore()
+    assert columns.add("x", lower_bound=None, upper_bound=3) == 0
+    assert columns.add("y", cat=const.CAT_INTEGER) == 1
+    # a variable with an existing name is not added again.
+    assert columns.add("x") == 0
+    assert len(columns) == 2
+    assert columns.lower_bound[0] == -np.inf and columns.upper_bound[0] == 3
+    assert columns.upper_bound[1] == np.inf
+    assert columns.cat[1] == cat_code(const.CAT_INTEGER)
+
+
+def test_column_store_arrays():
+    columns = ColumnStore()
+    index = columns.add_arrays(["a", "b", "c"], [const.CAT_CONTINUOUS, const.CAT_BINARY, const.CAT_INTEGER],
+                               np.array([0, 5, 1.0]), np.array([2, 9, np.inf]))
+    assert np.array_equal(index, [0, 1, 2])
+    assert np.array_equal(columns.lower_bound.view(), [0, 0, 1])
+    assert np.array_equal(columns.upper_bound.view(), [2, 1, np.inf])
+
+
+def test_row_store_csr():
+    rows = RowStore()
+    rows.add("r0", const.SENSE_LEQ, 1)
+    rows.add("r1", const.SENSE_EQ, 2)
+    rows.add_items(0, [0, 2, 0], [1.0, 2.0, 3.0])
+    rows.add_items(1, [1], [4.0])
+    A = rows.csr(3)
+    assert np.array_equal(A.toarray(), [[4, 0, 2], [0, 4, 0]])
+    assert A is rows.csr(3)
+    rows.clear(0)
+    assert np.array_equal(rows.csr(3).toarray(), [[0, 0, 0], [0, 4, 0]])
+    # a row with an existing name is cleared and updated.
+    assert rows.add("r1", const.SENSE_GEQ, 7) == 1
+    assert rows.rhs[1] == 7 and rows.csr(3).nnz == 0
+
+
+def test_row_store_remove():
+    rows = RowStore()
+    for i in range(3):
+        rows.add("r{}".format(i), const.SENSE_LEQ, i)
+        rows.add_items(i, [i], [i + 1.0])
+    new_index = rows.remove([1])
+    assert np.array_equal(new_index, [0, -1, 1])
+    assert rows.name_list == ["r0", "r2"] and rows.index_dict == {"r0": 0, "r2": 1}
+    assert np.array_equal(rows.rhs.view(), [0, 2])
+    assert np.array_equal(rows.csr(3).toarray(), [[1, 0, 0], [0, 0, 3]])
+
+
+def test_model_handles():
+    model = Model("model")
+    x = Variable("x", upper_bound=4)
+    model.add_variable(x)
+    model.set_objective(x + 0)
+    constraint = Constraint("c", 2 * x + 0, const.SENSE_LEQ, 6)
+    model.add_constraint(constraint)
+    # the handles read and write the storage.
+    x.upper_bound = 8
+    assert model.columns.upper_bound[0] == 8
+    assert model.get_variable(0).name == "x"
+    constraint.set_rhs(5)
+    assert model.rows.rhs[0] == 5
+    assert constraint.lhs.get_coefficient(x) == 2
+    assert model.constraint_dict["c"].rhs == 5
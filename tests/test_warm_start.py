@@ -0,0 +1,103 @@
+"""
+This file tests the warm-start re-solves from the cached standard form and basis.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import pytest
+from util import *
+from algo import *
+from constant import const
+from tests.generator import random_model
+
+
+def min_model(seed=0, m=12, n=20):
+    """
+    get a random feasible and bounded model, min cx, s.t. Ax <= b, 0 <= x <= 5.
+    """
+    return random_model(seed, m, n, sense=const.SENSE_MIN)
+
+
+def assert_cold_result(model, objective_value, status):
+    """
+    check a warm-start result against the solve of a copy of the model from scratch.
+    """
+    cold_objective_value, cold_status, _ = simplex_method(model.copy("cold"), warm_start=False)
+    assert status == cold_status
+    assert objective_value == pytest.approx(cold_objective_value, rel=1e-8)
+
+
+def test_rhs_change():
+    model = min_model()
+    simplex_method(model)
+    assert model.simplex_cache is not None
+    model.get_constraint(0).rhs = model.rows.rhs[0] - 3
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert_cold_result(model, objective_value, status)
+    assert model.check_solution()["feasible"]
+
+
+def test_objective_and_sense_change():
+    model = min_model(1)
+    simplex_method(model)
+    model.set_objective(dot([model.get_variable(j) for j in range(20)], np.arange(20.0) - 10))
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert_cold_result(model, objective_value, status)
+    model.sense = const.SENSE_MAX
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert_cold_result(model, objective_value, status)
+
+
+def test_bound_change():
+    model = min_model(2)
+    simplex_method(model)
+    for j in range(0, 20, 3):
+        model.get_variable(j).upper_bound = 1
+        model.get_variable(j + 1).lower_bound = 0.5
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert_cold_result(model, objective_value, status)
+    assert model.check_solution()["feasible"]
+
+
+def test_model_without_constraints():
+    model = Model("box", sense=const.SENSE_MAX)
+    model.add_variables_from_arrays(upper_bound=np.full(3, 10.0), objective=np.ones(3))
+    simplex_method(model)
+    model.get_variable(0).upper_bound = 2
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert (status, objective_value) == (const.STATUS_OPTIMAL, 22)
+
+
+def test_warm_start_to_infeasible():
+    model = min_model(3)
+    simplex_method(model)
+    model.add_constraint(Constraint("low", quicksum(model.get_variable(j) for j in range(20)), const.SENSE_GEQ, 0))
+    simplex_method(model)
+    model.get_constraint(len(model.rows) - 1).rhs = 1000
+    objective_value, status, _ = simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert status == const.STATUS_NO_SOLUTION and objective_value is None
+
+
+def test_structure_change_solves_cold():
+    model = min_model(4)
+    simplex_method(model)
+    model.add_constraint(Constraint("extra", model.get_variable(0) + model.get_variable(1), const.SENSE_LEQ, 1))
+    objective_value, status, _ = simplex_method(model)
+    assert not model.solve_stats.warm_start
+    assert_cold_result(model, objective_value, status)
+
+
+def test_fewer_pivots():
+    model = min_model(5, 40, 60)
+    simplex_method(model)
+    cold_pivots = model.solve_stats.pivot_count
+    model.get_constraint(3).rhs = model.rows.rhs[3] - 1
+    simplex_method(model)
+    assert model.solve_stats.warm_start
+    assert model.solve_stats.pivot_count < cold_pivots
@@ -1 +1,3 @@
-from util.model_util import *
\ No newline at end of file
+from util.storage import *
+from util.model_util import *
+from util.model_io import *
\ No newline at end of file
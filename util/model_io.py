@@ -0,0 +1,746 @@
+"""
+This file defines the readers and writers of the MPS and CPLEX LP files.
+Last edited by Teast Ares, 20190130.
+"""
+
+import gzip
+import mmap
+import re
+import numpy as np
+from constant import const
+from util.storage import *
+from util.model_util import *
+
+
+def read_lines(path, use_mmap=False):
+    """
+    iterate the lines of a text file, a file ending with .gz is decompressed on the fly.
+
+    paras:
+        path: the path of the file,
+        use_mmap: if True, an uncompressed file is memory-mapped instead of read through a buffer.
+
+    returns:
+        a generator of lines.
+    """
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "rt") as f:
+            yield from f
+    elif use_mmap:
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file can not be mapped.
+                return
+            with mapped:
+                for line in iter(mapped.readline, b""):
+                    yield line.decode()
+    else:
+        with open(path) as f:
+            yield from f
+
+
+def open_output(path):
+    """
+    open a text file for writing, a file ending with .gz is compressed.
+
+    paras:
+        path: the path of the file.
+
+    returns:
+        the file object.
+    """
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "wt")
+    return open(path, "w")
+
+
+def format_number(value):
+    """
+    format a number with the shortest exact representation.
+
+    paras:
+        value: the number.
+
+    returns:
+        the string.
+    """
+    return repr(float(value)).replace("inf", "Infinity")
+
+
+class ModelBuilder:
+    """
+    collect the variables, rows and items of a model in arrays while a file is streamed,
+    so that no object is created for each item.
+
+    paras:
+        name: the name of the model.
+    """
+    def __init__(self, name="model"):
+        self.name = name
+        self.sense = const.SENSE_MIN
+        self.objective_constant = 0
+
+        self.column_name_list = list()
+        self.column_index_dict = dict()
+        self.lower_bound = GrowableArray(float)
+        self.upper_bound = GrowableArray(float)
+        self.cat = GrowableArray(np.int8)
+        self.objective = GrowableArray(float)
+
+        self.row_name_list = list()
+        self.row_index_dict = dict()
+        self.row_sense = GrowableArray(np.int8)
+        self.rhs = GrowableArray(float)
+
+        self.row = GrowableArray(np.int64)
+        self.column = GrowableArray(np.int64)
+        self.coefficient = GrowableArray(float)
+
+    def get_column(self, name):
+        """
+        get the index of a column, a new column with the default bounds [0, infinite) is added if it does not exist.
+
+        paras:
+            name: the name of the column.
+
+        returns:
+            the index of the column.
+        """
+        index = self.column_index_dict.get(name)
+        if index is None:
+            index = len(self.column_name_list)
+            self.column_name_list.append(name)
+            self.column_index_dict[name] = index
+            self.lower_bound.append(0)
+            self.upper_bound.append(np.inf)
+            self.cat.append(CAT_LIST.index(const.CAT_CONTINUOUS))
+            self.objective.append(0)
+        return index
+
+    def add_row(self, name, sense, rhs=0):
+        """
+        add a row.
+
+        paras:
+            name: the name of the row,
+            sense: equal, less || equal or great || equal,
+            rhs: right hand side, a valid number.
+
+        returns:
+            the index of the row.
+        """
+        if name in self.row_index_dict:
+            raise ValueError("Duplicated row name {0}".format(name))
+        index = len(self.row_name_list)
+        self.row_name_list.append(name)
+        self.row_index_dict[name] = index
+        self.row_sense.append(sense_code(sense))
+        self.rhs.append(rhs)
+        return index
+
+    def add_item(self, row, column, coefficient):
+        """
+        add an item to a row.
+
+        paras:
+            row: the index of the row,
+            column: the index of the column,
+            coefficient: the coefficient.
+        """
+        self.row.append(row)
+        self.column.append(column)
+        self.coefficient.append(coefficient)
+
+    def build(self):
+        """
+        build the model from the collected arrays.
+
+        returns:
+            the model.
+        """
+        model = Model(name=self.name, sense=self.sense)
+        model.add_variables_from_arrays(
+            self.lower_bound.view(), self.upper_bound.view(), np.array(CAT_LIST, dtype=object)[self.cat.view()],
+            names=self.column_name_list, objective=self.objective.view()
+        )
+        model.objective.constant = self.objective_constant
+        model.rows.add_arrays(
+            self.row_name_list, np.array(SENSE_LIST, dtype=object)[self.row_sense.view()], self.rhs.view()
+        )
+        model.rows.add_items(self.row.view(), self.column.view(), self.coefficient.view())
+        return model
+
+
+# the row types and bound types of the MPS file.
+MPS_SENSE_DICT = {"L": const.SENSE_LEQ, "E": const.SENSE_EQ, "G": const.SENSE_GEQ}
+MPS_ROW_TYPE_DICT = {sense: row_type for row_type, sense in MPS_SENSE_DICT.items()}
+MPS_FIXED_FIELD_LIST = [(1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61)]
+
+
+def mps_fields(line, fixed, section):
+    """
+    split a data line of the MPS file into fields.
+
+    paras:
+        line: the line,
+        fixed: if True, the fields are taken by the columns of the fixed MPS format,
+        section: the current section, the empty first field of the fixed format is dropped
+            except in the ROWS and BOUNDS sections.
+
+    returns:
+        the list of fields.
+    """
+    if not fixed or section == "OBJSENSE":
+        return line.split()
+    fields = [line[start:end].strip() for start, end in MPS_FIXED_FIELD_LIST]
+    if section not in ("ROWS", "BOUNDS"):
+        fields = fields[1:]
+    while fields and not fields[-1]:
+        fields.pop()
+    return fields
+
+
+def read_mps(path, fixed=False, use_mmap=False):
+    """
+    read a model from a MPS file line by line, the ranged rows are split into two rows.
+
+    paras:
+        path: the path of the file, a file ending with .gz is decompressed on the fly,
+        fixed: if True, the file is in the fixed MPS format, otherwise in the free MPS format,
+        use_mmap: if True, an uncompressed file is memory-mapped.
+
+    returns:
+        the model.
+    """
+    builder = ModelBuilder()
+    objective_row = None
+    section = None
+    integer = False
+    range_dict = dict()
+
+    for line in read_lines(path, use_mmap):
+        if not line.strip() or line.startswith("*"):
+            continue
+        if not line[0].isspace():
+            words = line.split()
+            section = words[0].upper()
+            if section == "NAME":
+                builder.name = line[4:].strip() if fixed else " ".join(words[1:])
+            elif section == "OBJSENSE" and len(words) > 1:
+                builder.sense = const.SENSE_MAX if words[1].upper().startswith("MAX") else const.SENSE_MIN
+            elif section == "ENDATA":
+                break
+            continue
+
+        fields = mps_fields(line, fixed, section)
+        if section == "OBJSENSE":
+            builder.sense = const.SENSE_MAX if fields[0].upper().startswith("MAX") else const.SENSE_MIN
+        elif section == "ROWS":
+            row_type, name = fields[0].upper(), fields[1]
+            if row_type == "N":
+                if objective_row is None:
+                    objective_row = name
+            else:
+                builder.add_row(name, MPS_SENSE_DICT[row_type])
+        elif section == "COLUMNS":
+            marker_list = [field.strip("'").upper() for field in fields[1:]]
+            if "MARKER" in marker_list:
+                integer = "INTORG" in marker_list
+                continue
+            column = builder.get_column(fields[0])
+            if integer:
+                builder.cat[column] = CAT_LIST.index(const.CAT_INTEGER)
+            for k in range(1, len(fields) - 1, 2):
+                row_name, value = fields[k], float(fields[k + 1])
+                if row_name == objective_row:
+                    builder.objective[column] = value
+                elif row_name in builder.row_index_dict:
+                    builder.add_item(builder.row_index_dict[row_name], column, value)
+        elif section == "RHS":
+            start = len(fields) % 2
+            for k in range(start, len(fields) - 1, 2):
+                row_name, value = fields[k], float(fields[k + 1])
+                if row_name == objective_row:
+                    builder.objective_constant = -value
+                elif row_name in builder.row_index_dict:
+                    builder.rhs[builder.row_index_dict[row_name]] = value
+        elif section == "RANGES":
+            start = len(fields) % 2
+            for k in range(start, len(fields) - 1, 2):
+                range_dict[fields[k]] = float(fields[k + 1])
+        elif section == "BOUNDS":
+            bound_type, column = fields[0].upper(), builder.get_column(fields[2])
+            value = float(fields[3]) if len(fields) > 3 else 0.0
+            if bound_type == "UP":
+                # a negative upper bound with the default lower bound makes the lower bound negative infinite.
+                if value < 0 and builder.lower_bound[column] == 0:
+                    builder.lower_bound[column] = -np.inf
+                builder.upper_bound[column] = value
+            elif bound_type == "LO":
+                builder.lower_bound[column] = value
+            elif bound_type == "FX":
+                builder.lower_bound[column] = builder.upper_bound[column] = value
+            elif bound_type == "FR":
+                builder.lower_bound[column], builder.upper_bound[column] = -np.inf, np.inf
+            elif bound_type == "MI":
+                builder.lower_bound[column] = -np.inf
+            elif bound_type == "PL":
+                builder.upper_bound[column] = np.inf
+            elif bound_type == "BV":
+                builder.cat[column] = CAT_LIST.index(const.CAT_INTEGER)
+                builder.lower_bound[column], builder.upper_bound[column] = 0, 1
+            elif bound_type in ("LI", "UI"):
+                builder.cat[column] = CAT_LIST.index(const.CAT_INTEGER)
+                if bound_type == "LI":
+                    builder.lower_bound[column] = value
+                else:
+                    builder.upper_bound[column] = value
+            else:
+                raise ValueError("Bound type {0} is not supported".format(bound_type))
+
+    for row_name, value in range_dict.items():
+        split_range_row(builder, row_name, value)
+    return builder.build()
+
+
+def split_range_row(builder, row_name, value):
+    """
+    turn a ranged row of the MPS file into two rows, the original row keeps one side of the range,
+    and a new row named row_name + "_range" takes the other side.
+
+    paras:
+        builder: the model builder,
+        row_name: the name of the ranged row,
+        value: the range value.
+    """
+    index = builder.row_index_dict[row_name]
+    sense = SENSE_LIST[builder.row_sense[index]]
+    rhs = builder.rhs[index]
+    if sense == const.SENSE_LEQ or (sense == const.SENSE_EQ and value < 0):
+        lower, upper = rhs - abs(value), rhs
+    else:
+        lower, upper = rhs, rhs + abs(value)
+
+    builder.row_sense[index] = sense_code(const.SENSE_GEQ)
+    builder.rhs[index] = lower
+    new_index = builder.add_row(row_name + "_range", const.SENSE_LEQ, upper)
+    mask = builder.row.view() == index
+    columns, coefficients = builder.column.view()[mask], builder.coefficient.view()[mask]
+    for column, coefficient in zip(columns, coefficients):
+        builder.add_item(new_index, column, coefficient)
+
+
+def fixed_number(value):
+    """
+    format a number into the 12 characters of a fixed MPS field.
+
+    paras:
+        value: the number.
+
+    returns:
+        the string.
+    """
+    for precision in range(12, 0, -1):
+        text = "{0:.{1}g}".format(value, precision)
+        if len(text) <= 12:
+            return text
+    raise ValueError("Number {0} does not fit the fixed MPS format".format(value))
+
+
+def mps_line(fields, fixed):
+    """
+    join the fields of a data line of the MPS file.
+
+    paras:
+        fields: the list of fields,
+        fixed: if True, the fields are placed at the columns of the fixed MPS format.
+
+    returns:
+        the line.
+    """
+    if not fixed:
+        return " " + " ".join(fields) + "\n"
+    line = ""
+    for field, (start, end) in zip(fields, MPS_FIXED_FIELD_LIST):
+        if len(field) > end - start:
+            raise ValueError("Field {0} does not fit the fixed MPS format".format(field))
+        line = line.ljust(start) + field
+    return line + "\n"
+
+
+def write_mps(model, path, fixed=False):
+    """
+    write a model into a MPS file, the columns are streamed from the array storage.
+
+    paras:
+        model: the model,
+        path: the path of the file, a file ending with .gz is compressed,
+        fixed: if True, the file is in the fixed MPS format, otherwise in the free MPS format.
+    """
+    number = fixed_number if fixed else format_number
+    n = len(model.columns)
+    A = model.rows.csr(n).tocsc()
+    objective = objective_vector(model)
+    row_name_list = model.rows.name_list
+    column_name_list = model.columns.name_list
+    sense = model.rows.sense.view()
+    integer = model.columns.cat.view() == CAT_LIST.index(const.CAT_INTEGER)
+
+    with open_output(path) as f:
+        f.write("NAME          {0}\n".format(model.name) if fixed else "NAME {0}\n".format(model.name))
+        if model.sense == const.SENSE_MAX:
+            f.write("OBJSENSE\n    MAX\n")
+        f.write("ROWS\n")
+        f.write(mps_line(["N", "obj"], fixed))
+        for index, name in enumerate(row_name_list):
+            f.write(mps_line([MPS_ROW_TYPE_DICT[SENSE_LIST[sense[index]]], name], fixed))
+
+        f.write("COLUMNS\n")
+        in_integer = False
+        for j, name in enumerate(column_name_list):
+            if integer[j] != in_integer:
+                in_integer = integer[j]
+                marker = "'INTORG'" if in_integer else "'INTEND'"
+                f.write(mps_line(["", "MARKER", "'MARKER'", "", marker], fixed))
+            items = [("obj", objective[j])] if objective[j] != 0 else []
+            start, end = A.indptr[j], A.indptr[j + 1]
+            items.extend(zip((row_name_list[i] for i in A.indices[start:end]), A.data[start:end]))
+            if not items:
+                items = [("obj", 0.0)]
+            for row_name, value in items:
+                f.write(mps_line(["", name, row_name, number(value)], fixed))
+        if in_integer:
+            f.write(mps_line(["", "MARKER", "'MARKER'", "", "'INTEND'"], fixed))
+
+        f.write("RHS\n")
+        if model.objective.constant != 0:
+            f.write(mps_line(["", "RHS", "obj", number(-model.objective.constant)], fixed))
+        rhs = model.rows.rhs.view()
+        for index in np.flatnonzero(rhs):
+            f.write(mps_line(["", "RHS", row_name_list[index], number(rhs[index])], fixed))
+
+        f.write("BOUNDS\n")
+        lower_bound = model.columns.lower_bound.view()
+        upper_bound = model.columns.upper_bound.view()
+        for j, name in enumerate(column_name_list):
+            lower, upper = lower_bound[j], upper_bound[j]
+            if lower == upper:
+                f.write(mps_line(["FX", "BND", name, number(lower)], fixed))
+                continue
+            if lower == -np.inf and upper == np.inf:
+                f.write(mps_line(["FR", "BND", name], fixed))
+                continue
+            if lower == -np.inf:
+                f.write(mps_line(["MI", "BND", name], fixed))
+            elif lower != 0:
+                f.write(mps_line(["LO", "BND", name, number(lower)], fixed))
+            if upper != np.inf:
+                f.write(mps_line(["UP", "BND", name, number(upper)], fixed))
+        f.write("ENDATA\n")
+
+
+# the keywords of the CPLEX LP file.
+LP_SECTION_DICT = {
+    "maximize": "max", "maximise": "max", "maximum": "max", "max": "max",
+    "minimize": "min", "minimise": "min", "minimum": "min", "min": "min",
+    "subject to": "st", "such that": "st", "st": "st", "s.t.": "st", "st.": "st",
+    "bounds": "bounds", "bound": "bounds",
+    "general": "general", "generals": "general", "gen": "general",
+    "integer": "general", "integers": "general",
+    "binary": "binary", "binaries": "binary", "bin": "binary",
+    "end": "end"
+}
+LP_TOKEN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<operator><=|>=|=<|=>|<|>|=|\+|-|:)"
+    r"|(?P<name>[^\s<>=+\-:]+))"
+)
+LP_SENSE_DICT = {
+    "<=": const.SENSE_LEQ, "=<": const.SENSE_LEQ, "<": const.SENSE_LEQ,
+    ">=": const.SENSE_GEQ, "=>": const.SENSE_GEQ, ">": const.SENSE_GEQ,
+    "=": const.SENSE_EQ
+}
+
+
+def lp_tokens(text):
+    """
+    split a piece of the CPLEX LP file into tokens.
+
+    paras:
+        text: the text.
+
+    returns:
+        the list of (kind, token), kind is "number", "operator" or "name".
+    """
+    token_list = list()
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = LP_TOKEN.match(text, position)
+        if match is None:
+            raise ValueError("Invalid LP syntax: {0}".format(text[position:]))
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == "name" and token.lower() in ("inf", "infinity"):
+            kind, token = "number", "inf"
+        token_list.append((kind, token))
+        position = match.end()
+    return token_list
+
+
+def parse_linear(token_list):
+    """
+    parse a linear expression made of [sign] [number] [name] terms.
+
+    paras:
+        token_list: the list of (kind, token).
+
+    returns:
+        the list of (name, coefficient) and the constant.
+    """
+    term_list = list()
+    constant = 0.0
+    sign, coefficient = 1.0, None
+    for kind, token in token_list:
+        if kind == "operator" and token in "+-":
+            if coefficient is not None:
+                constant += sign * coefficient
+                sign, coefficient = 1.0, None
+            if token == "-":
+                sign = -sign
+        elif kind == "number" and coefficient is None:
+            coefficient = float(token)
+        elif kind == "name":
+            term_list.append((token, sign * (1.0 if coefficient is None else coefficient)))
+            sign, coefficient = 1.0, None
+        else:
+            raise ValueError("Invalid LP syntax: {0}".format(token))
+    if coefficient is not None:
+        constant += sign * coefficient
+    return term_list, constant
+
+
+def lp_statements(lines):
+    """
+    group the lines of the CPLEX LP file into sections and statements, the objective ends at the next section,
+    a constraint ends at the right hand side after a sense operator, and the other statements are single lines.
+
+    paras:
+        lines: the iteration of lines.
+
+    returns:
+        a generator of (section, token_list).
+    """
+    section = None
+    token_list = list()
+    for line in lines:
+        line = line.split("\\", 1)[0]
+        key = " ".join(line.split()).lower()
+        if key in LP_SECTION_DICT:
+            if token_list:
+                yield section, token_list
+                token_list = list()
+            section = LP_SECTION_DICT[key]
+            if section == "end":
+                return
+            continue
+
+        new_tokens = lp_tokens(line)
+        if section in ("max", "min"):
+            token_list.extend(new_tokens)
+        elif section == "st":
+            for item in new_tokens:
+                token_list.append(item)
+                if complete_constraint(token_list):
+                    yield section, token_list
+                    token_list = list()
+        elif new_tokens:
+            yield section, new_tokens
+    if token_list:
+        yield section, token_list
+
+
+def complete_constraint(token_list):
+    """
+    check if the tokens make a complete constraint, i.e. a sense operator followed by a signed number.
+
+    paras:
+        token_list: the list of (kind, token).
+
+    returns:
+        True\\False
+    """
+    for k in range(len(token_list) - 1, -1, -1):
+        if token_list[k][1] in LP_SENSE_DICT:
+            rest = token_list[k + 1:]
+            return len(rest) >= 1 and rest[-1][0] == "number" and all(
+                kind == "number" or token in "+-" for kind, token in rest
+            )
+    return False
+
+
+def read_lp(path, use_mmap=False):
+    """
+    read a model from a CPLEX LP file line by line.
+
+    paras:
+        path: the path of the file, a file ending with .gz is decompressed on the fly,
+        use_mmap: if True, an uncompressed file is memory-mapped.
+
+    returns:
+        the model.
+    """
+    builder = ModelBuilder()
+    for section, token_list in lp_statements(read_lines(path, use_mmap)):
+        if section in ("max", "min"):
+            builder.sense = const.SENSE_MAX if section == "max" else const.SENSE_MIN
+            if len(token_list) > 1 and token_list[1][1] == ":":
+                token_list = token_list[2:]
+            term_list, constant = parse_linear(token_list)
+            for name, coefficient in term_list:
+                builder.objective[builder.get_column(name)] += coefficient
+            builder.objective_constant += constant
+        elif section == "st":
+            name = "R" + str(len(builder.row_name_list) + 1)
+            while name in builder.row_index_dict:
+                name += "_"
+            if len(token_list) > 1 and token_list[1][1] == ":":
+                name = token_list[0][1]
+                token_list = token_list[2:]
+            k = next(k for k, (_, token) in enumerate(token_list) if token in LP_SENSE_DICT)
+            term_list, constant = parse_linear(token_list[:k])
+            _, rhs = parse_linear(token_list[k + 1:])
+            row = builder.add_row(name, LP_SENSE_DICT[token_list[k][1]], rhs - constant)
+            for variable_name, coefficient in term_list:
+                builder.add_item(row, builder.get_column(variable_name), coefficient)
+        elif section == "bounds":
+            read_lp_bound(builder, token_list)
+        elif section in ("general", "binary"):
+            for kind, token in token_list:
+                column = builder.get_column(token)
+                builder.cat[column] = CAT_LIST.index(const.CAT_INTEGER)
+                if section == "binary":
+                    builder.lower_bound[column], builder.upper_bound[column] = 0, 1
+    return builder.build()
+
+
+def read_lp_bound(builder, token_list):
+    """
+    read a bound statement of the CPLEX LP file.
+
+    paras:
+        builder: the model builder,
+        token_list: the list of (kind, token).
+    """
+    if len(token_list) == 2 and token_list[1][1].lower() == "free":
+        column = builder.get_column(token_list[0][1])
+        builder.lower_bound[column], builder.upper_bound[column] = -np.inf, np.inf
+        return
+
+    # split into the numbers and the operators around the only name.
+    position = [k for k, (kind, _) in enumerate(token_list) if kind == "name"]
+    if len(position) != 1:
+        raise ValueError("Invalid LP bound: {0}".format(" ".join(token for _, token in token_list)))
+    k = position[0]
+    column = builder.get_column(token_list[k][1])
+
+    def bound_value(tokens):
+        _, value = parse_linear(tokens)
+        return value
+
+    left, right = token_list[:k], token_list[k + 1:]
+    if left:
+        sense = LP_SENSE_DICT[left[-1][1]]
+        value = bound_value(left[:-1])
+        # value <= x is a lower bound, value >= x is an upper bound.
+        if sense in (const.SENSE_LEQ, const.SENSE_EQ):
+            builder.lower_bound[column] = value
+        if sense in (const.SENSE_GEQ, const.SENSE_EQ):
+            builder.upper_bound[column] = value
+    if right:
+        sense = LP_SENSE_DICT[right[0][1]]
+        value = bound_value(right[1:])
+        if sense in (const.SENSE_LEQ, const.SENSE_EQ):
+            builder.upper_bound[column] = value
+        if sense in (const.SENSE_GEQ, const.SENSE_EQ):
+            builder.lower_bound[column] = value
+
+
+def lp_terms(names, coefficients, line_size=8):
+    """
+    format the terms of a linear expression for the CPLEX LP file, wrapping long expressions.
+
+    paras:
+        names: the names of the variables,
+        coefficients: the coefficients,
+        line_size: the number of terms in each line.
+
+    returns:
+        the text.
+    """
+    part_list = list()
+    for k, (name, coefficient) in enumerate(zip(names, coefficients)):
+        if k > 0 and k % line_size == 0:
+            part_list.append("\n   ")
+        sign = "-" if coefficient < 0 else "+"
+        part_list.append(" {0} {1} {2}".format(sign, format_number(abs(coefficient)), name))
+    return "".join(part_list)
+
+
+def write_lp(model, path):
+    """
+    write a model into a CPLEX LP file, the rows are streamed from the array storage.
+
+    paras:
+        model: the model,
+        path: the path of the file, a file ending with .gz is compressed.
+    """
+    n = len(model.columns)
+    A = model.rows.csr(n)
+    column_name_list = model.columns.name_list
+    objective = objective_vector(model)
+    sense = model.rows.sense.view()
+    rhs = model.rows.rhs.view()
+    lp_sense_list = ["<=", "=", ">="]
+
+    with open_output(path) as f:
+        f.write("\\ {0}\n".format(model.name))
+        f.write("Maximize\n" if model.sense == const.SENSE_MAX else "Minimize\n")
+        # every column is written in the objective, with the zero coefficients, so a column without entries
+        # is kept, and the reader creates the columns in the order of the model.
+        f.write(" obj:" + lp_terms(column_name_list, objective))
+        if model.objective.constant != 0:
+            f.write(" {0} {1}".format("-" if model.objective.constant < 0 else "+",
+                                      format_number(abs(model.objective.constant))))
+        f.write("\nSubject To\n")
+        for index, name in enumerate(model.rows.name_list):
+            start, end = A.indptr[index], A.indptr[index + 1]
+            terms = lp_terms((column_name_list[j] for j in A.indices[start:end]), A.data[start:end])
+            if not terms:
+                terms = " 0 " + column_name_list[0] if n > 0 else ""
+            f.write(" {0}:{1} {2} {3}\n".format(name, terms, lp_sense_list[sense[index]], format_number(rhs[index])))
+
+        f.write("Bounds\n")
+        lower_bound = model.columns.lower_bound.view()
+        upper_bound = model.columns.upper_bound.view()
+        for j, name in enumerate(column_name_list):
+            lower, upper = lower_bound[j], upper_bound[j]
+            if lower == 0 and upper == np.inf:
+                continue
+            if lower == -np.inf and upper == np.inf:
+                f.write(" {0} free\n".format(name))
+            elif lower == upper:
+                f.write(" {0} = {1}\n".format(name, format_number(lower)))
+            else:
+                f.write(" {0} <= {1} <= {2}\n".format(
+                    "-inf" if lower == -np.inf else format_number(lower), name,
+                    "+inf" if upper == np.inf else format_number(upper)
+                ))
+
+        integer = np.flatnonzero(model.columns.cat.view() == CAT_LIST.index(const.CAT_INTEGER))
+        if integer.shape[0] > 0:
+            f.write("Generals\n")
+            for k in range(0, integer.shape[0], 8):
+                f.write(" " + " ".join(column_name_list[j] for j in integer[k:k + 8]) + "\n")
+        f.write("End\n")
@@ -3,8 +3,13 @@ This file defines the utilities.
 Last edited by Teast Ares, 20190130.
 """
 
+import numbers
 from collections import defaultdict
+from collections.abc import Mapping
 from constant import const
+from util.storage import *
+import numpy as np
+import scipy.sparse as sp
 import string
 import random
 
@@ -20,9 +25,98 @@ def random_string(size=16, chars=string.ascii_lowercase + string.digits):
     return ''.join(random.choice(chars) for _ in range(size))
 
 
-class Variable:
+def check_coefficient(coefficient):
+    """
+    check that a coefficient multiplying a variable or an expression is a real number,
+    so that a product of two variables is rejected instead of building a nonlinear term.
+
+    paras:
+        coefficient: the coefficient.
+    """
+    if not isinstance(coefficient, numbers.Real):
+        raise TypeError("Coefficient must be a real number, not {}".format(type(coefficient).__name__))
+
+
+class ExpressionArithmetic:
+    """
+    the arithmetic and comparison operators shared by variables, terms and linear expressions,
+    the operands are converted to a new linear expression by to_expression,
+    and the comparison operators produce constraints, which have no truth value,
+    so the variables are compared by is, and kept in sets or dicts rather than searched in lists.
+    """
+    __slots__ = ()
+
+    def to_expression(self):
+        raise NotImplementedError
+
+    def __add__(self, other):
+        result = self.to_expression()
+        result.add(other)
+        return result
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        result = self.to_expression()
+        result.add(other, -1)
+        return result
+
+    def __rsub__(self, other):
+        result = self.to_expression()
+        result.oppose()
+        result.add(other)
+        return result
+
+    def __mul__(self, coefficient):
+        result = self.to_expression()
+        result.scale(coefficient)
+        return result
+
+    def __rmul__(self, coefficient):
+        return self.__mul__(coefficient)
+
+    def __truediv__(self, divisor):
+        check_coefficient(divisor)
+        return self.__mul__(1 / divisor)
+
+    def __neg__(self):
+        return self.__mul__(-1)
+
+    def compare(self, other, sense):
+        """
+        build a constraint by moving all the variables to the left hand side
+        and the constant to the right hand side.
+
+        paras:
+            other: the right hand side, a number, variable, term or linear expression,
+            sense: equal, less || equal or great || equal.
+
+        returns:
+            the constraint.
+        """
+        lhs = self.to_expression()
+        lhs.add(other, -1)
+        rhs = -lhs.constant
+        lhs.constant = 0
+        return Constraint(lhs=lhs, sense=sense, rhs=rhs)
+
+    def __le__(self, other):
+        return self.compare(other, const.SENSE_LEQ)
+
+    def __ge__(self, other):
+        return self.compare(other, const.SENSE_GEQ)
+
+    def __eq__(self, other):
+        return self.compare(other, const.SENSE_EQ)
+
+    __hash__ = object.__hash__
+
+
+class Variable(ExpressionArithmetic):
     """
     the decision variable for a mathematical model.
+    Once the variable is added to a model, it becomes a handle over the model's column storage.
 
     paras:
         name: the name of the variable, this is the identical flag for a variable
@@ -30,23 +124,121 @@ class Variable:
         upper_bound: the upper bound of the variable, if None, the upper bound is infinite
         lower_bound: the lower bound of the variable, if None, the lower bound is negative infinite.
     """
+    __slots__ = ("name", "columns", "index", "_cat", "_upper_bound", "_lower_bound", "_value")
 
     def __init__(self, name, cat=const.CAT_CONTINUOUS, upper_bound=None, lower_bound=0, value=0):
         self.name = name
+        self.columns = None
+        self.index = None
 
-        self.cat = cat
-        self.upper_bound = upper_bound
-        self.lower_bound = lower_bound
-        self.value = value
+        self._cat = cat
+        self._upper_bound = upper_bound
+        self._lower_bound = lower_bound
+        self._value = value
 
         if cat == const.CAT_BINARY:
-            self.cat = const.CAT_INTEGER
-            self.upper_bound = 1
-            self.lower_bound = 0
+            self._cat = const.CAT_INTEGER
+            self._upper_bound = 1
+            self._lower_bound = 0
 
         if (self.lower_bound is not None) and (self.upper_bound is not None) and (self.lower_bound > self.upper_bound):
             raise ValueError("Lower bound cannot be greater than the upper bound")
 
+    @classmethod
+    def from_store(cls, columns, index):
+        """
+        create a handle over a variable in the column storage.
+
+        paras:
+            columns: the column storage,
+            index: the index of the variable.
+
+        returns:
+            the variable.
+        """
+        variable = cls.__new__(cls)
+        variable.name = columns.name_list[index]
+        variable.bind(columns, index)
+        return variable
+
+    def bind(self, columns, index):
+        """
+        make the variable a handle over the column storage.
+
+        paras:
+            columns: the column storage,
+            index: the index of the variable.
+        """
+        self.columns = columns
+        self.index = index
+        self._cat = self._upper_bound = self._lower_bound = self._value = None
+
+    @property
+    def cat(self):
+        if self.columns is None:
+            return self._cat
+        return CAT_LIST[self.columns.cat[self.index]]
+
+    @cat.setter
+    def cat(self, cat):
+        if self.columns is None:
+            self._cat = cat
+        else:
+            self.columns.cat[self.index] = cat_code(cat)
+
+    @property
+    def upper_bound(self):
+        if self.columns is None:
+            return self._upper_bound
+        bound = self.columns.upper_bound[self.index]
+        return None if bound == float("inf") else float(bound)
+
+    @upper_bound.setter
+    def upper_bound(self, bound):
+        if self.columns is None:
+            self._upper_bound = bound
+        else:
+            self.columns.upper_bound[self.index] = float("inf") if bound is None else bound
+
+    @property
+    def lower_bound(self):
+        if self.columns is None:
+            return self._lower_bound
+        bound = self.columns.lower_bound[self.index]
+        return None if bound == -float("inf") else float(bound)
+
+    @lower_bound.setter
+    def lower_bound(self, bound):
+        if self.columns is None:
+            self._lower_bound = bound
+        else:
+            self.columns.lower_bound[self.index] = -float("inf") if bound is None else bound
+
+    @property
+    def value(self):
+        if self.columns is None:
+            return self._value
+        return float(self.columns.value[self.index])
+
+    @value.setter
+    def value(self, value):
+        if self.columns is None:
+            self._value = value
+        else:
+            self.columns.value[self.index] = value
+
+    def to_expression(self):
+        """
+        get a linear expression of this variable.
+        """
+        result = LinearExpression()
+        result.add_item(self, 1)
+        return result
+
+    def __mul__(self, coefficient):
+        check_coefficient(coefficient)
+        return LinearTerm(self, coefficient)
+
     def get_bound_type(self):
         """
         get the variable's lower and upper bound type.
@@ -54,13 +246,15 @@ class Variable:
         returns:
             the bound type.
         """
-        if self.lower_bound is None and self.upper_bound is None:
+        lower_bound = self.lower_bound
+        upper_bound = self.upper_bound
+        if lower_bound is None and upper_bound is None:
             return const.BOUND_TWO_OPEN
-        elif self.lower_bound is not None and self.upper_bound is None:
+        elif lower_bound is not None and upper_bound is None:
             return const.BOUND_RIGHT_OPEN
-        elif self.lower_bound is None and self.upper_bound is not None:
+        elif lower_bound is None and upper_bound is not None:
             return const.BOUND_LEFT_OPEN
-        elif self.lower_bound is not None and self.upper_bound is not None:
+        elif lower_bound is not None and upper_bound is not None:
             return const.BOUND_TWO_CLOSED
         else:
             raise ValueError("Variable has infeasible lower or upper bound.")
@@ -77,17 +271,100 @@ class Variable:
         return str(self)
 
 
-class LinearExpression:
+class LinearTerm(ExpressionArithmetic):
     """
-    the linear (affine) combination of variables.
-    
+    a variable multiplied by a coefficient, it is light-weighted so that
+    quicksum does not build an intermediate linear expression for each term.
+
     paras:
-        name: the name of the linear expression.
+        variable: the decision variable,
+        coefficient: the coefficient of the variable.
+    """
+    __slots__ = ("variable", "coefficient")
+
+    def __init__(self, variable, coefficient):
+        self.variable = variable
+        self.coefficient = coefficient
+
+    def to_expression(self):
+        """
+        get a linear expression of this term.
+        """
+        result = LinearExpression()
+        result.add_item(self.variable, self.coefficient)
+        return result
+
+    def __mul__(self, coefficient):
+        check_coefficient(coefficient)
+        return LinearTerm(self.variable, self.coefficient * coefficient)
+
+    def __str__(self):
+        return str(self.coefficient) + self.variable.name
+
+    def __repr__(self):
+        return str(self)
+
+
+class LinearExpression(ExpressionArithmetic):
+    """
+    the linear (affine) combination of variables.
+    The operators +, -, * return new expressions, while +=, -=, *= work in place.
     """
 
     def __init__(self):
         self.coefficient_dict = defaultdict(float)
         self.variable_dict = dict()
+        self.constant = 0
+
+    def to_expression(self):
+        """
+        get a copy of this linear expression.
+        """
+        return self.copy()
+
+    def add(self, item, multiplier=1):
+        """
+        add a number, variable, term or linear expression to the expression in place.
+
+        paras:
+            item: the item to add,
+            multiplier: the item is multiplied by it before adding.
+        """
+        if isinstance(item, LinearExpression):
+            for variable_name, coefficient in item.coefficient_dict.items():
+                self.coefficient_dict[variable_name] += multiplier * coefficient
+            self.variable_dict.update(item.variable_dict)
+            self.constant += multiplier * item.constant
+        elif isinstance(item, LinearTerm):
+            self.add_item(item.variable, multiplier * item.coefficient)
+        elif isinstance(item, Variable):
+            self.add_item(item, multiplier)
+        else:
+            self.constant += multiplier * item
+
+    def scale(self, coefficient):
+        """
+        multiply the expression by a number in place.
+
+        paras:
+            coefficient: the number.
+        """
+        check_coefficient(coefficient)
+        for k, v in self.coefficient_dict.items():
+            self.coefficient_dict[k] = v * coefficient
+        self.constant *= coefficient
+
+    def __iadd__(self, other):
+        self.add(other)
+        return self
+
+    def __isub__(self, other):
+        self.add(other, -1)
+        return self
+
+    def __imul__(self, coefficient):
+        self.scale(coefficient)
+        return self
 
     def add_item(self, variable, coefficient):
         """
@@ -121,7 +398,7 @@ class LinearExpression:
         returns:
             coefficient: the coefficient of this variable.
         """
-        return self.variable_dict[variable.name]
+        return self.coefficient_dict[variable.name]
 
     def get_variables(self):
         """
@@ -133,14 +410,13 @@ class LinearExpression:
         """
         return the value of the linear expression.
         """
-        return sum(self.coefficient_dict[x] * self.variable_dict[x].value for x in self.coefficient_dict)
+        return sum(self.coefficient_dict[x] * self.variable_dict[x].value for x in self.coefficient_dict) + self.constant
 
     def oppose(self):
         """
         make the coefficient of each item become the opposite number.
         """
-        for k, v in self.coefficient_dict.items():
-            self.coefficient_dict[k] = -v
+        self.scale(-1)
 
     def copy(self):
         """
@@ -152,26 +428,83 @@ class LinearExpression:
         result = LinearExpression()
         result.coefficient_dict = self.coefficient_dict.copy()
         result.variable_dict = self.variable_dict.copy()
+        result.constant = self.constant
         return result
 
     def __str__(self):
-        return " + ".join(str(self.coefficient_dict[x]) + x for x in self.coefficient_dict)
+        items = [str(self.coefficient_dict[x]) + x for x in self.coefficient_dict]
+        if self.constant != 0 or not items:
+            items.append(str(self.constant))
+        return " + ".join(items)
 
     def __repr__(self):
         return str(self)
 
 
+def quicksum(items):
+    """
+    sum up numbers, variables, terms and linear expressions in linear time,
+    all the items are added in place to a single linear expression.
+
+    paras:
+        items: iteration of items.
+
+    returns:
+        the linear expression.
+    """
+    result = LinearExpression()
+    for item in items:
+        result.add(item)
+    return result
+
+
+def dot(variables, coefficients):
+    """
+    get the linear expression of the inner product of variables and coefficients.
+
+    paras:
+        variables: iteration of variables
+        coefficients: iteration of coefficients
+
+    returns:
+        the linear expression.
+    """
+    result = LinearExpression()
+    result.add_items(variables, coefficients)
+    return result
+
+
+def objective_vector(model):
+    """
+    get the objective function of a model as a dense vector.
+
+    paras:
+        model: the model.
+
+    returns:
+        c: the cost function vector, indexed by the variable's index.
+    """
+    coefficient_dict = model.objective.coefficient_dict
+    size = len(coefficient_dict)
+    index = np.fromiter(map(model.columns.index_dict.__getitem__, coefficient_dict), dtype=np.int64, count=size)
+    coefficient = np.fromiter(coefficient_dict.values(), dtype=float, count=size)
+    return np.bincount(index, coefficient, minlength=len(model.columns)).astype(float)
+
+
 class Constraint:
     """
     the linear constrain for a mathematical model.
+    Once the constraint is added to a model, it becomes a handle over the model's row storage,
+    and the left hand side is read from the stored items.
 
     paras:
         name: the name of the constrain, since name is the identical flag for the constraint, we strongly recommend the
             users to fill it
-        lhs: left hand side, a linear expression of variables
+        lhs: left hand side, a linear expression of variables, a variable or a term is converted to a linear expression
         sense: equal, less || equal or great || equal
         rhs: right hand side, a valid number.
     """
+    __slots__ = ("name", "model", "index", "_lhs", "_sense", "_rhs")
 
     def __init__(self, name=None, lhs=None, sense=const.SENSE_LEQ, rhs=0):
         if name is not None:
@@ -179,22 +512,98 @@ class Constraint:
         else:
             self.name = random_string() + str(id(self))
 
+        self.model = None
+        self.index = None
+
         if lhs is None:
-            self.lhs = LinearExpression()
+            self._lhs = LinearExpression()
+        elif not isinstance(lhs, LinearExpression):
+            self._lhs = lhs.to_expression()
         else:
-            self.lhs = lhs
+            self._lhs = lhs
 
-        self.sense = sense
-        self.rhs = rhs
+        self._sense = sense
+        self._rhs = rhs
+
+    @classmethod
+    def from_store(cls, model, index):
+        """
+        create a handle over a constraint in the model's row storage.
+
+        paras:
+            model: the model,
+            index: the index of the constraint.
+
+        returns:
+            the constraint.
+        """
+        constraint = cls.__new__(cls)
+        constraint.name = model.rows.name_list[index]
+        constraint.bind(model, index)
+        return constraint
+
+    def bind(self, model, index):
+        """
+        make the constraint a handle over the model's row storage.
+
+        paras:
+            model: the model,
+            index: the index of the constraint.
+        """
+        self.model = model
+        self.index = index
+        self._lhs = self._sense = self._rhs = None
+
+    @property
+    def lhs(self):
+        if self.model is None:
+            return self._lhs
+        lhs = LinearExpression()
+        columns, coefficients = self.model.rows.row_items(self.index, len(self.model.columns))
+        for column, coefficient in zip(columns, coefficients):
+            lhs.add_item(self.model.get_variable(column), float(coefficient))
+        return lhs
+
+    @property
+    def sense(self):
+        if self.model is None:
+            return self._sense
+        return SENSE_LIST[self.model.rows.sense[self.index]]
+
+    @sense.setter
+    def sense(self, sense):
+        if self.model is None:
+            self._sense = sense
+        else:
+            self.model.rows.sense[self.index] = sense_code(sense)
+
+    @property
+    def rhs(self):
+        if self.model is None:
+            return self._rhs
+        return float(self.model.rows.rhs[self.index])
+
+    @rhs.setter
+    def rhs(self, rhs):
+        if self.model is None:
+            self._rhs = rhs
+        else:
+            self.model.rows.rhs[self.index] = rhs
 
     def set_lhs(self, lhs):
         """
         set the left hand side.
 
         paras:
-            lhs: the linear expression for the left hand side.
+            lhs: the linear expression for the left hand side, a variable or a term is converted to a linear expression.
         """
-        self.lhs = lhs
+        if not isinstance(lhs, LinearExpression):
+            lhs = lhs.to_expression()
+        if self.model is None:
+            self._lhs = lhs
+        else:
+            self.model.rows.clear(self.index)
+            self.model.add_row_items(self.index, lhs)
 
     def add_lhs_item(self, variable, coefficient):
         """
@@ -204,7 +613,10 @@ class Constraint:
             variable: the decision variable to add
             coefficient: the coefficient of the variable in this adding item.        
         """
-        self.lhs.add_item(variable, coefficient)
+        if self.model is None:
+            self._lhs.add_item(variable, coefficient)
+        else:
+            self.model.rows.add_items(self.index, [self.model.add_variable(variable)], [coefficient])
 
     def add_lhs_items(self, variables, coefficients):
         """
@@ -214,7 +626,8 @@ class Constraint:
             variables: iteration of variables
             coefficients: iteration of coefficients
         """
-        self.lhs.add_items(variables, coefficients)
+        for variable, coefficient in zip(variables, coefficients):
+            self.add_lhs_item(variable, coefficient)
 
     def set_sense(self, sense):
         """
@@ -235,29 +648,32 @@ class Constraint:
         self.rhs = rhs
 
     def get_coefficient(self, variable):
-        return self.lhs.get_coefficient(variable.name)
+        return self.lhs.get_coefficient(variable)
 
-    def is_valid(self):
+    def is_valid(self, tolerance=0):
         """
         check if this constraint is valid or not.
 
+        paras:
+            tolerance: the absolute violation allowed, an equality is exact if it is 0.
+
         returns:
             bool: if this constrain is valid.
         """
         if self.sense == const.SENSE_LEQ:
-            if self.lhs.value() <= self.rhs:
+            if self.lhs.value() <= self.rhs + tolerance:
                 return True
             else:
                 return False
 
         elif self.sense == const.SENSE_EQ:
-            if self.lhs.value() == self.rhs:
+            if abs(self.lhs.value() - self.rhs) <= tolerance:
                 return True
             else:
                 return False
 
         elif self.sense == const.SENSE_GEQ:
-            if self.lhs.value() >= self.rhs:
+            if self.lhs.value() >= self.rhs - tolerance:
                 return True
             else:
                 return False
@@ -265,6 +681,10 @@ class Constraint:
         else:
             raise ValueError("Sense not valid")
 
+    def __bool__(self):
+        raise TypeError("A constraint has no truth value, == of variables or expressions builds a constraint, "
+                        "use is to compare variables")
+
     def __str__(self):
         return "{name}: {lhs} {sense} {rhs}".format(name=self.name, lhs=self.lhs, sense=self.sense, rhs=self.rhs)
 
@@ -272,11 +692,53 @@ class Constraint:
         return str(self)
 
 
+class VariableView(Mapping):
+    """
+    the read-only name-based view of the variables in a model.
+
+    paras:
+        model: the model.
+    """
+    def __init__(self, model):
+        self.model = model
+
+    def __getitem__(self, name):
+        return self.model.get_variable(self.model.columns.index_dict[name])
+
+    def __iter__(self):
+        return iter(self.model.columns.name_list)
+
+    def __len__(self):
+        return len(self.model.columns)
+
+
+class ConstraintView(Mapping):
+    """
+    the read-only name-based view of the constraints in a model.
+
+    paras:
+        model: the model.
+    """
+    def __init__(self, model):
+        self.model = model
+
+    def __getitem__(self, name):
+        return self.model.get_constraint(self.model.rows.index_dict[name])
+
+    def __iter__(self):
+        return iter(self.model.rows.name_list)
+
+    def __len__(self):
+        return len(self.model.rows)
+
+
 class Model:
     """
     the mathematical model (or formulation),
     including the decision variables, objective function and constrains,
     the objective function and the constrains must be LINEAR.
+    The variables and constraints are stored in columnar arrays,
+    variable_dict and constraint_dict are name-based views over them.
 
     paras:
         name: the name of the model
@@ -287,11 +749,55 @@ class Model:
     def __init__(self, name, sense=const.SENSE_MIN):
         self.name = name
         self.sense = sense
-        self.variable_dict = dict()
+        self.columns = ColumnStore()
+        self.rows = RowStore()
         self.objective = LinearExpression()
-        self.constraint_dict = dict()
+        # if the objective is shared with a clone, it is copied before an item is added through the model.
+        self.objective_shared = False
 
         self.status = const.STATUS_UNSOLVED
+        # the standard form and the final basis of the last simplex solve, for the warm start.
+        self.simplex_cache = None
+        # the statistics of the last solve.
+        self.solve_stats = None
+
+    @property
+    def variable_dict(self):
+        return VariableView(self)
+
+    @property
+    def constraint_dict(self):
+        return ConstraintView(self)
+
+    def get_variable(self, index):
+        """
+        get the handle of a variable by its index.
+
+        paras:
+            index: the index of the variable.
+
+        returns:
+            variable: the decision variable.
+        """
+        variable = self.columns.handle_dict.get(index)
+        if variable is None:
+            variable = Variable.from_store(self.columns, index)
+        return variable
+
+    def get_constraint(self, index):
+        """
+        get the handle of a constraint by its index.
+
+        paras:
+            index: the index of the constraint.
+
+        returns:
+            constraint: the constraint.
+        """
+        constraint = self.rows.handle_dict.get(index)
+        if constraint is None:
+            constraint = Constraint.from_store(self, index)
+        return constraint
 
     def copy(self, name):
         """
@@ -304,21 +810,117 @@ class Model:
             model: the model with same variables, objective function and constrains.
         """
         result = Model(name=name, sense=self.sense)
-        result.variable_dict = self.variable_dict.copy()
+        result.columns = self.columns.copy()
+        result.rows = self.rows.copy()
         result.objective = self.objective.copy()
-        result.constrain_dict = self.constraint_dict.copy()
         result.status = self.status
         return result
 
+    def clone(self, name):
+        """
+        get a copy-on-write clone of the model for the scenario analysis.
+        The names, the bound and rhs arrays, the constraint matrix and the objective are shared with this model,
+        an array is only copied by the model which changes it first, so a clone costs memory for its edits only.
+        The cached standard form and final basis are shared as well, so the first solve of the clone
+        warm-starts from the last solve of this model.
+        The objective must be changed through the model (add_objective_item or set_objective),
+        not in place, and its variables are the handles of this model.
+
+        paras:
+            name: the name of the clone.
+
+        returns:
+            model: the model with same variables, objective function and constrains.
+        """
+        result = Model(name=name, sense=self.sense)
+        result.columns = self.columns.clone()
+        result.rows = self.rows.clone()
+        result.objective = self.objective
+        result.objective_shared = self.objective_shared = True
+        result.status = self.status
+        if self.simplex_cache is not None:
+            result.simplex_cache = self.simplex_cache.clone()
+        return result
+
+    def check_solution(self, x=None, tolerance=1e-6):
+        """
+        check a solution against all the constraints, bounds and integer categories at once,
+        the left hand sides are evaluated by one sparse matrix-vector product.
+
+        paras:
+            x: the value vector of the variables in the order of their indices,
+                if None, the current values of the variables are checked,
+            tolerance: the absolute violation allowed.
+
+        returns:
+            a dict of
+                feasible: if no violation is larger than the tolerance,
+                objective_value: the objective value of the solution,
+                max_violation: the largest violation of the constraints, 0 if there is no constraint,
+                max_violation_constraint: the name of the most violated constraint, None if there is no violation,
+                bound_violation: the largest violation of the variable bounds,
+                bound_violation_variable: the name of the variable with it, None if there is no violation,
+                integer_violation: the largest distance of an integer variable from the nearest integer,
+                integer_violation_variable: the name of the variable with it, None if there is no violation,
+                row_violation: the violation vector of the constraints.
+        """
+        columns = self.columns
+        rows = self.rows
+        n = len(columns)
+        x = columns.value.view() if x is None else np.asarray(x, dtype=float)
+        if x.shape != (n,):
+            raise ValueError("The solution does not match the variables")
+
+        activity = rows.csr(n).dot(x)
+        rhs = rows.rhs.view()
+        sense = rows.sense.view()
+        row_violation = np.where(
+            sense == SENSE_LIST.index(const.SENSE_LEQ), activity - rhs,
+            np.where(sense == SENSE_LIST.index(const.SENSE_GEQ), rhs - activity, np.abs(activity - rhs))
+        )
+        row_violation = np.maximum(row_violation, 0)
+        bound_violation = np.maximum(
+            np.maximum(columns.lower_bound.view() - x, x - columns.upper_bound.view()), 0
+        )
+        integer_violation = np.where(
+            columns.cat.view() == CAT_LIST.index(const.CAT_INTEGER), np.abs(x - np.round(x)), 0
+        )
+
+        result = {"objective_value": float(objective_vector(self).dot(x) + self.objective.constant)}
+        for key, violation, name_list in (
+            ("max_violation", row_violation, rows.name_list),
+            ("bound_violation", bound_violation, columns.name_list),
+            ("integer_violation", integer_violation, columns.name_list)
+        ):
+            index = int(violation.argmax()) if violation.shape[0] > 0 else -1
+            value = float(violation[index]) if index >= 0 else 0.0
+            result[key] = value
+            result[key + ("_constraint" if key == "max_violation" else "_variable")] = \
+                name_list[index] if value > 0 else None
+        result["feasible"] = max(result["max_violation"], result["bound_violation"],
+                                 result["integer_violation"]) <= tolerance
+        result["row_violation"] = row_violation
+        return result
+
     def add_variable(self, variable):
         """
-        add a variable to the model.
+        add a variable to the model, a variable with an existing name will not be added again.
 
         paras:
             variable: the decision variable to add.
+
+        returns:
+            the index of the variable.
         """
-        if not self.variable_dict.get(variable):
-            self.variable_dict[variable.name] = variable
+        index = self.columns.index_dict.get(variable.name)
+        if index is None:
+            index = self.columns.add(
+                variable.name, variable.cat, variable.lower_bound, variable.upper_bound, variable.value
+            )
+            if variable.columns is None:
+                variable.bind(self.columns, index)
+                self.columns.handle_dict[index] = variable
+        return index
 
     def add_variables(self, variables):
         """
@@ -330,14 +932,81 @@ class Model:
         for variable in variables:
             self.add_variable(variable)
 
+    def add_variables_from_arrays(self, lower_bound=0, upper_bound=None, cat=const.CAT_CONTINUOUS, names=None,
+                                  objective=None):
+        """
+        add a block of variables from arrays, without creating a variable object for each column.
+
+        paras:
+            lower_bound: the lower bound vector or number, None or -inf for negative infinite,
+            upper_bound: the upper bound vector or number, None or inf for infinite,
+            cat: a category, or an array of categories,
+            names: the names of the variables, if None, they are named as "x" + index,
+            objective: the objective coefficient vector of the variables, if None, they are not in the objective.
+
+        returns:
+            the index vector of the variables.
+        """
+        # the None entries of a vector become nan, they are infinite bounds too.
+        lower_bound = np.array(-np.inf if lower_bound is None else lower_bound, dtype=float)
+        upper_bound = np.array(np.inf if upper_bound is None else upper_bound, dtype=float)
+        lower_bound[np.isnan(lower_bound)] = -np.inf
+        upper_bound[np.isnan(upper_bound)] = np.inf
+        size = max(np.size(lower_bound), np.size(upper_bound), np.size(cat), 0 if names is None else len(names),
+                   0 if objective is None else np.size(objective))
+        if names is None:
+            start = len(self.columns)
+            names = ["x" + str(index) for index in range(start, start + size)]
+
+        index = self.columns.add_arrays(names, cat, lower_bound, upper_bound)
+        if objective is not None:
+            objective = np.broadcast_to(objective, (size,))
+            nonzero = np.flatnonzero(objective)
+            self.own_objective()
+            self.objective.add_items(
+                [self.get_variable(j) for j in index[nonzero]], objective[nonzero].tolist()
+            )
+        return index
+
+    def add_column(self, variable, coefficient_dict, objective=0):
+        """
+        add a new variable with its coefficients in the existing constraints, as a column of the matrix.
+
+        paras:
+            variable: the decision variable to add, its name must be new,
+            coefficient_dict: the coefficient of the variable in each constraint, by the constraint or its name,
+            objective: the objective coefficient of the variable.
+
+        returns:
+            the index of the variable.
+        """
+        if variable.name in self.columns.index_dict:
+            raise ValueError("Variable already in the model")
+        rows = list()
+        for constraint in coefficient_dict:
+            name = constraint if isinstance(constraint, str) else constraint.name
+            if name not in self.rows.index_dict:
+                raise ValueError("Constraint not in the model")
+            rows.append(self.rows.index_dict[name])
+        index = self.add_variable(variable)
+        if objective != 0:
+            self.add_objective_item(variable, objective)
+        self.rows.add_items(np.array(rows, dtype=np.int64), np.full(len(rows), index),
+                            list(coefficient_dict.values()))
+        return index
+
     def set_objective(self, linear_expression):
         """
         set the objective function using a linear expression.
 
         paras:
-            linear_expression: the linear expression to be the objective function.
+            linear_expression: the linear expression to be the objective function,
+                a variable or a term is converted to a linear expression.
         """
+        if not isinstance(linear_expression, LinearExpression):
+            linear_expression = linear_expression.to_expression()
         self.objective = linear_expression
+        self.objective_shared = False
         self.add_variables(linear_expression.get_variables())
 
     def add_objective_item(self, variable, coefficient):
@@ -348,18 +1017,110 @@ class Model:
             variable: the decision variable to add
             coefficient: the coefficient of the variable in this adding item.        
         """
+        self.own_objective()
         self.objective.add_item(variable, coefficient)
         self.add_variable(variable)
 
-    def add_constraint(self, constraint):
+    def own_objective(self):
+        """
+        copy the objective if it is shared with a clone, before it is changed.
+        """
+        if self.objective_shared:
+            self.objective = self.objective.copy()
+            self.objective_shared = False
+
+    def add_row_items(self, index, linear_expression):
+        """
+        add the items of a linear expression to a row.
+
+        paras:
+            index: the index of the row,
+            linear_expression: the linear expression to add.
+        """
+        columns = [self.add_variable(variable) for variable in linear_expression.variable_dict.values()]
+        coefficients = [linear_expression.coefficient_dict[name] for name in linear_expression.variable_dict]
+        self.rows.add_items(index, columns, coefficients)
+
+    def add_constraint(self, constraint, name=None):
+        """
+        add a constrain to the model, a constraint with an existing name is replaced,
+        the constant of the left hand side is moved to the right hand side.
+
+        paras:
+            constraint: the constraint to add,
+            name: the name of the constraint, if None, the constraint's own name is used.
+        """
+        lhs = constraint.lhs
+        if name is not None and constraint.model is None:
+            constraint.name = name
+        index = self.rows.add(
+            constraint.name if name is None else name, constraint.sense, constraint.rhs - lhs.constant
+        )
+        self.add_row_items(index, lhs)
+        if constraint.model is None:
+            constraint.bind(self, index)
+            self.rows.handle_dict[index] = constraint
+
+    def remove_constraints(self, constraints):
         """
-        add a constrain to the model.
+        remove constraints from the model, the constraints after them are moved forward.
+        The handles of the removed constraints keep their left hand side, sense and rhs,
+        so they can be added again.
 
         paras:
-            constraint: the constraint to add
+            constraints: an iteration of constraints or their names.
+
+        returns:
+            the new index vector of the old constraints, -1 for the removed ones.
+        """
+        index_list = list()
+        for constraint in constraints:
+            name = constraint if isinstance(constraint, str) else constraint.name
+            if name not in self.rows.index_dict:
+                raise ValueError("Constraint not in the model")
+            index_list.append(self.rows.index_dict[name])
+        for index in index_list:
+            handle = self.rows.handle_dict.get(index)
+            if handle is not None:
+                lhs, sense, rhs = handle.lhs, handle.sense, handle.rhs
+                handle.model = handle.index = None
+                handle._lhs, handle._sense, handle._rhs = lhs, sense, rhs
+        return self.rows.remove(index_list)
+
+    def add_constraints_from_matrix(self, A, senses, rhs, variables=None, names=None):
         """
-        self.constraint_dict[constraint.name] = constraint
-        self.add_variables(constraint.lhs.get_variables())
+        add a block of constraints A x (senses) rhs at once, the items are appended to the
+        row storage directly, without creating a constraint object for each row.
+
+        paras:
+            A: the left hand side matrix, a Numpy Ndarray or a scipy.sparse matrix,
+            senses: a sense, or an array of senses,
+            rhs: the right hand side vector or number,
+            variables: the variables of the columns of A, a list of variables or an index vector,
+                if None, the columns of A are the variables of the model in order,
+            names: the names of the constraints, if None, they are named as "c" + index.
+
+        returns:
+            the index vector of the constraints.
+        """
+        A = sp.coo_matrix(A)
+        m, n = A.shape
+        if variables is None:
+            column_index = np.arange(n)
+        elif len(variables) > 0 and isinstance(variables[0], Variable):
+            column_index = np.array([self.add_variable(variable) for variable in variables], dtype=np.int64)
+        else:
+            column_index = np.asarray(variables, dtype=np.int64)
+        if column_index.shape[0] != n or (n > 0 and column_index.max() >= len(self.columns)):
+            raise ValueError("The columns of the matrix do not match the variables")
+
+        if names is None:
+            start = len(self.rows)
+            names = ["c" + str(index) for index in range(start, start + m)]
+
+        index = self.rows.add_arrays(names, senses, rhs)
+        self.rows.add_items(index[A.row], column_index[A.col], A.data)
+        return index
 
     def __str__(self):
         result = \
@@ -372,4 +1133,4 @@ class Model:
         return result
 
     def __repr__(self):
-        str(self)
+        return str(self)
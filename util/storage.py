@@ -0,0 +1,561 @@
+"""
+This file defines the array-backed (columnar) storage of a model.
+Last edited by Teast Ares, 20190130.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from constant import const
+
+
+# the codes of the variable categories and the constraint senses in the storage.
+CAT_LIST = [const.CAT_CONTINUOUS, const.CAT_INTEGER]
+SENSE_LIST = [const.SENSE_LEQ, const.SENSE_EQ, const.SENSE_GEQ]
+
+
+def cat_code(cat):
+    """
+    get the storage code of a variable category, binary is stored as integer.
+
+    paras:
+        cat: the category of the variable.
+
+    returns:
+        the code of the category.
+    """
+    if cat == const.CAT_BINARY:
+        cat = const.CAT_INTEGER
+    return CAT_LIST.index(cat)
+
+
+def sense_code(sense):
+    """
+    get the storage code of a constraint sense.
+
+    paras:
+        sense: equal, less || equal or great || equal.
+
+    returns:
+        the code of the sense.
+    """
+    if sense not in SENSE_LIST:
+        raise ValueError("Sense not valid")
+    return SENSE_LIST.index(sense)
+
+
+def cat_codes(cat, size):
+    """
+    get the storage codes of an array of variable categories.
+
+    paras:
+        cat: a category, or an array of categories,
+        size: the number of variables.
+
+    returns:
+        the code vector and the mask of the binary variables.
+    """
+    cat = np.broadcast_to(np.asarray(cat, dtype=object), (size,))
+    binary = cat == const.CAT_BINARY
+    codes = np.full(size, -1, dtype=np.int8)
+    codes[binary] = CAT_LIST.index(const.CAT_INTEGER)
+    for code, name in enumerate(CAT_LIST):
+        codes[cat == name] = code
+    if (codes < 0).any():
+        raise ValueError("Category not valid")
+    return codes, binary
+
+
+def sense_codes(sense, size):
+    """
+    get the storage codes of an array of constraint senses.
+
+    paras:
+        sense: a sense, or an array of senses,
+        size: the number of constraints.
+
+    returns:
+        the code vector.
+    """
+    sense = np.broadcast_to(np.asarray(sense, dtype=object), (size,))
+    codes = np.full(size, -1, dtype=np.int8)
+    for code, name in enumerate(SENSE_LIST):
+        codes[sense == name] = code
+    if (codes < 0).any():
+        raise ValueError("Sense not valid")
+    return codes
+
+
+def add_names(name_list, index_dict, names):
+    """
+    append a block of unique names and index them.
+
+    paras:
+        name_list: the list of names,
+        index_dict: the dict for name's index,
+        names: the names to append.
+
+    returns:
+        the index vector of the names.
+    """
+    start = len(name_list)
+    names = list(names)
+    new_index_dict = dict(zip(names, range(start, start + len(names))))
+    if len(new_index_dict) != len(names) or not index_dict.keys().isdisjoint(new_index_dict):
+        raise ValueError("Duplicated names")
+    index_dict.update(new_index_dict)
+    name_list.extend(names)
+    return np.arange(start, start + len(names))
+
+
+class GrowableArray:
+    """
+    a one-dimensional Numpy Ndarray with amortized constant time appending.
+    The buffer can be shared by several arrays, it is copied before the first change of each one.
+
+    paras:
+        dtype: the data type of the array,
+        capacity: the initial capacity.
+    """
+    __slots__ = ("data", "size", "shared")
+
+    def __init__(self, dtype=float, capacity=16):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+        self.shared = False
+
+    @classmethod
+    def from_array(cls, data):
+        """
+        wrap a one-dimensional array without copying, e.g. a memory-mapped array,
+        it is only copied when it has to grow.
+
+        paras:
+            data: the array.
+
+        returns:
+            the growable array.
+        """
+        result = cls.__new__(cls)
+        result.data = data
+        result.size = data.shape[0]
+        result.shared = False
+        return result
+
+    def share(self):
+        """
+        get an array sharing the buffer without copying, both arrays copy the buffer before they are changed.
+
+        returns:
+            the growable array with the same values.
+        """
+        result = GrowableArray.__new__(GrowableArray)
+        result.data = self.data
+        result.size = self.size
+        result.shared = True
+        self.shared = True
+        return result
+
+    def reserve(self, size):
+        """
+        make sure the capacity is at least size and the buffer is not shared, the capacity is doubled when growing.
+
+        paras:
+            size: the required capacity.
+        """
+        if size > self.data.shape[0] or self.shared:
+            capacity = max(size, 2 * self.data.shape[0]) if size > self.data.shape[0] else self.data.shape[0]
+            data = np.empty(capacity, dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+            self.shared = False
+
+    def append(self, value):
+        """
+        append a value at the end.
+
+        paras:
+            value: the value to append.
+        """
+        self.reserve(self.size + 1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        """
+        append a sequence of values at the end.
+
+        paras:
+            values: the array-like values to append.
+        """
+        values = np.asarray(values, dtype=self.data.dtype).ravel()
+        self.reserve(self.size + values.shape[0])
+        self.data[self.size:self.size + values.shape[0]] = values
+        self.size += values.shape[0]
+
+    def view(self):
+        """
+        get the valid part of the array, without copying.
+        The view is only for reading, a change must be made by the item assignment of the array itself,
+        so that a shared buffer is copied first.
+        """
+        return self.data[:self.size]
+
+    def copy(self):
+        """
+        copy the array.
+
+        returns:
+            a growable array with the same values.
+        """
+        result = GrowableArray(self.data.dtype, max(self.size, 16))
+        result.extend(self.view())
+        return result
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __setitem__(self, index, value):
+        if self.shared:
+            self.reserve(self.size)
+        self.view()[index] = value
+
+    def __len__(self):
+        return self.size
+
+
+class ColumnStore:
+    """
+    the columnar storage of the decision variables,
+    a variable is an integer index into the arrays of bounds, category and value,
+    an infinite bound is stored as -inf or inf.
+    """
+    def __init__(self):
+        self.name_list = list()
+        self.index_dict = dict()
+        # if the names are shared with a clone, they are copied before a variable is added.
+        self.names_shared = False
+        self.lower_bound = GrowableArray(float)
+        self.upper_bound = GrowableArray(float)
+        self.cat = GrowableArray(np.int8)
+        self.value = GrowableArray(float)
+        # the handles of the variables which have been added as objects, by the index.
+        self.handle_dict = dict()
+
+    def add(self, name, cat=const.CAT_CONTINUOUS, lower_bound=0, upper_bound=None, value=0):
+        """
+        add a variable, a variable with an existing name will not be added again.
+
+        paras:
+            name: the name of the variable,
+            cat: the category of the variable,
+            lower_bound: the lower bound, None for negative infinite,
+            upper_bound: the upper bound, None for infinite,
+            value: the value of the variable.
+
+        returns:
+            the index of the variable.
+        """
+        index = self.index_dict.get(name)
+        if index is not None:
+            return index
+
+        self.own_names()
+        index = len(self.name_list)
+        self.name_list.append(name)
+        self.index_dict[name] = index
+        self.lower_bound.append(-np.inf if lower_bound is None else lower_bound)
+        self.upper_bound.append(np.inf if upper_bound is None else upper_bound)
+        self.cat.append(cat_code(cat))
+        self.value.append(value)
+        return index
+
+    def add_arrays(self, names, cat, lower_bound, upper_bound):
+        """
+        add a block of variables at once.
+
+        paras:
+            names: the names of the variables,
+            cat: a category, or an array of categories,
+            lower_bound: the lower bound vector, -inf for negative infinite,
+            upper_bound: the upper bound vector, inf for infinite.
+
+        returns:
+            the index vector of the variables.
+        """
+        size = len(names)
+        codes, binary = cat_codes(cat, size)
+        lower_bound = np.array(np.broadcast_to(lower_bound, (size,)), dtype=float)
+        upper_bound = np.array(np.broadcast_to(upper_bound, (size,)), dtype=float)
+        lower_bound[binary] = 0
+        upper_bound[binary] = 1
+        if (lower_bound > upper_bound).any():
+            raise ValueError("Lower bound cannot be greater than the upper bound")
+
+        self.own_names()
+        index = add_names(self.name_list, self.index_dict, names)
+        self.lower_bound.extend(lower_bound)
+        self.upper_bound.extend(upper_bound)
+        self.cat.extend(codes)
+        self.value.extend(np.zeros(size))
+        return index
+
+    def own_names(self):
+        """
+        copy the names if they are shared, before a variable is added.
+        """
+        if self.names_shared:
+            self.name_list = self.name_list.copy()
+            self.index_dict = self.index_dict.copy()
+            self.names_shared = False
+
+    def copy(self):
+        """
+        copy the storage, the handles are not copied.
+
+        returns:
+            a column storage with the same variables.
+        """
+        result = ColumnStore()
+        result.name_list = self.name_list.copy()
+        result.index_dict = self.index_dict.copy()
+        result.lower_bound = self.lower_bound.copy()
+        result.upper_bound = self.upper_bound.copy()
+        result.cat = self.cat.copy()
+        result.value = self.value.copy()
+        return result
+
+    def clone(self):
+        """
+        get a copy-on-write clone of the storage, the names and the arrays are shared
+        until they are changed by either storage, the handles are not copied.
+
+        returns:
+            a column storage with the same variables.
+        """
+        result = ColumnStore()
+        result.name_list = self.name_list
+        result.index_dict = self.index_dict
+        result.names_shared = self.names_shared = True
+        result.lower_bound = self.lower_bound.share()
+        result.upper_bound = self.upper_bound.share()
+        result.cat = self.cat.share()
+        result.value = self.value.share()
+        return result
+
+    def __len__(self):
+        return len(self.name_list)
+
+
+class RowStore:
+    """
+    the row storage of the linear constraints,
+    the senses and right hand sides are arrays, the left hand sides are COO triplets.
+    """
+    def __init__(self):
+        self.name_list = list()
+        self.index_dict = dict()
+        # if the names are shared with a clone, they are copied before a constraint is added.
+        self.names_shared = False
+        self.sense = GrowableArray(np.int8)
+        self.rhs = GrowableArray(float)
+        self.row = GrowableArray(np.int64)
+        self.column = GrowableArray(np.int64)
+        self.coefficient = GrowableArray(float)
+        # the handles of the constraints which have been added as objects, by the index.
+        self.handle_dict = dict()
+
+        self.version = 0
+        self.csr_cache = None
+        self.csr_version = -1
+
+    def add(self, name, sense=const.SENSE_LEQ, rhs=0):
+        """
+        add an empty row, the left hand side of a row with an existing name is cleared.
+
+        paras:
+            name: the name of the constraint,
+            sense: equal, less || equal or great || equal,
+            rhs: right hand side, a valid number.
+
+        returns:
+            the index of the row.
+        """
+        index = self.index_dict.get(name)
+        if index is not None:
+            self.clear(index)
+            self.sense[index] = sense_code(sense)
+            self.rhs[index] = rhs
+            return index
+
+        self.own_names()
+        index = len(self.name_list)
+        self.name_list.append(name)
+        self.index_dict[name] = index
+        self.sense.append(sense_code(sense))
+        self.rhs.append(rhs)
+        self.version += 1
+        return index
+
+    def add_arrays(self, names, sense, rhs):
+        """
+        add a block of empty rows at once.
+
+        paras:
+            names: the names of the constraints,
+            sense: a sense, or an array of senses,
+            rhs: the right hand side vector.
+
+        returns:
+            the index vector of the rows.
+        """
+        size = len(names)
+        codes = sense_codes(sense, size)
+        self.own_names()
+        index = add_names(self.name_list, self.index_dict, names)
+        self.sense.extend(codes)
+        self.rhs.extend(np.broadcast_to(rhs, (size,)))
+        self.version += 1
+        return index
+
+    def add_items(self, row, columns, coefficients):
+        """
+        add items to the left hand side of rows, the duplicated items are summed.
+
+        paras:
+            row: the row index, or an array of row indices,
+            columns: the array of column indices,
+            coefficients: the array of coefficients.
+        """
+        columns = np.asarray(columns, dtype=np.int64).ravel()
+        self.row.extend(np.broadcast_to(row, columns.shape))
+        self.column.extend(columns)
+        self.coefficient.extend(coefficients)
+        self.version += 1
+
+    def clear(self, index):
+        """
+        clear the left hand side of a row, the items are zeroed in place.
+
+        paras:
+            index: the row index.
+        """
+        self.coefficient[self.row.view() == index] = 0
+        self.version += 1
+
+    def remove(self, indices):
+        """
+        remove rows and their items, the rows after them are moved forward.
+        The arrays are rebuilt, so a buffer shared with a clone is not changed.
+
+        paras:
+            indices: the index vector of the rows to remove.
+
+        returns:
+            the new index vector of the old rows, -1 for the removed rows.
+        """
+        keep = np.ones(len(self.name_list), dtype=bool)
+        keep[np.asarray(indices, dtype=np.int64)] = False
+        new_index = np.where(keep, np.cumsum(keep) - 1, -1)
+        item = keep[self.row.view()]
+        self.row = GrowableArray.from_array(new_index[self.row.view()[item]])
+        self.column = GrowableArray.from_array(self.column.view()[item])
+        self.coefficient = GrowableArray.from_array(self.coefficient.view()[item])
+        self.sense = GrowableArray.from_array(self.sense.view()[keep])
+        self.rhs = GrowableArray.from_array(self.rhs.view()[keep])
+
+        self.name_list = [name for name, kept in zip(self.name_list, keep) if kept]
+        self.index_dict = {name: index for index, name in enumerate(self.name_list)}
+        self.names_shared = False
+        handle_dict = dict()
+        for index, handle in self.handle_dict.items():
+            if keep[index]:
+                handle.index = int(new_index[index])
+                handle_dict[handle.index] = handle
+        self.handle_dict = handle_dict
+        self.version += 1
+        return new_index
+
+    def own_names(self):
+        """
+        copy the names if they are shared, before a constraint is added.
+        """
+        if self.names_shared:
+            self.name_list = self.name_list.copy()
+            self.index_dict = self.index_dict.copy()
+            self.names_shared = False
+
+    def csr(self, n):
+        """
+        get the left hand side matrix in the scipy.sparse CSR format, it is cached until the next change.
+
+        paras:
+            n: the number of columns.
+
+        returns:
+            the left hand side matrix.
+        """
+        if self.csr_version != self.version or self.csr_cache.shape[1] != n:
+            self.csr_cache = sp.csr_matrix(
+                (self.coefficient.view(), (self.row.view(), self.column.view())),
+                shape=(len(self.name_list), n)
+            )
+            self.csr_cache.eliminate_zeros()
+            self.csr_version = self.version
+        return self.csr_cache
+
+    def row_items(self, index, n):
+        """
+        get the items of a row.
+
+        paras:
+            index: the row index,
+            n: the number of columns.
+
+        returns:
+            the column indices and the coefficients.
+        """
+        A = self.csr(n)
+        start, end = A.indptr[index], A.indptr[index + 1]
+        return A.indices[start:end], A.data[start:end]
+
+    def copy(self):
+        """
+        copy the storage, the handles are not copied.
+
+        returns:
+            a row storage with the same constraints.
+        """
+        result = RowStore()
+        result.name_list = self.name_list.copy()
+        result.index_dict = self.index_dict.copy()
+        result.sense = self.sense.copy()
+        result.rhs = self.rhs.copy()
+        result.row = self.row.copy()
+        result.column = self.column.copy()
+        result.coefficient = self.coefficient.copy()
+        return result
+
+    def clone(self):
+        """
+        get a copy-on-write clone of the storage, the names, the arrays and the cached matrix are shared
+        until they are changed by either storage, the handles are not copied.
+
+        returns:
+            a row storage with the same constraints.
+        """
+        result = RowStore()
+        result.name_list = self.name_list
+        result.index_dict = self.index_dict
+        result.names_shared = self.names_shared = True
+        result.sense = self.sense.share()
+        result.rhs = self.rhs.share()
+        result.row = self.row.share()
+        result.column = self.column.share()
+        result.coefficient = self.coefficient.share()
+        result.version = self.version
+        result.csr_cache = self.csr_cache
+        result.csr_version = self.csr_version
+        return result
+
+    def __len__(self):
+        return len(self.name_list)